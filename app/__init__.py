@@ -2,14 +2,22 @@
 import os
 from flask import Flask, jsonify
 from flask_cors import CORS
-from flask_migrate import Migrate
 from config.config import config
-from app.models import db
+from app.models import db, include_object
 from app.routes.auth import auth_bp
 from app.routes.projects import projects_bp
 from app.routes.tasks import tasks_bp
 from app.routes.health import health_bp
 from app.routes.google_auth import google_auth_bp
+from app.utils.calendar_sync import calendar_sync_command
+from app.utils.compression import init_compression
+from app.utils.db_pool import engine_options, register_engine
+from app.utils.json_provider import OrJSONProvider
+from app.utils.project_stats import project_stats_rebuild_command
+from app.utils.rate_limit import init_rate_limits
+from app.utils.metrics import init_metrics, instrument_engine
+from app.utils.replicas import init_replicas
+from app.utils.response_cache import init_response_cache
 
 
 def create_app(config_name: str = None):
@@ -18,12 +26,23 @@ def create_app(config_name: str = None):
         config_name = os.environ.get('FLASK_ENV', 'development')
 
     app = Flask(__name__)
-    app.config.from_object(config[config_name])
+    app.config.from_object(config[config_name]())
+    app.json = OrJSONProvider(app)
+
+    # Registered first so it runs after every other after_request hook
+    init_compression(app)
 
     # Initialize extensions
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)
+    replicas = init_replicas(app)
+    init_response_cache(app)
     CORS(app)
-    migrate = Migrate(app, db)
+    if os.environ.get('FLASK_RUN_FROM_CLI'):
+        # Only the flask CLI (flask db ...) needs migrations; importing
+        # Alembic costs server workers a few hundred ms at boot
+        from flask_migrate import Migrate
+        Migrate(app, db, include_object=include_object)
 
     # Register blueprints
     app.register_blueprint(health_bp)
@@ -32,6 +51,10 @@ def create_app(config_name: str = None):
     app.register_blueprint(tasks_bp)
     app.register_blueprint(google_auth_bp)
 
+    # CLI commands
+    app.cli.add_command(calendar_sync_command)
+    app.cli.add_command(project_stats_rebuild_command)
+
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -46,8 +69,16 @@ def create_app(config_name: str = None):
     def method_not_allowed(error):
         return jsonify({'error': 'Method not allowed'}), 405
 
-    # Create tables
     with app.app_context():
-        db.create_all()
+        register_engine(db.engine)
+        init_metrics(app, db.engine)
+        # After the metrics hooks, so rejected requests are still timed
+        init_rate_limits(app)
+        for engine in replicas.engines if replicas else ():
+            instrument_engine(engine)
+
+        # Create tables in development and testing; elsewhere migrations do
+        if app.config['CREATE_TABLES_ON_STARTUP']:
+            db.create_all()
 
     return app
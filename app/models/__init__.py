@@ -1,7 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event, func, select
+from sqlalchemy.orm import column_property
 from datetime import datetime
+from app.utils.replicas import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class User(db.Model):
@@ -44,11 +47,15 @@ class User(db.Model):
 class Project(db.Model):
     """Project model for organizing tasks."""
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Listing a user's projects in creation order (keyset pagination)
+        db.Index('ix_projects_owner_created', 'owner_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     status = db.Column(db.String(50), default='active')  # active, completed, archived
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -66,7 +73,7 @@ class Project(db.Model):
             'description': self.description,
             'owner_id': self.owner_id,
             'status': self.status,
-            'task_count': len(self.tasks),
+            'task_count': self.task_count,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
@@ -75,11 +82,23 @@ class Project(db.Model):
 class Task(db.Model):
     """Task model representing individual work items."""
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Listing a project's tasks in creation order; also serves task_count
+        db.Index('ix_tasks_project_created', 'project_id', 'created_at', 'id'),
+        # The same listing filtered by status, or by status and priority
+        db.Index('ix_tasks_project_status_priority_created',
+                 'project_id', 'status', 'priority', 'created_at', 'id'),
+        # Overdue counts per project: open statuses, due date range
+        db.Index('ix_tasks_project_status_due', 'project_id', 'status', 'due_date'),
+        # Full-text search on MySQL; SQLite uses the tasks_fts table below
+        db.Index('ft_tasks_title_description', 'title', 'description',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     assignee_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
     status = db.Column(db.String(50), default='todo')  # todo, in_progress, completed
     priority = db.Column(db.String(20), default='medium')  # low, medium, high
@@ -105,3 +124,88 @@ class Task(db.Model):
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
+
+
+class ProjectTaskStats(db.Model):
+    """Task count of a project for one status and priority.
+
+    Maintained incrementally on task writes when PROJECT_STATS_SUMMARY is
+    on; see app.utils.project_stats.
+    """
+    __tablename__ = 'project_task_stats'
+
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    priority = db.Column(db.String(20), primary_key=True)
+    task_count = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<ProjectTaskStats {self.project_id} {self.status}/{self.priority}={self.task_count}>'
+
+
+class CalendarSyncOutbox(db.Model):
+    """Pending Google Calendar change, written in the same transaction as the task."""
+    __tablename__ = 'calendar_sync_outbox'
+    __table_args__ = (
+        db.Index('ix_calendar_sync_outbox_status_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    task_id = db.Column(db.Integer, nullable=False)  # no FK: the task may be deleted
+    action = db.Column(db.String(20), nullable=False)  # create, update, delete
+    google_event_id = db.Column(db.String(255))
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CalendarSyncOutbox {self.action} task={self.task_id}>'
+
+
+# Full-text search on SQLite: an FTS5 index over tasks.title and
+# tasks.description, kept in step with the table by triggers so every write
+# path (ORM, bulk Core statements, raw SQL) updates it. See app.utils.search.
+TASK_SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+
+for statement in TASK_SEARCH_SQLITE_DDL:
+    event.listen(Task.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Task.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS tasks_fts').execute_if(dialect='sqlite'))
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave the full-text search objects out of autogenerated migrations.
+
+    They are dialect specific (the FTS5 tables exist only on SQLite, the
+    FULLTEXT index only on MySQL), so their migration is written by hand.
+    """
+    if type_ == 'table' and name.startswith('tasks_fts'):
+        return False
+    return not (type_ == 'index' and name == 'ft_tasks_title_description')
+
+
+# Counted in the database as a correlated subquery so listing projects never
+# has to load their task rows.
+Project.task_count = column_property(
+    select(func.count(Task.id))
+    .where(Task.project_id == Project.id)
+    .correlate_except(Task)
+    .scalar_subquery()
+)
@@ -2,13 +2,19 @@
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
 from app.models import db, User
+from app.schemas.fast import dump, get_schema
 from app.schemas import (
     UserRegisterSchema,
     UserLoginSchema,
     UserResponseSchema,
     RefreshTokenSchema
 )
-from app.utils.auth import TokenManager, PasswordManager, AuthenticationError
+from app.utils.auth import (
+    TokenManager,
+    PasswordManager,
+    AuthenticationError,
+    PasswordHasherBusy
+)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -17,7 +23,7 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 def register():
     """Register a new user."""
     try:
-        data = UserRegisterSchema().load(request.get_json())
+        data = get_schema(UserRegisterSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
@@ -46,12 +52,14 @@ def register():
 
         return jsonify({
             'message': 'User registered successfully',
-            'user': UserResponseSchema().dump(user),
+            'user': dump(UserResponseSchema, user),
             'tokens': tokens
         }), 201
 
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Registration failed', 'details': str(e)}), 500
@@ -61,23 +69,34 @@ def register():
 def login():
     """Authenticate user and return tokens."""
     try:
-        data = UserLoginSchema().load(request.get_json())
+        data = get_schema(UserLoginSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
     user = User.query.filter_by(email=data['email']).first()
 
-    if not user or not PasswordManager.verify_password(data['password'], user.password_hash):
-        return jsonify({'error': 'Invalid email or password'}), 401
+    try:
+        if not user or not PasswordManager.verify_password(data['password'], user.password_hash):
+            return jsonify({'error': 'Invalid email or password'}), 401
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
 
     if not user.is_active:
         return jsonify({'error': 'User account is inactive'}), 403
 
+    # Upgrade hashes made with older parameters while we have the password
+    if PasswordManager.needs_rehash(user.password_hash):
+        try:
+            user.password_hash = PasswordManager.hash_password(data['password'])
+            db.session.commit()
+        except PasswordHasherBusy:
+            pass
+
     try:
         tokens = TokenManager.create_tokens(user.id, user.username)
         return jsonify({
             'message': 'Login successful',
-            'user': UserResponseSchema().dump(user),
+            'user': dump(UserResponseSchema, user),
             'tokens': tokens
         }), 200
     except Exception as e:
@@ -88,7 +107,7 @@ def login():
 def refresh():
     """Refresh access token using refresh token."""
     try:
-        data = RefreshTokenSchema().load(request.get_json())
+        data = get_schema(RefreshTokenSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
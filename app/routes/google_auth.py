@@ -1,7 +1,6 @@
 from flask import Blueprint, redirect, request, jsonify, current_app
-from google_auth_oauthlib.flow import Flow
 from app.models import db, User
-from app.utils.auth import token_required
+from app.utils.auth import get_current_user, token_required
 import os
 import json
 
@@ -14,10 +13,13 @@ def connect_google():
     # Allow HTTP for local development
     os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
     
-    current_user = User.query.get(request.user_id)
+    current_user = get_current_user()
     if not current_user:
         return jsonify({'error': 'User not found'}), 404
 
+    # Imported here so workers that never connect Google skip loading it
+    from google_auth_oauthlib.flow import Flow
+
     # Create flow instance to manage the OAuth 2.0 Authorization Grant Flow steps.
     flow = Flow.from_client_config(
         client_config={
@@ -55,6 +57,7 @@ def google_callback():
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
+    from google_auth_oauthlib.flow import Flow
     flow = Flow.from_client_config(
         client_config={
             "web": {
@@ -1,5 +1,8 @@
 """Health check and API documentation routes."""
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, current_app, jsonify
+from app.models import db
+from app.utils.db_pool import pool_status
+from app.utils.metrics import render_metrics
 
 health_bp = Blueprint('health', __name__, url_prefix='/api')
 
@@ -13,6 +16,33 @@ def health_check():
     }), 200
 
 
+@health_bp.route('/health/pool', methods=['GET'])
+def pool_health():
+    """Database connection pool diagnostics for this worker process.
+
+    Unauthenticated, so it reports numbers only: no database URLs or pids.
+    Replicas are listed in ``DATABASE_REPLICA_URLS`` order.
+    """
+    replicas = current_app.extensions.get('db_replicas')
+    return jsonify({
+        'database': pool_status(db.engine),
+        'replicas': [
+            {
+                'healthy': replicas.is_healthy(engine),
+                **pool_status(engine, counters=False)
+            }
+            for engine in (replicas.engines if replicas else [])
+        ]
+    }), 200
+
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Request, SQL and Google API metrics in Prometheus text format."""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+
 @health_bp.route('/docs', methods=['GET'])
 def api_docs():
     """API documentation."""
@@ -28,6 +58,7 @@ def api_docs():
             },
             'projects': {
                 'GET /api/projects': 'Get all user projects',
+                'GET /api/projects/stats': 'Get task counts by status and priority, and overdue counts, per project',
                 'GET /api/projects/<id>': 'Get a specific project',
                 'POST /api/projects': 'Create a new project',
                 'PUT /api/projects/<id>': 'Update a project',
@@ -35,8 +66,11 @@ def api_docs():
             },
             'tasks': {
                 'GET /api/tasks/project/<project_id>': 'Get tasks for a project',
+                'GET /api/tasks/export': 'Stream all user tasks as NDJSON or CSV',
+                'GET /api/tasks/search': 'Full-text search over user tasks',
                 'GET /api/tasks/<id>': 'Get a specific task',
                 'POST /api/tasks/project/<project_id>': 'Create a new task',
+                'POST /api/tasks/project/<project_id>/batch': 'Create, update and delete tasks in one transaction',
                 'PUT /api/tasks/<id>': 'Update a task',
                 'DELETE /api/tasks/<id>': 'Delete a task'
             }
@@ -1,42 +1,100 @@
 """Project routes for CRUD operations."""
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
-from app.models import db, Project, User
+from app.models import db, Project, Task, User
+from app.schemas.fast import dump, get_schema
 from app.schemas import (
     ProjectCreateSchema,
     ProjectUpdateSchema,
     ProjectResponseSchema
 )
 from app.utils.auth import token_required
+from app.utils.calendar_sync import enqueue_event_deletes
+from app.utils.etag import make_etag, not_modified, set_etag
+from app.utils.pagination import get_limit, keyset_paginate, keyset_query
+from app.utils.project_stats import project_stats
+from app.utils.response_cache import cached_response
 
 projects_bp = Blueprint('projects', __name__, url_prefix='/api/projects')
 
 
 @projects_bp.route('', methods=['GET'])
 @token_required
+@cached_response('user')
 def get_projects():
-    """Get all projects for the authenticated user."""
-    try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+    """Get all projects for the authenticated user.
 
-        projects = Project.query.filter_by(owner_id=request.user_id).paginate(
-            page=page, per_page=per_page
+    Pass ``cursor``/``limit`` for keyset pagination. Without them the
+    response keeps its ``page``/``per_page`` shape, with ``total``, ``pages``
+    and ``current_page``, for existing clients.
+    """
+    try:
+        query = Project.query.filter_by(owner_id=request.user_id)
+
+        if 'cursor' not in request.args and 'limit' not in request.args:
+            page = request.args.get('page', 1, type=int)
+            per_page = get_limit(request.args.get('per_page', 10, type=int))
+
+            projects = query.order_by(Project.created_at, Project.id).paginate(
+                page=page, per_page=per_page
+            )
+
+            etag = make_etag(
+                [(p.id, p.updated_at, p.task_count) for p in projects.items] + [(projects.total,)]
+            )
+            response = not_modified(etag)
+            if response:
+                return response
+
+            response = jsonify({
+                'projects': dump(ProjectResponseSchema, projects.items, many=True),
+                'total': projects.total,
+                'pages': projects.pages,
+                'current_page': page
+            })
+            return set_etag(response, etag), 200
+
+        cursor = request.args.get('cursor')
+        limit = get_limit(request.args.get('limit', type=int))
+
+        # Version the page from its narrow columns before loading full rows
+        etag = make_etag(
+            keyset_query(query, Project, cursor)
+            .with_entities(Project.id, Project.updated_at, Project.task_count)
+            .limit(limit + 1)
         )
+        response = not_modified(etag)
+        if response:
+            return response
 
-        return jsonify({
-            'projects': ProjectResponseSchema(many=True).dump(projects.items),
-            'total': projects.total,
-            'pages': projects.pages,
-            'current_page': page
-        }), 200
+        projects, next_cursor = keyset_paginate(query, Project, cursor=cursor, limit=limit)
 
+        response = jsonify({
+            'projects': dump(ProjectResponseSchema, projects, many=True),
+            'next_cursor': next_cursor
+        })
+        return set_etag(response, etag), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Failed to fetch projects', 'details': str(e)}), 500
 
 
+@projects_bp.route('/stats', methods=['GET'])
+@token_required
+def get_project_stats():
+    """Get task counts by status and priority, and overdue counts, per project."""
+    try:
+        return jsonify({'projects': project_stats(request.user_id)}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch project stats', 'details': str(e)}), 500
+
+
 @projects_bp.route('/<int:project_id>', methods=['GET'])
 @token_required
+@cached_response('project:{project_id}')
 def get_project(project_id):
     """Get a specific project by ID."""
     try:
@@ -48,9 +106,15 @@ def get_project(project_id):
         if not project:
             return jsonify({'error': 'Project not found'}), 404
 
-        return jsonify({
-            'project': ProjectResponseSchema().dump(project)
-        }), 200
+        etag = make_etag([(project.id, project.updated_at, project.task_count)])
+        response = not_modified(etag)
+        if response:
+            return response
+
+        response = jsonify({
+            'project': dump(ProjectResponseSchema, project)
+        })
+        return set_etag(response, etag), 200
 
     except Exception as e:
         return jsonify({'error': 'Failed to fetch project', 'details': str(e)}), 500
@@ -61,7 +125,7 @@ def get_project(project_id):
 def create_project():
     """Create a new project."""
     try:
-        data = ProjectCreateSchema().load(request.get_json())
+        data = get_schema(ProjectCreateSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
@@ -77,7 +141,7 @@ def create_project():
 
         return jsonify({
             'message': 'Project created successfully',
-            'project': ProjectResponseSchema().dump(project)
+            'project': dump(ProjectResponseSchema, project)
         }), 201
 
     except Exception as e:
@@ -90,7 +154,7 @@ def create_project():
 def update_project(project_id):
     """Update an existing project."""
     try:
-        data = ProjectUpdateSchema().load(request.get_json())
+        data = get_schema(ProjectUpdateSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
@@ -115,7 +179,7 @@ def update_project(project_id):
 
         return jsonify({
             'message': 'Project updated successfully',
-            'project': ProjectResponseSchema().dump(project)
+            'project': dump(ProjectResponseSchema, project)
         }), 200
 
     except Exception as e:
@@ -136,6 +200,15 @@ def delete_project(project_id):
         if not project:
             return jsonify({'error': 'Project not found'}), 404
 
+        # Remove the calendar events of the project's tasks via the outbox
+        enqueue_event_deletes(
+            request.user_id,
+            db.session.query(Task.id, Task.google_event_id).filter(
+                Task.project_id == project.id,
+                Task.google_event_id.isnot(None)
+            )
+        )
+
         db.session.delete(project)
         db.session.commit()
 
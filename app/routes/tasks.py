@@ -1,27 +1,52 @@
 """Task routes for CRUD operations."""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from marshmallow import ValidationError
+from sqlalchemy import delete, select, update
 from app.models import db, Task, Project
+from app.schemas.fast import dump, get_schema
 from app.schemas import (
     TaskCreateSchema,
     TaskUpdateSchema,
+    TaskBatchOperationSchema,
+    TaskExportQuerySchema,
     TaskResponseSchema
 )
 from app.utils.auth import token_required
-from app.utils.google_calendar import (
-    create_calendar_event,
-    update_calendar_event,
-    delete_calendar_event
-)
-from app.models import User
+from app.utils.etag import make_etag, not_modified, set_etag
+from app.utils.export import MIMETYPES, csv_chunks, ndjson_chunks, stream_batches
+from app.utils.pagination import get_limit, keyset_paginate, keyset_query
+from app.utils.search import search_owned_tasks, search_terms
+from app.utils.calendar_sync import enqueue_calendar_sync, enqueue_calendar_syncs
+from app.utils.project_stats import record_bulk_changes
+from app.utils.response_cache import cached_response, mark_changed
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
 
+def load_owned_task(task_id):
+    """Fetch a task and check the user owns its project, in one query.
+
+    Returns ``(task, None)``, or ``(None, error_response)`` when the task
+    does not exist (404) or belongs to someone else's project (403).
+    """
+    row = db.session.execute(
+        select(Task, Project.owner_id)
+        .join(Project, Task.project_id == Project.id)
+        .where(Task.id == task_id)
+    ).first()
+
+    if not row:
+        return None, (jsonify({'error': 'Task not found'}), 404)
+    if row.owner_id != request.user_id:
+        return None, (jsonify({'error': 'Unauthorized'}), 403)
+    return row.Task, None
+
+
 @tasks_bp.route('/project/<int:project_id>', methods=['GET'])
 @token_required
+@cached_response('project:{project_id}')
 def get_project_tasks(project_id):
-    """Get all tasks for a specific project."""
+    """Get a page of tasks for a specific project."""
     try:
         # Verify user owns the project
         project = Project.query.filter_by(
@@ -42,38 +67,114 @@ def get_project_tasks(project_id):
         if priority:
             query = query.filter_by(priority=priority)
 
-        tasks = query.all()
+        cursor = request.args.get('cursor')
+        limit = get_limit(request.args.get('limit', type=int))
+
+        # Version the page from (id, updated_at) before loading full rows
+        etag = make_etag(
+            keyset_query(query, Task, cursor)
+            .with_entities(Task.id, Task.updated_at)
+            .limit(limit + 1)
+        )
+        response = not_modified(etag)
+        if response:
+            return response
+
+        tasks, next_cursor = keyset_paginate(query, Task, cursor=cursor, limit=limit)
 
+        response = jsonify({
+            'tasks': dump(TaskResponseSchema, tasks, many=True),
+            'next_cursor': next_cursor
+        })
+        return set_etag(response, etag), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch tasks', 'details': str(e)}), 500
+
+
+@tasks_bp.route('/export', methods=['GET'])
+@token_required
+def export_tasks():
+    """Stream every task in the user's projects as NDJSON or CSV."""
+    try:
+        params = get_schema(TaskExportQuerySchema).load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
+
+    # Plain rows rather than Task objects: nothing accumulates in the session
+    statement = (
+        select(*Task.__table__.columns)
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.owner_id == request.user_id)
+        .order_by(Task.id)
+    )
+    if 'status' in params:
+        statement = statement.where(Task.status == params['status'])
+    if 'priority' in params:
+        statement = statement.where(Task.priority == params['priority'])
+    if 'due_after' in params:
+        statement = statement.where(Task.due_date >= params['due_after'])
+    if 'due_before' in params:
+        statement = statement.where(Task.due_date < params['due_before'])
+
+    export_format = params['format']
+    batches = stream_batches(statement, current_app.config['TASK_EXPORT_BATCH_SIZE'])
+    chunks = csv_chunks if export_format == 'csv' else ndjson_chunks
+    response = current_app.response_class(
+        stream_with_context(chunks(batches, TaskResponseSchema)),
+        mimetype=MIMETYPES[export_format]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=tasks.{export_format}'
+    return response
+
+
+@tasks_bp.route('/search', methods=['GET'])
+@token_required
+def search_tasks():
+    """Full-text search over the user's tasks, best matches first."""
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'error': 'Search query is required'}), 400
+
+    try:
+        tasks, next_cursor = search_owned_tasks(
+            request.user_id,
+            terms,
+            cursor=request.args.get('cursor'),
+            limit=get_limit(request.args.get('limit', type=int))
+        )
         return jsonify({
-            'tasks': TaskResponseSchema(many=True).dump(tasks)
+            'tasks': dump(TaskResponseSchema, tasks, many=True),
+            'next_cursor': next_cursor
         }), 200
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': 'Failed to fetch tasks', 'details': str(e)}), 500
+        return jsonify({'error': 'Failed to search tasks', 'details': str(e)}), 500
 
 
 @tasks_bp.route('/<int:task_id>', methods=['GET'])
 @token_required
+@cached_response('task:{task_id}')
 def get_task(task_id):
     """Get a specific task."""
     try:
-        task = Task.query.get(task_id)
+        task, error = load_owned_task(task_id)
+        if error:
+            return error
 
-        if not task:
-            return jsonify({'error': 'Task not found'}), 404
+        etag = make_etag([(task.id, task.updated_at)])
+        response = not_modified(etag)
+        if response:
+            return response
 
-        # Verify user owns the project
-        project = Project.query.filter_by(
-            id=task.project_id,
-            owner_id=request.user_id
-        ).first()
-
-        if not project:
-            return jsonify({'error': 'Unauthorized'}), 403
-
-        return jsonify({
-            'task': TaskResponseSchema().dump(task)
-        }), 200
+        response = jsonify({
+            'task': dump(TaskResponseSchema, task)
+        })
+        return set_etag(response, etag), 200
 
     except Exception as e:
         return jsonify({'error': 'Failed to fetch task', 'details': str(e)}), 500
@@ -84,7 +185,7 @@ def get_task(task_id):
 def create_task(project_id):
     """Create a new task for a project."""
     try:
-        data = TaskCreateSchema().load(request.get_json())
+        data = get_schema(TaskCreateSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
@@ -108,19 +209,15 @@ def create_task(project_id):
         )
 
         db.session.add(task)
+        db.session.flush()
+
+        # Sync with Google Calendar via the outbox
+        enqueue_calendar_sync(request.user_id, task, 'create')
         db.session.commit()
-        
-        # Sync with Google Calendar
-        user = User.query.get(request.user_id)
-        if user and task.due_date:
-            event_id = create_calendar_event(user, task)
-            if event_id:
-                task.google_event_id = event_id
-                db.session.commit()
 
         return jsonify({
             'message': 'Task created successfully',
-            'task': TaskResponseSchema().dump(task)
+            'task': dump(TaskResponseSchema, task)
         }), 201
 
     except Exception as e:
@@ -128,29 +225,158 @@ def create_task(project_id):
         return jsonify({'error': 'Failed to create task', 'details': str(e)}), 500
 
 
+@tasks_bp.route('/project/<int:project_id>/batch', methods=['POST'])
+@token_required
+def batch_tasks(project_id):
+    """Apply a list of create/update/delete operations in one transaction.
+
+    The batch is all-or-nothing: if any operation is invalid or targets a
+    task outside the project, nothing is written and the per-item results
+    say why.
+    """
+    payload = request.get_json(silent=True)
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'Validation error', 'messages': {'operations': ['Must be a non-empty list']}}), 400
+    if len(operations) > current_app.config['TASK_BATCH_MAX_OPERATIONS']:
+        return jsonify({'error': 'Too many operations'}), 413
+
+    project = Project.query.filter_by(
+        id=project_id,
+        owner_id=request.user_id
+    ).first()
+
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+
+    # Validate every operation before touching the database
+    op_schema = get_schema(TaskBatchOperationSchema)
+    create_schema = get_schema(TaskCreateSchema)
+    update_schema = get_schema(TaskUpdateSchema)
+    loaded = []
+    results = []
+    for op in operations:
+        try:
+            op = op_schema.load(op)
+            if op['op'] == 'create':
+                op['data'] = create_schema.load(op['data'])
+            elif op['op'] == 'update':
+                op['data'] = update_schema.load(op['data'])
+            loaded.append(op)
+            results.append({'status': 200})
+        except ValidationError as err:
+            loaded.append(None)
+            results.append({'status': 400, 'messages': err.messages})
+
+    target_ids = {op['id'] for op in loaded if op and op['op'] != 'create'}
+    existing = {}
+    if target_ids:
+        existing = {
+            task.id: task for task in Task.query.filter(
+                Task.project_id == project_id,
+                Task.id.in_(target_ids)
+            )
+        }
+    deleted_ids = {op['id'] for op in loaded if op and op['op'] == 'delete'}
+    for op, result in zip(loaded, results):
+        if not op or op['op'] == 'create':
+            continue
+        if op['id'] not in existing:
+            result.update(status=404, error='Task not found')
+        elif op['op'] == 'update' and op['id'] in deleted_ids:
+            result.update(status=409, error='Task is deleted in this batch')
+
+    if any(result['status'] != 200 for result in results):
+        return jsonify({'error': 'Batch rejected', 'results': results}), 400
+
+    try:
+        created = [
+            Task(
+                title=op['data']['title'],
+                description=op['data'].get('description'),
+                project_id=project_id,
+                assignee_id=op['data'].get('assignee_id'),
+                priority=op['data'].get('priority', 'medium'),
+                due_date=op['data'].get('due_date')
+            )
+            for op in loaded if op['op'] == 'create'
+        ]
+        db.session.add_all(created)
+        db.session.flush()
+
+        updates = [dict(op['data'], id=op['id']) for op in loaded if op['op'] == 'update' and op['data']]
+        # Updates with no fields write nothing, so nothing to sync or invalidate
+        updated_ids = {values['id'] for values in updates}
+        deleted = [existing[task_id] for task_id in deleted_ids]
+
+        # Bulk statements bypass the flush hooks that keep the summary and
+        # the response cache current
+        mark_changed(task_ids=updated_ids | deleted_ids, project_ids=[project_id], user_id=request.user_id)
+        record_bulk_changes([
+            *((existing[values['id']], values) for values in updates),
+            *((task, None) for task in deleted)
+        ])
+        if updates:
+            db.session.execute(update(Task), updates)
+
+        # Sync with Google Calendar via the outbox
+        enqueue_calendar_syncs(request.user_id, [
+            *((task, 'create') for task in created),
+            *((existing[task_id], 'update') for task_id in updated_ids),
+            *((task, 'delete') for task in deleted)
+        ])
+
+        if deleted_ids:
+            db.session.execute(
+                delete(Task).where(Task.id.in_(deleted_ids)),
+                execution_options={'synchronize_session': False}
+            )
+            for task in deleted:
+                db.session.expunge(task)
+
+        created_ids = [task.id for task in created]
+        db.session.commit()
+
+        # Reload everything the response shows in one query; committed
+        # objects are expired and would otherwise refresh one by one
+        shown_ids = {op['id'] for op in loaded if op['op'] == 'update'}
+        tasks = {
+            task.id: task for task in Task.query.filter(Task.id.in_(set(created_ids) | shown_ids))
+        }
+
+        created_iter = iter(created_ids)
+        for op, result in zip(loaded, results):
+            result['op'] = op['op']
+            if op['op'] == 'create':
+                result.update(status=201, task=dump(TaskResponseSchema, tasks[next(created_iter)]))
+            elif op['op'] == 'update':
+                result['task'] = dump(TaskResponseSchema, tasks[op['id']])
+            else:
+                result['id'] = op['id']
+
+        return jsonify({
+            'message': 'Batch applied successfully',
+            'results': results
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to apply batch', 'details': str(e)}), 500
+
+
 @tasks_bp.route('/<int:task_id>', methods=['PUT'])
 @token_required
 def update_task(task_id):
     """Update an existing task."""
     try:
-        data = TaskUpdateSchema().load(request.get_json())
+        data = get_schema(TaskUpdateSchema).load(request.get_json())
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'messages': err.messages}), 400
 
     try:
-        task = Task.query.get(task_id)
-
-        if not task:
-            return jsonify({'error': 'Task not found'}), 404
-
-        # Verify user owns the project
-        project = Project.query.filter_by(
-            id=task.project_id,
-            owner_id=request.user_id
-        ).first()
-
-        if not project:
-            return jsonify({'error': 'Unauthorized'}), 403
+        task, error = load_owned_task(task_id)
+        if error:
+            return error
 
         # Update fields
         if 'title' in data:
@@ -166,16 +392,13 @@ def update_task(task_id):
         if 'due_date' in data:
             task.due_date = data['due_date']
 
+        # Sync with Google Calendar via the outbox
+        enqueue_calendar_sync(request.user_id, task, 'update')
         db.session.commit()
-        
-        # Sync with Google Calendar
-        user = User.query.get(request.user_id)
-        if user:
-            update_calendar_event(user, task)
 
         return jsonify({
             'message': 'Task updated successfully',
-            'task': TaskResponseSchema().dump(task)
+            'task': dump(TaskResponseSchema, task)
         }), 200
 
     except Exception as e:
@@ -188,27 +411,14 @@ def update_task(task_id):
 def delete_task(task_id):
     """Delete a task."""
     try:
-        task = Task.query.get(task_id)
-
-        if not task:
-            return jsonify({'error': 'Task not found'}), 404
-
-        # Verify user owns the project
-        project = Project.query.filter_by(
-            id=task.project_id,
-            owner_id=request.user_id
-        ).first()
-
-        if not project:
-            return jsonify({'error': 'Unauthorized'}), 403
+        task, error = load_owned_task(task_id)
+        if error:
+            return error
 
+        # Sync with Google Calendar via the outbox
+        enqueue_calendar_sync(request.user_id, task, 'delete')
         db.session.delete(task)
         db.session.commit()
-        
-        # Sync with Google Calendar
-        user = User.query.get(request.user_id)
-        if user:
-            delete_calendar_event(user, task)
 
         return jsonify({'message': 'Task deleted successfully'}), 200
 
@@ -1,5 +1,5 @@
 """Validation schemas for request/response data."""
-from marshmallow import Schema, fields, validate, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 
 
 class UserRegisterSchema(Schema):
@@ -95,6 +95,21 @@ class TaskUpdateSchema(Schema):
     due_date = fields.DateTime(allow_none=True)
 
 
+class TaskBatchOperationSchema(Schema):
+    """Schema for one operation in a task batch."""
+    op = fields.Str(
+        required=True,
+        validate=validate.OneOf(['create', 'update', 'delete'])
+    )
+    id = fields.Int()
+    data = fields.Dict(load_default=dict)
+
+    @validates_schema
+    def validate_id(self, data, **kwargs):
+        if data.get('op') in ('update', 'delete') and 'id' not in data:
+            raise ValidationError('Task id is required', 'id')
+
+
 class TaskResponseSchema(Schema):
     """Schema for task response."""
     id = fields.Int()
@@ -110,6 +125,22 @@ class TaskResponseSchema(Schema):
     updated_at = fields.DateTime()
 
 
+class TaskExportQuerySchema(Schema):
+    """Schema for task export query parameters."""
+    format = fields.Str(
+        validate=validate.OneOf(['ndjson', 'csv']),
+        load_default='ndjson'
+    )
+    status = fields.Str(
+        validate=validate.OneOf(['todo', 'in_progress', 'completed'])
+    )
+    priority = fields.Str(
+        validate=validate.OneOf(['low', 'medium', 'high'])
+    )
+    due_after = fields.DateTime()
+    due_before = fields.DateTime()
+
+
 class RefreshTokenSchema(Schema):
     """Schema for token refresh."""
     refresh_token = fields.Str(required=True)
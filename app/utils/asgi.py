@@ -0,0 +1,173 @@
+"""Serve the Flask app from an ASGI server such as uvicorn.
+
+asgiref's ``WsgiToAsgi`` runs every request on one shared thread, so an
+app wrapped in it handles a single request at a time. :class:`AsgiBridge`
+runs each request in a bounded pool of ``ASGI_THREADS`` threads instead.
+The server's event loop holds open connections, including idle keep-alive
+ones and slow uploads, and a thread is only taken while a request is in
+the app. Under a threaded WSGI server every open connection holds a thread.
+
+Requests run exactly as under a WSGI server: sync views in the request's
+thread, ``async def`` views in an event loop of their own while that thread
+waits, never on the server's loop. Either way a request holds its thread
+until it finishes, so each thread may need a database connection:
+``ASGI_THREADS`` defaults to, and may not exceed, what the pool hands out.
+"""
+import asyncio
+import contextvars
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from sqlalchemy.pool import QueuePool
+
+from app.models import db
+
+DEFAULT_THREADS = 32
+
+
+def build_environ(scope: dict, body) -> dict:
+    """WSGI environ for an ASGI HTTP ``scope`` and its request ``body`` file."""
+    script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+    path_info = scope['path'].encode('utf8').decode('latin1')
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class _Exchange:
+    """One HTTP request: the WSGI call in a pool thread, sends on the loop."""
+
+    def __init__(self, wsgi_application, scope, send, loop):
+        self.wsgi_application = wsgi_application
+        self.scope = scope
+        self._send = send
+        self.loop = loop
+        self.response_start = None
+        self.started = False
+
+    def send(self, message):
+        asyncio.run_coroutine_threadsafe(self._send(message), self.loop).result()
+
+    def start_response(self, status, headers, exc_info=None):
+        if exc_info and self.started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.response_start = {
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers],
+        }
+        return self.write
+
+    def write(self, data: bytes):
+        if not self.started:
+            self.started = True
+            self.send(self.response_start)
+        if data:
+            self.send({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+    def run(self, body):
+        result = self.wsgi_application(build_environ(self.scope, body), self.start_response)
+        try:
+            for data in result:
+                self.write(data)
+        finally:
+            # Streamed responses release their resources in close()
+            if hasattr(result, 'close'):
+                result.close()
+        self.write(b'')
+        self.send({'type': 'http.response.body'})
+
+
+class AsgiBridge:
+    """ASGI application running a WSGI app in a bounded thread pool."""
+
+    def __init__(self, wsgi_application, threads: int = DEFAULT_THREADS):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix='asgi')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        loop = asyncio.get_running_loop()
+        with SpooledTemporaryFile(max_size=65536) as body:
+            while True:
+                message = await receive()
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+            exchange = _Exchange(self.wsgi_application, scope, send, loop)
+            # Plain run_in_executor rather than asgiref's sync_to_async, so
+            # async views get their own loop instead of blocking the server's
+            context = contextvars.copy_context()
+            await loop.run_in_executor(self.executor, context.run, exchange.run, body)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def pool_limit(app):
+    """Connections the app's database pool hands out at once, or None if unbounded."""
+    with app.app_context():
+        pool = db.engine.pool
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return None
+    return pool.size() + pool._max_overflow
+
+
+def create_asgi_app(app):
+    """Wrap a Flask app for an ASGI server.
+
+    Runs ``ASGI_THREADS`` threads, by default one per connection the
+    database pool allows. Raises ValueError when ``ASGI_THREADS`` is larger
+    than the pool, where requests would time out waiting for a connection.
+    """
+    limit = pool_limit(app)
+    threads = app.config.get('ASGI_THREADS') or limit or DEFAULT_THREADS
+    if limit is not None and threads > limit:
+        raise ValueError(
+            f'ASGI_THREADS={threads} exceeds the database pool ({limit} connections); '
+            'lower it or raise DB_POOL_SIZE / DB_MAX_OVERFLOW'
+        )
+    return AsgiBridge(app, threads)
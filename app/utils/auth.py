@@ -1,10 +1,19 @@
 """Authentication utilities with JWT and password hashing."""
 import jwt
+import os
+import hmac
+import hashlib
+import multiprocessing
 import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import wraps
 from datetime import datetime, timedelta
-from flask import request, jsonify, current_app
+from flask import g, request, jsonify, current_app
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.models import db, User
+from app.utils.lru import LRUCache
 
 
 class AuthenticationError(Exception):
@@ -12,6 +21,11 @@ class AuthenticationError(Exception):
     pass
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full."""
+    pass
+
+
 class TokenManager:
     """Manages JWT token creation and validation."""
 
@@ -75,20 +89,154 @@ class TokenManager:
             raise AuthenticationError(f'Invalid token: {str(e)}')
 
 
+class TokenCache:
+    """Bounded, thread-safe LRU of verified access-token payloads.
+
+    Keys are an HMAC of the token under the signing key, so rotating
+    JWT_SECRET_KEY invalidates every entry. Entries expire at the token's
+    ``exp`` claim.
+    """
+
+    def __init__(self):
+        self._entries = LRUCache()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str, secret: str) -> bytes:
+        return hmac.new(secret.encode(), token.encode(), hashlib.sha256).digest()
+
+    def get(self, key: bytes):
+        """Return the cached payload, or None if absent or expired."""
+        with self._entries.lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if time.time() < expires_at:
+                    self.hits += 1
+                    return payload
+                self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, payload: dict, max_size: int):
+        self._entries.put(key, (payload, payload['exp']), max_size)
+
+    def clear(self):
+        with self._entries.lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._entries.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+token_cache = TokenCache()
+
+
+def verify_access_token(token: str) -> dict:
+    """Verify an access token, consulting the verified-token cache first."""
+    max_size = current_app.config['TOKEN_CACHE_SIZE']
+    if not max_size:
+        return TokenManager.verify_token(token, token_type='access')
+
+    key = TokenCache.key(token, current_app.config['JWT_SECRET_KEY'])
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = TokenManager.verify_token(token, token_type='access')
+        token_cache.put(key, payload, max_size)
+    return payload
+
+
+def _process_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class PasswordHasher:
+    """Runs password hashing off the request thread with a bounded queue.
+
+    ``kind`` is ``process`` (default), ``thread`` or ``inline``. The pool is
+    created lazily and again after a fork, so forked server workers never
+    share one. Hashing processes are started by a forkserver (spawn where
+    that is unavailable), never forked from a threaded server worker. When
+    ``queue_size`` jobs are already pending, a new job waits up to
+    ``queue_timeout`` seconds and then raises PasswordHasherBusy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._settings = None
+        self._slots = None
+
+    def _get_pool(self, config):
+        settings = (
+            config['PASSWORD_HASH_EXECUTOR'],
+            config['PASSWORD_HASH_WORKERS'],
+            config['PASSWORD_HASH_QUEUE_SIZE']
+        )
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid() or self._settings != settings:
+                if self._pool is not None and self._pid == os.getpid():
+                    self._pool.shutdown(wait=False)
+                kind, workers, queue_size = settings
+                if kind == 'process':
+                    self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=workers)
+                self._slots = threading.BoundedSemaphore(queue_size)
+                self._pid = os.getpid()
+                self._settings = settings
+            return self._pool, self._slots
+
+    def run(self, fn, *args):
+        config = current_app.config
+        if config['PASSWORD_HASH_EXECUTOR'] == 'inline':
+            return fn(*args)
+
+        pool, slots = self._get_pool(config)
+        if not slots.acquire(timeout=config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+            raise PasswordHasherBusy('Too many concurrent password operations')
+        try:
+            return pool.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+password_hasher = PasswordHasher()
+
+
 class PasswordManager:
     """Manages password hashing and verification."""
 
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using werkzeug."""
+        """Hash a password using werkzeug with the configured method."""
         if not password or len(password) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        return generate_password_hash(password, method='pbkdf2:sha256')
+        return password_hasher.run(
+            generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD']
+        )
 
     @staticmethod
     def verify_password(password: str, hash: str) -> bool:
         """Verify a password against its hash."""
-        return check_password_hash(hash, password)
+        return password_hasher.run(check_password_hash, hash, password)
+
+    @staticmethod
+    def needs_rehash(hash: str) -> bool:
+        """Whether a stored hash was made with other than the configured method."""
+        return hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
 
 
 def token_required(f):
@@ -110,7 +258,7 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
         
         try:
-            payload = TokenManager.verify_token(token, token_type='access')
+            payload = verify_access_token(token)
             request.user_id = payload['user_id']
             request.username = payload['username']
         except AuthenticationError as e:
@@ -125,6 +273,13 @@ def token_required(f):
     return decorated
 
 
+def get_current_user():
+    """Return the authenticated user, loading it at most once per request."""
+    if 'current_user' not in g:
+        g.current_user = db.session.get(User, request.user_id)
+    return g.current_user
+
+
 def admin_required(f):
     """Decorator to protect admin routes."""
     @wraps(f)
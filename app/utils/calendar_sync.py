@@ -0,0 +1,314 @@
+"""Transactional outbox for Google Calendar sync.
+
+Task routes call :func:`enqueue_calendar_sync` before committing, so the
+sync intent is stored atomically with the task change and the request never
+waits on Google. A worker started with ``flask calendar-sync`` drains the
+outbox in id order, sending each user's changes as Calendar batch requests
+(several users' at a time) and retrying failures with exponential backoff.
+A user's entries are applied strictly in order: while one is waiting to be
+retried, that user's later entries are held back.
+"""
+import contextvars
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import insert, select
+from sqlalchemy.orm import aliased
+
+from app.models import db, User, Task, CalendarSyncOutbox
+from app.utils.google_calendar import CalendarOperation, GoogleCalendarClient
+
+
+def _needs_sync(task, action: str) -> bool:
+    if action == 'create':
+        return bool(task.due_date)
+    if action == 'delete':
+        return bool(task.google_event_id)
+    return True
+
+
+def enqueue_calendar_sync(user_id: int, task, action: str):
+    """Add a sync intent for ``task`` to the current transaction.
+
+    Returns the outbox entry, or None when there is nothing to sync.
+    """
+    if not _needs_sync(task, action):
+        return None
+
+    entry = CalendarSyncOutbox(
+        user_id=user_id,
+        task_id=task.id,
+        action=action,
+        google_event_id=task.google_event_id
+    )
+    db.session.add(entry)
+    return entry
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """Delay before retrying an entry that has failed ``attempts`` times."""
+    base = current_app.config['CALENDAR_SYNC_BACKOFF_BASE']
+    cap = current_app.config['CALENDAR_SYNC_BACKOFF_MAX']
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def enqueue_calendar_syncs(user_id: int, changes):
+    """Queue sync intents for ``changes`` of ``(task, action)`` in one statement."""
+    values = [
+        {'user_id': user_id, 'task_id': task.id, 'action': action, 'google_event_id': task.google_event_id}
+        for task, action in changes if _needs_sync(task, action)
+    ]
+    if values:
+        db.session.execute(insert(CalendarSyncOutbox), values)
+
+
+def enqueue_event_deletes(user_id: int, rows):
+    """Queue deletion of the events behind ``rows`` of ``(task_id, google_event_id)``.
+
+    Used when tasks are removed in bulk, e.g. with their project.
+    """
+    values = [
+        {'user_id': user_id, 'task_id': task_id, 'action': 'delete', 'google_event_id': event_id}
+        for task_id, event_id in rows if event_id
+    ]
+    if values:
+        db.session.execute(insert(CalendarSyncOutbox), values)
+
+
+def resolve_operation(entry):
+    """Turn an outbox entry into the calendar change it implies now, or None."""
+    if entry.action == 'delete':
+        return CalendarOperation('delete', None, entry.google_event_id)
+
+    # A retried entry may carry the event an earlier attempt created before
+    # its commit failed (see _reschedule); reuse it rather than duplicate it
+    recorded = entry.google_event_id if entry.attempts else None
+
+    task = db.session.get(Task, entry.task_id)
+    if not task:
+        # Deleted since; its own delete entry cleans up the event it knew of
+        if recorded:
+            return CalendarOperation('delete', None, recorded)
+        return None
+    event_id = task.google_event_id or recorded
+    if not task.due_date:
+        if event_id:
+            return CalendarOperation('delete', task, event_id)
+        return None
+    if event_id:
+        return CalendarOperation('update', task, event_id)
+    return CalendarOperation('create', task, None)
+
+
+def process_outbox(client=None, batch_size: int = None, now: datetime = None) -> dict:
+    """Drain one batch of due outbox entries.
+
+    Due entries are grouped per user and sent through the client's batch
+    call. Entries for the same task (or deleted event) are coalesced into a
+    single operation built from the task's current state, so one batch never
+    touches a task twice. Returns counts of processed, retried and failed
+    entries.
+    """
+    client = client or GoogleCalendarClient()
+    batch_size = batch_size or current_app.config['CALENDAR_SYNC_BATCH_SIZE']
+    now = now or datetime.utcnow()
+
+    stats = {'processed': 0, 'retried': 0, 'failed': 0}
+    # A user with an entry in backoff is held back entirely, so their later
+    # entries cannot overtake it; filtering in SQL keeps such users from
+    # filling the batch and starving everyone else
+    waiting = aliased(CalendarSyncOutbox)
+    backing_off = (
+        select(waiting.id)
+        .where(
+            waiting.user_id == CalendarSyncOutbox.user_id,
+            waiting.status == 'pending',
+            waiting.next_attempt_at > now
+        )
+        .exists()
+    )
+    entries = (
+        CalendarSyncOutbox.query
+        .filter(
+            CalendarSyncOutbox.status == 'pending',
+            CalendarSyncOutbox.next_attempt_at <= now,
+            ~backing_off
+        )
+        .order_by(CalendarSyncOutbox.id)
+        .limit(batch_size)
+        .all()
+    )
+
+    due = OrderedDict()
+    for entry in entries:
+        due.setdefault(entry.user_id, []).append(entry)
+
+    if not due:
+        return stats
+
+    # Load the users and tasks involved up front; resolve_operation then hits
+    # the identity map
+    users = {user.id: user for user in User.query.filter(User.id.in_(due))}
+    task_ids = {e.task_id for group in due.values() for e in group if e.action != 'delete'}
+    if task_ids:
+        Task.query.filter(Task.id.in_(task_ids)).all()
+
+    # Resolve every user's operations here, then send the users' batches
+    # concurrently: only the Google calls leave this thread, never the session
+    pending = []
+    for user_id, user_entries in due.items():
+        user = users.get(user_id)
+        user_stats = {'processed': 0, 'retried': 0, 'failed': 0}
+        keyed = OrderedDict()
+        for entry in user_entries:
+            if entry.action == 'delete':
+                key = ('event', entry.google_event_id)
+            else:
+                key = ('task', entry.task_id)
+            keyed.setdefault(key, []).append(entry)
+
+        operations = []
+        groups = []
+        for group in keyed.values():
+            op = resolve_operation(group[-1]) if user and user.google_credentials else None
+            if op is None:
+                _complete(group, user_stats)
+            else:
+                operations.append(op)
+                groups.append(group)
+        pending.append((user_id, user_entries, operations, groups, user_stats))
+
+    batches = [(users[user_id], operations) for user_id, _, operations, _, _ in pending if operations]
+    results = iter(execute_batches(client, batches))
+    # Event ids as the batches left them, read before any commit or rollback
+    outcomes = []
+    for _, _, operations, _, _ in pending:
+        errors = next(results) if operations else []
+        event_ids = [op.task.google_event_id if op.task is not None else None for op in operations]
+        outcomes.append((errors, event_ids))
+
+    for (user_id, user_entries, operations, groups, user_stats), (errors, event_ids) in zip(pending, outcomes):
+        for group, op, error, event_id in zip(groups, operations, errors, event_ids):
+            if error is None:
+                if op.task is not None:
+                    # Restores the id if an earlier user's rollback discarded it
+                    op.task.google_event_id = event_id
+                _complete(group, user_stats)
+            else:
+                for entry in group:
+                    _schedule_retry(entry, error, now, user_stats)
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            # e.g. the task was deleted meanwhile, or the database went away
+            db.session.rollback()
+            current_app.logger.error(f"Calendar sync commit for user {user_id} failed: {str(e)}")
+            user_stats = {'processed': 0, 'retried': 0, 'failed': 0}
+            _reschedule(user_entries, zip(groups, operations, errors, event_ids), e, now, user_stats)
+
+        for key, count in user_stats.items():
+            stats[key] += count
+
+    return stats
+
+
+def _reschedule(entries, outcomes, error, now, stats):
+    """Retry all of a user's entries after their commit failed.
+
+    ``outcomes`` holds ``(group, operation, error, event_id)`` per sent
+    operation. Events Google did create are recorded on their entries, so
+    the retry updates (or, if the task is gone, deletes) them instead of
+    creating duplicates.
+    """
+    for group, op, op_error, event_id in outcomes:
+        if op_error is None and op.action == 'create' and event_id:
+            for entry in group:
+                entry.google_event_id = event_id
+    for entry in entries:
+        _schedule_retry(entry, error, now, stats)
+    try:
+        db.session.commit()
+    except Exception as e:
+        # The entries stay pending and due, and are sent again next time
+        db.session.rollback()
+        current_app.logger.error(f"Calendar sync could not reschedule entries: {str(e)}")
+
+
+def execute_batches(client, batches):
+    """Send each ``(user, operations)`` batch through ``client.execute_batch``.
+
+    Up to ``CALENDAR_SYNC_CONCURRENCY`` users' batches are in flight at
+    once, each user's on a single thread so its operations keep their order.
+    Returns one error list per batch, in input order.
+    """
+    def execute(user, operations):
+        try:
+            return client.execute_batch(user, operations)
+        except Exception as e:
+            return [e] * len(operations)
+
+    workers = min(current_app.config['CALENDAR_SYNC_CONCURRENCY'], len(batches))
+    if workers <= 1:
+        return [execute(user, operations) for user, operations in batches]
+    with ThreadPoolExecutor(workers, thread_name_prefix='calendar-sync') as executor:
+        # Copied contexts give the threads current_app for config lookups
+        futures = [
+            executor.submit(contextvars.copy_context().run, execute, user, operations)
+            for user, operations in batches
+        ]
+        return [future.result() for future in futures]
+
+
+def _complete(entries, stats):
+    for entry in entries:
+        db.session.delete(entry)
+    stats['processed'] += len(entries)
+
+
+def _schedule_retry(entry, error, now, stats):
+    entry.attempts += 1
+    entry.last_error = str(error)
+    if entry.attempts >= current_app.config['CALENDAR_SYNC_MAX_ATTEMPTS']:
+        entry.status = 'failed'
+        stats['failed'] += 1
+        current_app.logger.error(
+            f"Calendar sync for task {entry.task_id} failed permanently: {str(error)}"
+        )
+    else:
+        entry.next_attempt_at = now + get_backoff(entry.attempts)
+        stats['retried'] += 1
+
+
+@click.command('calendar-sync')
+@click.option('--once', is_flag=True, help='Drain one batch and exit.')
+@click.option('--interval', default=1.0, show_default=True, help='Seconds to sleep when idle.')
+@click.option('--batch-size', type=int, default=None, help='Entries per batch.')
+@with_appcontext
+def calendar_sync_command(once, interval, batch_size):
+    """Run the Google Calendar outbox worker.
+
+    Run a single worker per database; entries are not locked between workers.
+    """
+    while True:
+        try:
+            stats = process_outbox(batch_size=batch_size)
+        except Exception as e:
+            # Keep the worker alive; the batch's entries are still pending
+            db.session.rollback()
+            current_app.logger.exception(f"Calendar sync batch failed: {str(e)}")
+            stats = None
+        if stats and any(stats.values()):
+            click.echo(
+                f"processed={stats['processed']} retried={stats['retried']} failed={stats['failed']}"
+            )
+        if once:
+            break
+        if not stats or not stats['processed']:
+            time.sleep(interval)
+        db.session.remove()
@@ -0,0 +1,127 @@
+"""Negotiated gzip/brotli response compression.
+
+Responses whose mimetype is in ``COMPRESS_MIMETYPES`` are compressed with
+the best encoding the client accepts: brotli when the ``brotli`` package is
+installed, otherwise gzip. Buffered responses smaller than
+``COMPRESS_MIN_SIZE`` bytes are sent as they are. Streamed responses are
+compressed chunk by chunk and flushed after each one, so clients receive
+data as it is produced instead of after the whole body is built.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings) -> str:
+    """The encoding to use for a request's Accept-Encoding, or None.
+
+    Picks the highest quality the client gave; ties go to the server's
+    preference (brotli before gzip). ``*`` matches any encoding.
+    """
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compress a whole body with ``encoding``."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_chunks(chunks, encoding: str, level: int):
+    stream = _BrotliStream(level) if encoding == 'br' else _GzipStream(level)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield stream.compress(chunk)
+        yield stream.finish()
+    finally:
+        # Close the wrapped iterator so stream_with_context teardown runs
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _compressible(response, config) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if 'Content-Encoding' in response.headers or response.direct_passthrough:
+        return False
+    return response.mimetype in config['COMPRESS_MIMETYPES']
+
+
+def init_compression(app):
+    """Compress responses after every other after_request hook has run.
+
+    Register this before other hooks: Flask runs after_request functions
+    in reverse order of registration.
+    """
+    if not app.config.get('COMPRESS_ENABLED'):
+        return
+
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not _compressible(response, config):
+            return response
+        # Compressible types vary by Accept-Encoding whether or not this
+        # particular response was compressed, so caches keep them apart
+        response.vary.add('Accept-Encoding')
+        if request.method == 'HEAD' or 'no-transform' in response.headers.get('Cache-Control', ''):
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        level = config['COMPRESS_BR_LEVEL'] if encoding == 'br' else config['COMPRESS_LEVEL']
+
+        if response.is_streamed:
+            response.response = _compress_chunks(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(compress(data, encoding, level))
+        response.headers['Content-Encoding'] = encoding
+        return response
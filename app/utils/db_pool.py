@@ -0,0 +1,135 @@
+"""Database connection pool instrumentation and fork safety.
+
+Queue-pooled engines (see ``SQLALCHEMY_ENGINE_OPTIONS``) use
+:class:`TimedQueuePool`, which records how long each checkout waited for a
+free connection. :func:`pool_status` combines those counters with the
+pool's live size, checked-out and overflow numbers.
+
+Engines are disposed in forked children so pre-forking servers (gunicorn
+with ``--preload``) never share the parent's sockets between workers.
+"""
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Per-process checkout counters, shared by all instrumented pools."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.connects = 0
+            self.invalidations = 0
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'checkout_timeouts': self.timeouts,
+                'wait_ms_avg': round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+                'connects': self.connects,
+                'invalidations': self.invalidations
+            }
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records the time each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+_engines = weakref.WeakSet()
+
+
+def _dispose_engines_after_fork():
+    # close=False leaves the parent's connections alone; the child just
+    # drops its references and opens its own on first use
+    for engine in list(_engines):
+        engine.dispose(close=False)
+    pool_stats.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+
+def engine_options(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS with the instrumented pool class filled in."""
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if 'pool_size' in options and 'poolclass' not in options:
+        options['poolclass'] = TimedQueuePool
+    return options
+
+
+def register_engine(engine):
+    """Track ``engine`` for post-fork disposal and count its connections."""
+    if engine in _engines:
+        return
+    _engines.add(engine)
+    event.listen(engine, 'connect', lambda *args: pool_stats.record_connect())
+    event.listen(engine, 'invalidate', lambda *args: pool_stats.record_invalidation())
+
+
+def pool_status(engine, counters: bool = True) -> dict:
+    """Live pool occupancy, plus this process's checkout counters.
+
+    The counters cover every instrumented pool in the process, so pass
+    ``counters=False`` when reporting more than one engine.
+    """
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout()
+        )
+    if counters:
+        status.update(pool_stats.snapshot())
+    return status
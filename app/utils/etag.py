@@ -0,0 +1,26 @@
+"""Weak ETags and conditional GET handling for read endpoints."""
+import hashlib
+from flask import request, current_app
+
+
+def make_etag(rows) -> str:
+    """Digest an iterable of version tuples, e.g. ``(id, updated_at)`` rows."""
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
+def not_modified(etag: str):
+    """Return a 304 response if the client already holds ``etag``, else None."""
+    if request.if_none_match.contains_weak(etag):
+        return set_etag(current_app.response_class(status=304), etag)
+    return None
+
+
+def set_etag(response, etag: str):
+    """Attach a weak ETag and ask clients to revalidate before reuse."""
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
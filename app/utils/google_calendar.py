@@ -1,66 +1,88 @@
 import json
+import hashlib
 import datetime
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from collections import namedtuple
 from flask import current_app
+from app.utils.lru import LRUCache
+from app.utils.metrics import observe_google_call
+
+# One calendar change: action is create, update or delete. ``task`` may be
+# None for deletes whose task row is already gone.
+CalendarOperation = namedtuple('CalendarOperation', ['action', 'task', 'event_id'])
+
+
+class ServiceCache(LRUCache):
+    """Bounded LRU of Calendar service clients, keyed per user and credentials version.
+
+    A cached client keeps its parsed credentials and its httplib2 connection,
+    so warm calls skip JSON parsing, discovery and the TLS handshake. Clients
+    are not thread-safe; each is meant to be used by one caller at a time.
+    """
+
+
+service_cache = ServiceCache()
+
+
+def build(*args, **kwargs):
+    """googleapiclient's ``build``; the client libraries load on first use."""
+    from googleapiclient.discovery import build as discovery_build
+    return discovery_build(*args, **kwargs)
+
+
+def _credentials_version(credentials_json):
+    return hashlib.sha256(credentials_json.encode()).hexdigest()
+
 
 def get_google_service(user):
-    """Get Google Calendar service for a user."""
+    """Get Google Calendar service for a user, reusing a cached client when possible.
+
+    Refreshed credentials are written to ``user.google_credentials``; the
+    caller commits.
+    """
     if not user.google_credentials:
         return None
-    
-    creds_data = json.loads(user.google_credentials)
-    creds = Credentials.from_authorized_user_info(creds_data)
-    
+
+    key = (user.id, _credentials_version(user.google_credentials))
+    entry = service_cache.get(key)
+    if entry is None:
+        import httplib2
+        from google.oauth2.credentials import Credentials
+        from google_auth_httplib2 import AuthorizedHttp, Request
+
+        creds = Credentials.from_authorized_user_info(json.loads(user.google_credentials))
+        http = httplib2.Http(timeout=current_app.config['GOOGLE_API_TIMEOUT'])
+        api_root = current_app.config['GOOGLE_API_ROOT']
+        service = build(
+            'calendar', 'v3',
+            http=AuthorizedHttp(creds, http=http),
+            cache_discovery=False,
+            static_discovery=True,
+            client_options={'api_endpoint': f'{api_root}calendar/v3/'} if api_root else None
+        )
+        entry = (service, creds, Request(http))
+        service_cache.put(key, entry, current_app.config['GOOGLE_CLIENT_CACHE_SIZE'])
+
+    service, creds, refresh_request = entry
     if creds.expired and creds.refresh_token:
-        from google.auth.transport.requests import Request
-        creds.refresh(Request())
-        # Update user credentials in db
+        # Refresh in place over the pooled connection; the cached client
+        # holds the same credentials object
+        with observe_google_call('oauth.refresh'):
+            creds.refresh(refresh_request)
+        # Saved by the caller's commit; this may run on a worker thread that
+        # must not use the session
         user.google_credentials = creds.to_json()
-        from app.models import db
-        db.session.commit()
-        
-    return build('calendar', 'v3', credentials=creds)
-
-def create_calendar_event(user, task):
-    """Create an event in Google Calendar."""
-    service = get_google_service(user)
-    if not service:
-        return None
-        
-    if not task.due_date:
-        return None
-        
-    event = {
-        'summary': task.title,
-        'description': task.description,
-        'start': {
-            'dateTime': task.due_date.isoformat(),
-            'timeZone': 'UTC',
-        },
-        'end': {
-            'dateTime': (task.due_date + datetime.timedelta(hours=1)).isoformat(),
-            'timeZone': 'UTC',
-        },
-    }
-    
-    try:
-        event = service.events().insert(calendarId='primary', body=event).execute()
-        return event.get('id')
-    except Exception as e:
-        current_app.logger.error(f"Error creating calendar event: {str(e)}")
-        return None
+        service_cache.pop(key)
+        service_cache.put(
+            (user.id, _credentials_version(user.google_credentials)),
+            entry,
+            current_app.config['GOOGLE_CLIENT_CACHE_SIZE']
+        )
 
-def update_calendar_event(user, task):
-    """Update an event in Google Calendar."""
-    if not task.google_event_id:
-        return create_calendar_event(user, task)
-        
-    service = get_google_service(user)
-    if not service:
-        return None
-        
-    event = {
+    return service
+
+def build_event_body(task):
+    """Build the Calendar event resource for a task."""
+    return {
         'summary': task.title,
         'description': task.description,
         'start': {
@@ -72,31 +94,74 @@ def update_calendar_event(user, task):
             'timeZone': 'UTC',
         },
     }
-    
-    try:
-        service.events().update(
-            calendarId='primary',
-            eventId=task.google_event_id,
-            body=event
-        ).execute()
-        return task.google_event_id
-    except Exception as e:
-        current_app.logger.error(f"Error updating calendar event: {str(e)}")
-        return None
 
-def delete_calendar_event(user, task):
-    """Delete an event from Google Calendar."""
-    if not task.google_event_id:
-        return
-        
-    service = get_google_service(user)
-    if not service:
-        return
-        
-    try:
-        service.events().delete(
-            calendarId='primary',
-            eventId=task.google_event_id
-        ).execute()
-    except Exception as e:
-        current_app.logger.error(f"Error deleting calendar event: {str(e)}")
+class GoogleCalendarClient:
+    """Calendar operations sent as batch requests, failing per operation so callers can retry."""
+
+    def execute_batch(self, user, operations):
+        """Send operations as Calendar batch requests and map results onto tasks.
+
+        Operations go out in batches of at most ``GOOGLE_BATCH_SIZE`` calls.
+        Created event ids are written to ``task.google_event_id`` and deleted
+        ones cleared; the caller commits. Returns one exception (or None) per
+        operation, in input order.
+        """
+        errors = [None] * len(operations)
+        service = get_google_service(user)
+        if not service:
+            return errors
+
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import BatchHttpRequest
+
+        events = service.events()
+        limit = current_app.config['GOOGLE_BATCH_SIZE']
+        api_root = current_app.config['GOOGLE_API_ROOT']
+
+        answered = set()
+
+        def callback(request_id, response, exception):
+            index = int(request_id)
+            answered.add(index)
+            op = operations[index]
+            if exception is not None:
+                # The event is already gone, which is what a delete wants
+                if not (op.action == 'delete' and isinstance(exception, HttpError)
+                        and exception.resp.status in (404, 410)):
+                    errors[index] = exception
+                    return
+            if op.task is None:
+                return
+            if op.action == 'create':
+                op.task.google_event_id = response.get('id')
+            elif op.action == 'update':
+                # Usually unchanged; set when a retry reuses a recorded event
+                op.task.google_event_id = op.event_id
+            elif op.action == 'delete':
+                op.task.google_event_id = None
+
+        for start in range(0, len(operations), limit):
+            if api_root:
+                batch = BatchHttpRequest(callback=callback, batch_uri=f'{api_root}batch/calendar/v3')
+            else:
+                batch = service.new_batch_http_request(callback=callback)
+            for index in range(start, min(start + limit, len(operations))):
+                op = operations[index]
+                if op.action == 'create':
+                    request = events.insert(calendarId='primary', body=build_event_body(op.task))
+                elif op.action == 'update':
+                    request = events.update(
+                        calendarId='primary', eventId=op.event_id, body=build_event_body(op.task)
+                    )
+                else:
+                    request = events.delete(calendarId='primary', eventId=op.event_id)
+                batch.add(request, request_id=str(index))
+            try:
+                with observe_google_call('batch'):
+                    batch.execute()
+            except Exception as e:
+                for index in range(start, min(start + limit, len(operations))):
+                    if index not in answered:
+                        errors[index] = e
+
+        return errors
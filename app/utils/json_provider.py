@@ -0,0 +1,65 @@
+"""orjson-backed JSON provider producing the same bytes as Flask's default."""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class OrJSONProvider(DefaultJSONProvider):
+    """Serialize with orjson, matching DefaultJSONProvider's output.
+
+    Keys are sorted and datetimes and other non-native values go through
+    Flask's ``default`` hook. Output containing non-ASCII characters or DEL,
+    which orjson does not escape, and options orjson lacks are handed to the
+    standard library instead. Floats keep their value but may be spelled
+    differently (``1e-05`` becomes ``0.00001``), and NaN and infinity become
+    ``null`` rather than the invalid ``NaN`` tokens the stdlib emits.
+    """
+
+    def _options(self, kwargs):
+        if orjson is None or set(kwargs) - {'indent', 'separators'}:
+            return None
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        indent = kwargs.get('indent')
+        if indent == 2:
+            return option | orjson.OPT_INDENT_2
+        if indent is None and kwargs.get('separators') == (',', ':'):
+            return option
+        return None
+
+    def _dumpb(self, obj, kwargs):
+        option = self._options(kwargs)
+        if option is not None:
+            try:
+                data = orjson.dumps(obj, default=self.default, option=option)
+                if not self.ensure_ascii or (data.isascii() and b'\x7f' not in data):
+                    return data
+            except (TypeError, orjson.JSONEncodeError):
+                pass
+        return super().dumps(obj, **kwargs).encode()
+
+    def dumps(self, obj, **kwargs):
+        return self._dumpb(obj, kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # e.g. NaN tokens or integers beyond 64 bits
+            return super().loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args = {'indent': 2}
+        else:
+            dump_args = {'separators': (',', ':')}
+        return self._app.response_class(
+            self._dumpb(obj, dump_args) + b'\n', mimetype=self.mimetype
+        )
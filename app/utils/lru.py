@@ -0,0 +1,45 @@
+"""Bounded, thread-safe least-recently-used mapping shared by the in-process caches."""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Mapping that evicts the least recently used keys beyond ``max_size``.
+
+    Each call is atomic. Callers that read, check and write in several calls
+    (expiry, counters) hold ``lock``, which is reentrant, around them.
+    """
+
+    def __init__(self, max_size: int = None):
+        self.max_size = max_size
+        self.lock = threading.RLock()
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the value for ``key`` and mark it recently used."""
+        with self.lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value, max_size: int = None):
+        """Store ``value``, evicting down to ``max_size`` (default: the cache's)."""
+        with self.lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            limit = self.max_size if max_size is None else max_size
+            if limit is not None:
+                while len(self._entries) > limit:
+                    self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self.lock:
+            return self._entries.pop(key, default)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
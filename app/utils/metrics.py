@@ -0,0 +1,116 @@
+"""Request, SQL and Google API metrics in Prometheus format.
+
+:func:`init_metrics` times every request and, through SQLAlchemy engine
+events, counts the statements it runs and the time spent in them. Calls to
+Google go through :func:`observe_google_call`. ``GET /api/metrics`` renders
+everything with :func:`render_metrics`.
+
+With several worker processes, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty
+directory shared by the workers before starting the server; each process
+then writes its samples there and the endpoint aggregates all of them.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency',
+    ['method', 'endpoint', 'status']
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements executed per request',
+    ['method', 'endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, float('inf'))
+)
+REQUEST_SQL_TIME = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL per request',
+    ['method', 'endpoint']
+)
+SQL_QUERIES = Counter('db_queries', 'SQL statements executed, in or outside requests')
+GOOGLE_LATENCY = Histogram(
+    'google_api_request_duration_seconds', 'Outbound Google API call latency',
+    ['operation', 'outcome']
+)
+
+
+def _endpoint():
+    # The URL rule keeps label cardinality bounded, unlike the raw path
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    SQL_QUERIES.inc()
+    if has_app_context() and 'request_metrics' in g:
+        g.request_metrics['queries'] += 1
+        g.request_metrics['sql_time'] += elapsed
+
+
+def instrument_engine(engine):
+    """Count statements and SQL time on ``engine``."""
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_metrics(app, engine):
+    """Register the per-request timing hooks on ``app``."""
+    instrument_engine(engine)
+
+    @app.before_request
+    def start_request_metrics():
+        g.request_metrics = {'start': time.perf_counter(), 'queries': 0, 'sql_time': 0.0}
+
+    @app.after_request
+    def note_response_status(response):
+        if 'request_metrics' in g:
+            g.request_metrics['status'] = response.status_code
+        return response
+
+    # Recorded at teardown, which unlike after_request also runs when a view
+    # raises an exception nothing handled; those count as 500s
+    @app.teardown_request
+    def record_request_metrics(exc):
+        metrics = g.pop('request_metrics', None)
+        if metrics is None:
+            return
+        endpoint = _endpoint()
+        REQUEST_LATENCY.labels(request.method, endpoint, metrics.get('status', 500)).observe(
+            time.perf_counter() - metrics['start']
+        )
+        REQUEST_QUERIES.labels(request.method, endpoint).observe(metrics['queries'])
+        REQUEST_SQL_TIME.labels(request.method, endpoint).observe(metrics['sql_time'])
+
+
+@contextmanager
+def observe_google_call(operation: str):
+    """Time one outbound Google API call, labelled ok or error."""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        GOOGLE_LATENCY.labels(operation, outcome).observe(time.perf_counter() - start)
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` for the Prometheus scrape endpoint."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
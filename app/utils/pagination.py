@@ -0,0 +1,63 @@
+"""Keyset (cursor) pagination over ``(created_at, id)``."""
+import base64
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(value, row_id: int) -> str:
+    """Encode a row position ``(value, id)`` as an opaque cursor string.
+
+    ``value`` is the leading sort key: datetimes are written in ISO format,
+    anything else as its ``repr``.
+    """
+    text = value.isoformat() if isinstance(value, datetime) else repr(value)
+    raw = f'{text}|{row_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, parse=datetime.fromisoformat) -> tuple:
+    """Decode a cursor into ``(value, id)``, reading the value with ``parse``.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return parse(value), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def get_limit(requested: int = None) -> int:
+    """Clamp a requested page size to the configured bounds."""
+    if requested is None or requested < 1:
+        return current_app.config['PAGINATION_DEFAULT_LIMIT']
+    return min(requested, current_app.config['PAGINATION_MAX_LIMIT'])
+
+
+def keyset_query(query, model, cursor: str = None):
+    """Order ``query`` by ``(created_at, id)`` starting strictly after ``cursor``."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at > created_at,
+            and_(model.created_at == created_at, model.id > row_id)
+        ))
+    return query.order_by(model.created_at, model.id)
+
+
+def keyset_paginate(query, model, cursor: str = None, limit: int = None):
+    """Return ``(items, next_cursor)`` for one page of ``query``.
+
+    Rows are ordered by ``(created_at, id)`` and the page starts strictly after
+    ``cursor``, so the cost of a page does not depend on how deep it is.
+    """
+    limit = get_limit(limit)
+    rows = keyset_query(query, model, cursor).limit(limit + 1).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
@@ -0,0 +1,235 @@
+"""Per-project task counts for the dashboard.
+
+:func:`project_stats` returns, for each of a user's projects, task counts by
+status and by priority plus the number of overdue tasks (due in the past
+and not completed). By default everything comes from one GROUP BY over the
+user's tasks.
+
+With ``PROJECT_STATS_SUMMARY`` on, counts by status and priority are kept in
+``project_task_stats`` instead, one row per project, status and priority,
+updated in the same transaction as every task write. Reading them is
+proportional to the number of projects rather than tasks. Overdue counts
+depend on the clock, so they are still counted from tasks, through the
+``(project_id, status, due_date)`` index. Run ``flask project-stats-rebuild``
+after turning the summary on, and whenever it may have drifted.
+
+ORM writes are tracked by session flush hooks. Bulk UPDATE and DELETE
+statements skip those hooks, so callers report them with
+:func:`record_bulk_changes` before executing them.
+"""
+from collections import Counter
+from datetime import datetime
+
+import click
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, delete, event, func, insert, inspect, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.models import db, Project, ProjectTaskStats, Task
+from app.utils.replicas import RoutingSession
+
+STATUSES = ('todo', 'in_progress', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+OPEN_STATUSES = ('todo', 'in_progress')
+
+
+def summary_enabled() -> bool:
+    return has_app_context() and bool(current_app.config.get('PROJECT_STATS_SUMMARY'))
+
+
+def _key(project_id, status, priority) -> tuple:
+    # Primary key columns cannot be NULL
+    return project_id, status or '', priority or ''
+
+
+def _upsert(connection):
+    table = ProjectTaskStats.__table__
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(
+            task_count=table.c.task_count + statement.inserted.task_count
+        )
+    module = {'sqlite': sqlite, 'postgresql': postgresql}.get(dialect)
+    if module is None:
+        raise NotImplementedError(f'project_task_stats upserts are not supported on {dialect}')
+    statement = module.insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.status, table.c.priority],
+        set_={'task_count': table.c.task_count + statement.excluded.task_count}
+    )
+
+
+def apply_deltas(connection, deltas):
+    """Add ``{(project_id, status, priority): delta}`` to the summary rows."""
+    rows = [
+        {'project_id': project_id, 'status': status, 'priority': priority, 'task_count': delta}
+        for (project_id, status, priority), delta in deltas.items() if delta
+    ]
+    if rows:
+        connection.execute(_upsert(connection), rows)
+
+
+def record_bulk_changes(changes):
+    """Update the summary for tasks written with bulk statements.
+
+    ``changes`` holds ``(task, values)`` pairs in execution order, where
+    ``task`` still has its pre-statement values and ``values`` is the dict
+    of new column values, or None when the task is deleted. Call this
+    before executing the statements.
+    """
+    if not summary_enabled():
+        return
+    current = {}
+    deltas = Counter()
+    for task, values in changes:
+        old = current.get(task.id) or _key(task.project_id, task.status, task.priority)
+        deltas[old] -= 1
+        if values is None:
+            continue
+        new = _key(values.get('project_id', old[0]), values.get('status', old[1]),
+                   values.get('priority', old[2]))
+        deltas[new] += 1
+        current[task.id] = new
+    apply_deltas(db.session.connection(), deltas)
+
+
+def _committed_key(task) -> tuple:
+    state = inspect(task)
+    values = []
+    for name in ('project_id', 'status', 'priority'):
+        history = state.attrs[name].history
+        values.append(history.deleted[0] if history.deleted else state.attrs[name].value)
+    return _key(*values)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _before_flush(session, flush_context, instances):
+    # Old values are read here, while expired attributes can still load
+    if not summary_enabled():
+        return
+    deltas = Counter()
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deltas[_committed_key(obj)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj):
+            deltas[_committed_key(obj)] -= 1
+            deltas[_key(obj.project_id, obj.status, obj.priority)] += 1
+    if deleted_projects:
+        session.connection().execute(
+            delete(ProjectTaskStats.__table__).where(ProjectTaskStats.project_id.in_(deleted_projects))
+        )
+    session.info['project_stats'] = (deltas, deleted_projects)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    # New tasks have their ids and column defaults only after the INSERT
+    pending = session.info.pop('project_stats', None)
+    if pending is None:
+        return
+    deltas, deleted_projects = pending
+    for obj in session.new:
+        if isinstance(obj, Task):
+            deltas[_key(obj.project_id, obj.status, obj.priority)] += 1
+    apply_deltas(session.connection(), {
+        key: delta for key, delta in deltas.items() if key[0] not in deleted_projects
+    })
+
+
+def rebuild_summary(project_ids=None):
+    """Recount ``project_task_stats`` from tasks, for all or some projects."""
+    table = ProjectTaskStats.__table__
+    status = func.coalesce(Task.status, '')
+    priority = func.coalesce(Task.priority, '')
+    counts = (
+        select(Task.project_id, status, priority, func.count(Task.id))
+        .group_by(Task.project_id, status, priority)
+    )
+    clear = delete(table)
+    if project_ids is not None:
+        counts = counts.where(Task.project_id.in_(project_ids))
+        clear = clear.where(table.c.project_id.in_(project_ids))
+    db.session.execute(clear)
+    db.session.execute(
+        insert(table).from_select(['project_id', 'status', 'priority', 'task_count'], counts)
+    )
+
+
+def _empty_stats(project_id: int, name: str) -> dict:
+    return {
+        'project_id': project_id,
+        'name': name,
+        'total': 0,
+        'by_status': dict.fromkeys(STATUSES, 0),
+        'by_priority': dict.fromkeys(PRIORITIES, 0),
+        'overdue': 0
+    }
+
+
+def _add_counts(stats: dict, status, priority, count: int):
+    stats['total'] += count
+    if status:
+        stats['by_status'][status] = stats['by_status'].get(status, 0) + count
+    if priority:
+        stats['by_priority'][priority] = stats['by_priority'].get(priority, 0) + count
+
+
+def project_stats(owner_id: int, now: datetime = None) -> list:
+    """Task counts of each of the owner's projects, in project id order."""
+    now = now or datetime.utcnow()
+    if summary_enabled():
+        return _summary_stats(owner_id, now)
+
+    overdue = case((and_(Task.due_date < now, Task.status.in_(OPEN_STATUSES)), 1), else_=0)
+    rows = db.session.execute(
+        select(Project.id, Project.name, Task.status, Task.priority,
+               func.count(Task.id), func.coalesce(func.sum(overdue), 0))
+        .outerjoin(Task, Task.project_id == Project.id)
+        .where(Project.owner_id == owner_id)
+        .group_by(Project.id, Project.name, Task.status, Task.priority)
+        .order_by(Project.id)
+    )
+    projects = {}
+    for project_id, name, status, priority, count, overdue_count in rows:
+        stats = projects.setdefault(project_id, _empty_stats(project_id, name))
+        _add_counts(stats, status, priority, count)
+        stats['overdue'] += overdue_count
+    return list(projects.values())
+
+
+def _summary_stats(owner_id: int, now: datetime) -> list:
+    summary = ProjectTaskStats.__table__
+    rows = db.session.execute(
+        select(Project.id, Project.name, summary.c.status, summary.c.priority, summary.c.task_count)
+        .outerjoin(summary, summary.c.project_id == Project.id)
+        .where(Project.owner_id == owner_id)
+        .order_by(Project.id)
+    )
+    projects = {}
+    for project_id, name, status, priority, count in rows:
+        stats = projects.setdefault(project_id, _empty_stats(project_id, name))
+        if count:
+            _add_counts(stats, status, priority, count)
+
+    overdue = db.session.execute(
+        select(Task.project_id, func.count(Task.id))
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.owner_id == owner_id, Task.status.in_(OPEN_STATUSES), Task.due_date < now)
+        .group_by(Task.project_id)
+    )
+    for project_id, count in overdue:
+        projects[project_id]['overdue'] = count
+    return list(projects.values())
+
+
+@click.command('project-stats-rebuild')
+@with_appcontext
+def project_stats_rebuild_command():
+    """Recount the project_task_stats summary table from tasks."""
+    rebuild_summary()
+    db.session.commit()
+    click.echo(f'Rebuilt {db.session.query(ProjectTaskStats).count()} summary rows')
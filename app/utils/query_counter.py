@@ -0,0 +1,77 @@
+"""Record the SQL statements an engine runs inside a block.
+
+Used by the test suite to hold endpoints to query budgets::
+
+    with QueryCounter(db.engine) as queries:
+        client.get('/api/projects')
+    queries.assert_budget(2)
+
+``assert_budget`` also fails when the same SELECT ran several times with
+different parameters, the usual signature of an N+1 (one query per row of a
+previous result) rather than a genuinely new query. Repeated writes are not
+flagged: the ORM inserts rows one statement at a time when it needs their
+generated ids.
+"""
+from collections import Counter, namedtuple
+
+from sqlalchemy import event
+
+Query = namedtuple('Query', ['statement', 'parameters', 'executemany'])
+
+
+class QueryCounter:
+    """Context manager collecting every statement executed on ``engine``."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.queries = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append(Query(statement, parameters, executemany))
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __iter__(self):
+        return iter(self.queries)
+
+    @property
+    def statements(self):
+        return [query.statement for query in self.queries]
+
+    def repeated(self):
+        """SELECTs run more than once with differing parameters, with counts."""
+        runs = Counter()
+        parameters = {}
+        for query in self.queries:
+            if not query.statement.lstrip().upper().startswith('SELECT'):
+                continue
+            runs[query.statement] += 1
+            parameters.setdefault(query.statement, set()).add(repr(query.parameters))
+        return {
+            statement: count for statement, count in runs.items()
+            if count > 1 and len(parameters[statement]) > 1
+        }
+
+    def report(self) -> str:
+        lines = [f'{len(self.queries)} queries:']
+        lines += [f'  {i}. {" ".join(query.statement.split())}' for i, query in enumerate(self.queries, 1)]
+        return '\n'.join(lines)
+
+    def assert_budget(self, max_queries: int, allow_repeats: bool = False):
+        """Fail when more than ``max_queries`` ran, or on a likely N+1."""
+        assert len(self.queries) <= max_queries, (
+            f'Query budget of {max_queries} exceeded\n{self.report()}'
+        )
+        if not allow_repeats:
+            repeated = self.repeated()
+            assert not repeated, 'Likely N+1, statements repeated with different parameters:\n' + '\n'.join(
+                f'  {count}x {" ".join(statement.split())}' for statement, count in repeated.items()
+            )
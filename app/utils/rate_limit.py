@@ -0,0 +1,136 @@
+"""Token-bucket rate limiting per blueprint, by client IP and by account.
+
+``RATE_LIMITS`` maps a blueprint name to its limits, e.g.
+``{'auth': {'ip': (20, 60), 'account': (5, 60)}}``: each key gets a bucket
+of 20 (or 5) tokens that refills completely over 60 seconds, so short
+bursts pass and sustained traffic is held to the refill rate. The account
+is the ``email`` field of a JSON body; requests without one are limited
+by IP only.
+
+Checks run in a ``before_request`` hook, ahead of schema loading and
+password hashing, and a rejection is a 429 with ``Retry-After``. The
+client IP is ``request.remote_addr``; behind a reverse proxy, wrap the app
+in Werkzeug's ``ProxyFix`` so that is the real client.
+
+Buckets live in this process (``RATE_LIMIT_STORAGE=memory``) or in Redis
+(``redis``, at ``RATE_LIMIT_STORAGE_URL``), where an atomic script lets
+every worker share them.
+"""
+import math
+import time
+
+from flask import current_app, jsonify, request
+from prometheus_client import Counter
+
+from app.utils.lru import LRUCache
+
+RATE_LIMITED = Counter(
+    'rate_limited_requests', 'Requests rejected by rate limiting',
+    ['blueprint', 'limit']
+)
+
+# KEYS[1] bucket; ARGV capacity, refill per second, now. Returns seconds to
+# wait, 0 when a token was taken.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class MemoryBuckets:
+    """Token buckets in a bounded, thread-safe LRU.
+
+    An evicted bucket comes back full, so ``max_keys`` should comfortably
+    exceed the number of clients seen within one refill period.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets = LRUCache(max_keys)
+
+    def take(self, key: str, capacity: int, rate: float, now: float = None) -> float:
+        """Take a token; return 0, or the seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self._buckets.lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets.put(key, (tokens, now))
+            return wait
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class RedisBuckets:
+    """Token buckets in Redis, updated atomically by a server-side script."""
+
+    def __init__(self, client):
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float, now: float = None) -> float:
+        now = time.time() if now is None else now
+        return float(self._take(keys=[key], args=[capacity, rate, now]))
+
+
+def _account():
+    # get_json caches the parsed body, so the view does not parse it again
+    body = request.get_json(silent=True)
+    email = body.get('email') if isinstance(body, dict) else None
+    if isinstance(email, str) and email:
+        return email.strip().lower()[:254]
+    return None
+
+
+def init_rate_limits(app):
+    """Create the app's buckets and check ``RATE_LIMITS`` before each request."""
+    storage = app.config.get('RATE_LIMIT_STORAGE', 'memory')
+    if storage == 'memory':
+        buckets = MemoryBuckets()
+    elif storage == 'redis':
+        import redis
+        buckets = RedisBuckets(redis.Redis.from_url(app.config['RATE_LIMIT_STORAGE_URL']))
+    else:
+        raise ValueError(f'Unknown RATE_LIMIT_STORAGE: {storage}')
+    app.extensions['rate_limit'] = buckets
+
+    @app.before_request
+    def check_rate_limits():
+        limits = current_app.config.get('RATE_LIMITS', {}).get(request.blueprint)
+        if not limits or request.method == 'OPTIONS':
+            return None
+
+        for name in ('ip', 'account'):
+            if name not in limits:
+                continue
+            subject = request.remote_addr if name == 'ip' else _account()
+            if subject is None:
+                continue
+            capacity, period = limits[name]
+            wait = buckets.take(f'rl:{request.blueprint}:{name}:{subject}', capacity, capacity / period)
+            if wait:
+                RATE_LIMITED.labels(request.blueprint, name).inc()
+                return (
+                    jsonify({'error': 'Too many requests'}), 429,
+                    {'Retry-After': str(max(1, math.ceil(wait)))}
+                )
+        return None
+
+    return buckets
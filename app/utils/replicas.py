@@ -0,0 +1,190 @@
+"""Route read-only requests to database replicas.
+
+With ``SQLALCHEMY_REPLICA_URIS`` set, :class:`RoutingSession` sends SELECTs
+made while serving GET, HEAD and OPTIONS requests to a replica. Each request
+is pinned to one replica, picked in round-robin order, so its reads see a
+single snapshot. Everything else uses the primary:
+
+- writes, and any statement other than a SELECT;
+- every statement after the request's first flush or DML statement;
+- a user's reads for ``REPLICA_STICKY_SECONDS`` after one of their requests
+  wrote, so they read their own writes despite replication lag. This window
+  is tracked per process, or in the response cache's Redis when it has one,
+  so every worker honours it.
+
+A replica whose connections fail is ejected for ``REPLICA_EJECT_SECONDS``;
+while every replica is ejected, reads fall back to the primary. A statement
+that fails on the request's replica is retried once on the primary, which
+serves the rest of that request.
+"""
+import itertools
+import math
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+from app.utils.db_pool import register_engine
+
+READ_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class ReplicaSet:
+    """Replica engines with round-robin selection and time-based ejection."""
+
+    def __init__(self, uris, engine_options=None, sticky_seconds: float = 5, eject_seconds: float = 30,
+                 store=None):
+        self.engines = [create_engine(uri, **(engine_options or {})) for uri in uris]
+        self.sticky_seconds = sticky_seconds
+        self.eject_seconds = eject_seconds
+        # Redis-like store sharing sticky windows between processes
+        self.store = store
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._ejected_until = {}
+        self._sticky_until = {}
+        for engine in self.engines:
+            event.listen(engine, 'handle_error', self._on_error)
+            register_engine(engine)
+
+    def _on_error(self, context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+            self.eject(context.engine)
+
+    def eject(self, engine):
+        with self._lock:
+            self._ejected_until[engine] = time.monotonic() + self.eject_seconds
+        engine.dispose()
+
+    def is_healthy(self, engine) -> bool:
+        return self._ejected_until.get(engine, 0) <= time.monotonic()
+
+    def pick(self):
+        """The next healthy replica, or None when all are ejected."""
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[next(self._cycle)]
+                if self.is_healthy(engine):
+                    return engine
+        return None
+
+    def mark_write(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._sticky_until) > 10000:
+                self._sticky_until = {
+                    key: until for key, until in self._sticky_until.items() if until > now
+                }
+            self._sticky_until[user_id] = now + self.sticky_seconds
+        if self.store is not None and self.sticky_seconds > 0:
+            self.store.set(f'replica:sticky:{user_id}', 1, ex=math.ceil(self.sticky_seconds))
+
+    def is_sticky(self, user_id) -> bool:
+        if self._sticky_until.get(user_id, 0) > time.monotonic():
+            return True
+        return self.store is not None and self.store.get(f'replica:sticky:{user_id}') is not None
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+
+def init_replicas(app):
+    """Create the app's ReplicaSet when replica URIs are configured."""
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS')
+    if not uris:
+        return None
+    replicas = ReplicaSet(
+        uris,
+        app.config.get('SQLALCHEMY_ENGINE_OPTIONS'),
+        app.config['REPLICA_STICKY_SECONDS'],
+        app.config['REPLICA_EJECT_SECONDS']
+    )
+    app.extensions['db_replicas'] = replicas
+
+    @app.before_request
+    def reset_writes():
+        g.db_wrote = False
+        g.pop('db_replica', None)
+
+    @app.after_request
+    def remember_writes(response):
+        if g.get('db_wrote') and getattr(request, 'user_id', None) is not None:
+            replicas.mark_write(request.user_id)
+        return response
+
+    return replicas
+
+
+def _note_write():
+    if has_request_context():
+        g.db_wrote = True
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends eligible reads to a replica."""
+
+    def _replica(self, clause):
+        if not has_request_context() or request.method not in READ_METHODS:
+            return None
+        replicas = current_app.extensions.get('db_replicas')
+        if replicas is None or self._flushing or g.get('db_wrote'):
+            return None
+        if clause is None or not getattr(clause, 'is_select', False):
+            return None
+        if getattr(clause, '_for_update_arg', None) is not None:
+            return None
+        if 'db_replica' not in g:
+            # Pin the request to one replica (None: the primary)
+            user_id = getattr(request, 'user_id', None)
+            sticky = user_id is not None and replicas.is_sticky(user_id)
+            g.db_replica = None if sticky else replicas.pick()
+        if g.db_replica is not None and not replicas.is_healthy(g.db_replica):
+            g.db_replica = None
+        return g.db_replica
+
+    def _replica_failed(self) -> bool:
+        """Whether the request's replica was ejected by the statement that just failed."""
+        if not has_request_context() or g.get('db_replica') is None:
+            return False
+        if current_app.extensions['db_replicas'].is_healthy(g.db_replica):
+            return False
+        # Reads only reach a replica before the request writes, so rolling
+        # back only drops the broken replica connection
+        g.db_replica = None
+        self.rollback()
+        return True
+
+    def _retry_on_primary(self, run, *args, **kwargs):
+        try:
+            return run(*args, **kwargs)
+        except DBAPIError:
+            if not self._replica_failed():
+                raise
+            return run(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._retry_on_primary(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._retry_on_primary(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._retry_on_primary(super().scalars, *args, **kwargs)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if clause is not None and getattr(clause, 'is_dml', False):
+                _note_write()
+            replica = self._replica(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flushed(session, flush_context):
+    _note_write()
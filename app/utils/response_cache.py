@@ -0,0 +1,269 @@
+"""Cache of serialized JSON responses for read endpoints.
+
+Views decorated with :func:`cached_response` store their body and ETag per
+user and URL. Keys also embed the current version of each resource the
+response depends on (``user:<id>``, ``project:<id>``, ``task:<id>``), so
+writes invalidate entries by bumping versions instead of finding and
+deleting keys; stale entries are never read again and age out by TTL.
+
+Versions are bumped after a commit touching a project or task:
+
+- session flush hooks record every ORM change, including ones made by the
+  calendar sync worker;
+- bulk UPDATE and DELETE statements skip those hooks, so callers report
+  them with :func:`mark_changed`;
+- the owner's ``user`` version (the project list) is bumped from the
+  changed project, or from the requesting user, who owns everything they
+  can write. Task changes made outside a request only bump the task and
+  project versions, which covers the fields such writers change.
+
+The store is ``RESPONSE_CACHE``: ``memory`` (a per-process LRU with TTL),
+``redis`` (a store shared by every worker, at ``RESPONSE_CACHE_URL``) or
+``none``. :class:`MemoryStore` speaks the subset of the Redis client API the
+cache uses, so it also stands in for Redis locally and in tests. Its
+versions live in one process, so with several workers the others keep
+serving their entries until the TTL expires; share Redis between them.
+With Redis, read replicas keep their read-your-writes windows there too, so
+no worker fills an entry from a lagging replica right after the user wrote.
+An entry filled from a replica lagging longer than that can still be served
+for up to ``RESPONSE_CACHE_TTL`` seconds.
+"""
+import time
+from functools import wraps
+
+from flask import current_app, has_app_context, has_request_context, make_response, request
+from prometheus_client import Counter
+from sqlalchemy import event, inspect
+
+from app.models import db, Project, Task
+from app.utils.etag import not_modified, set_etag
+from app.utils.lru import LRUCache
+from app.utils.replicas import RoutingSession
+
+CACHE_REQUESTS = Counter(
+    'response_cache_requests', 'Response cache lookups by result (hit or miss)',
+    ['endpoint', 'result']
+)
+
+
+class MemoryStore:
+    """Bounded, thread-safe LRU with per-key expiry and Redis-style methods."""
+
+    def __init__(self, max_size: int = 10000):
+        self._entries = LRUCache(max_size)
+
+    def _live(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._entries.pop(key)
+            return None
+        return value
+
+    def _store(self, key, value, ex):
+        self._entries.put(key, (value, time.monotonic() + ex if ex else None))
+
+    def get(self, key):
+        with self._entries.lock:
+            return self._live(key)
+
+    def mget(self, keys):
+        with self._entries.lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._entries.lock:
+            if nx and self._live(key) is not None:
+                return False
+            self._store(key, value, ex)
+            return True
+
+    def incr(self, key):
+        with self._entries.lock:
+            value = int(self._live(key) or 0) + 1
+            self._store(key, value, None)
+            return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ResponseCache:
+    """Versioned response entries on top of a Redis-like ``store``."""
+
+    def __init__(self, store, ttl: int = 60, prefix: str = 'rc'):
+        self.store = store
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def versions(self, names) -> list:
+        """Current version of each resource name.
+
+        A version that is missing (never bumped, or evicted) starts at the
+        current time in nanoseconds, above any version an older entry could
+        carry, so losing a version only causes misses.
+        """
+        keys = [f'{self.prefix}:v:{name}' for name in names]
+        versions = self.store.mget(keys) if keys else []
+        for index, version in enumerate(versions):
+            if version is None:
+                self.store.set(keys[index], time.time_ns(), nx=True)
+                version = self.store.get(keys[index])
+            versions[index] = int(version)
+        return versions
+
+    def bump(self, names):
+        keys = [f'{self.prefix}:v:{name}' for name in names]
+        if hasattr(self.store, 'pipeline'):
+            pipe = self.store.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+            results = pipe.execute()
+        else:
+            results = [self.store.incr(key) for key in keys]
+        for key, version in zip(keys, results):
+            if version == 1:
+                # A missing counter restarts at 1; move it past older entries
+                self.store.set(key, time.time_ns())
+
+    def key(self, user_id: int, path: str, names) -> str:
+        versions = '.'.join(str(version) for version in self.versions(names))
+        return f'{self.prefix}:r:{user_id}:{path}:{versions}'
+
+    def get(self, key: str):
+        """Return ``(etag, body)``, or None on a miss."""
+        value = self.store.get(key)
+        if value is None:
+            return None
+        etag, _, body = bytes(value).partition(b'\n')
+        return etag.decode(), body
+
+    def set(self, key: str, etag: str, body: bytes):
+        self.store.set(key, etag.encode() + b'\n' + body, ex=self.ttl)
+
+
+def init_response_cache(app):
+    """Create the app's ResponseCache from ``RESPONSE_CACHE``, if enabled."""
+    backend = app.config.get('RESPONSE_CACHE', 'none')
+    if backend == 'memory':
+        store = MemoryStore(app.config['RESPONSE_CACHE_SIZE'])
+    elif backend == 'redis':
+        import redis
+        store = redis.Redis.from_url(app.config['RESPONSE_CACHE_URL'])
+        replicas = app.extensions.get('db_replicas')
+        if replicas is not None:
+            replicas.store = store
+    elif backend == 'none':
+        return None
+    else:
+        raise ValueError(f'Unknown RESPONSE_CACHE backend: {backend}')
+    cache = ResponseCache(store, app.config['RESPONSE_CACHE_TTL'])
+    app.extensions['response_cache'] = cache
+    return cache
+
+
+def cached_response(*resources):
+    """Cache a JSON GET view per user, URL and resource versions.
+
+    ``resources`` are format strings filled from the view arguments, e.g.
+    ``'project:{project_id}'``; ``'user'`` stands for the requesting user.
+    Apply below ``token_required``. Only 200 responses carrying an ETag are
+    stored, and hits answer conditional requests with 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None:
+                return view(*args, **kwargs)
+
+            names = [
+                f'user:{request.user_id}' if resource == 'user' else resource.format(**kwargs)
+                for resource in resources
+            ]
+            key = cache.key(request.user_id, request.full_path, names)
+            endpoint = request.url_rule.rule
+            entry = cache.get(key)
+            if entry is not None:
+                CACHE_REQUESTS.labels(endpoint, 'hit').inc()
+                etag, body = entry
+                response = not_modified(etag)
+                if response:
+                    return response
+                return set_etag(current_app.response_class(body, mimetype='application/json'), etag)
+
+            CACHE_REQUESTS.labels(endpoint, 'miss').inc()
+            response = make_response(view(*args, **kwargs))
+            etag, _ = response.get_etag()
+            if response.status_code == 200 and etag and not response.is_streamed:
+                cache.set(key, etag, response.get_data())
+            return response
+        return wrapper
+    return decorator
+
+
+def _changes(session):
+    return session.info.setdefault('response_cache_changes', set())
+
+
+def mark_changed(task_ids=(), project_ids=(), user_id=None):
+    """Queue version bumps for the current transaction's next commit."""
+    changes = _changes(db.session())
+    changes.update(f'task:{task_id}' for task_id in task_ids)
+    changes.update(f'project:{project_id}' for project_id in project_ids)
+    if user_id is not None:
+        changes.add(f'user:{user_id}')
+
+
+def _cache_enabled() -> bool:
+    return has_app_context() and 'response_cache' in current_app.extensions
+
+
+def _values(obj, name):
+    # Committed and current value of an attribute, loading it if expired
+    attr = inspect(obj).attrs[name]
+    return {*attr.history.deleted, attr.value}
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _record_changes(session, flush_context, instances):
+    if not _cache_enabled():
+        return
+    changes = _changes(session)
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Task):
+            changes.add(f'task:{obj.id}')
+            changes.update(f'project:{project_id}' for project_id in _values(obj, 'project_id'))
+        elif isinstance(obj, Project):
+            changes.add(f'project:{obj.id}')
+            changes.update(f'user:{owner_id}' for owner_id in _values(obj, 'owner_id'))
+    if changes and has_request_context() and getattr(request, 'user_id', None) is not None:
+        changes.add(f'user:{request.user_id}')
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_new(session, flush_context):
+    if not _cache_enabled():
+        return
+    changes = _changes(session)
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.update((f'task:{obj.id}', f'project:{obj.project_id}'))
+        elif isinstance(obj, Project):
+            changes.update((f'project:{obj.id}', f'user:{obj.owner_id}'))
+    if changes and has_request_context() and getattr(request, 'user_id', None) is not None:
+        changes.add(f'user:{request.user_id}')
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _bump_versions(session):
+    changes = session.info.pop('response_cache_changes', None)
+    if changes and _cache_enabled():
+        current_app.extensions['response_cache'].bump(sorted(changes))
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('response_cache_changes', None)
@@ -0,0 +1,85 @@
+"""Ranked full-text search over task titles and descriptions.
+
+Queries are split into word terms; a task matches when it contains every
+term, the last one as a prefix so partial words still match while typing.
+Matching and ranking use the database's full-text index:
+
+- SQLite: the ``tasks_fts`` FTS5 table, ranked by BM25 with title matches
+  weighted double;
+- MySQL: the ``ft_tasks_title_description`` FULLTEXT index in boolean mode,
+  ranked by its relevance score. InnoDB skips terms shorter than
+  ``innodb_ft_min_token_size`` (3) and its stopwords;
+- anything else: substring matching without an index, in id order.
+
+Results are ordered by ``(rank, id)`` with lower ranks first and paginated
+with a keyset cursor over that pair. Ranks depend on corpus statistics, so
+writes between page requests can move a task across a page boundary.
+"""
+import re
+
+from sqlalchemy import and_, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.dialects.mysql import match
+
+from app.models import db, Task, Project
+from app.utils.pagination import decode_cursor, encode_cursor
+
+TERM = re.compile(r'\w+')
+MAX_TERMS = 16
+
+
+def search_terms(q: str) -> list:
+    """Word terms of a user's query, ignoring punctuation and operators."""
+    return TERM.findall(q or '')[:MAX_TERMS]
+
+
+def _matching(dialect: str, terms: list):
+    """``(statement, rank)`` selecting matching tasks with their rank."""
+    if dialect == 'sqlite':
+        fts = table('tasks_fts', column('rowid'))
+        fts_table = literal_column('tasks_fts')
+        query = ' '.join(f'"{term}"' for term in terms) + '*'
+        rank = func.bm25(fts_table, 2.0, 1.0)
+        statement = (
+            select(Task, rank.label('rank'))
+            .select_from(fts)
+            .join(Task, Task.id == fts.c.rowid)
+            .where(fts_table.op('MATCH')(query))
+        )
+        return statement, rank
+
+    if dialect == 'mysql':
+        query = ' '.join(f'+{term}' for term in terms) + '*'
+        score = match(Task.title, Task.description, against=query).in_boolean_mode()
+        rank = -score
+        return select(Task, rank.label('rank')).where(score > 0), rank
+
+    rank = literal(0.0)
+    statement = select(Task, rank.label('rank')).where(*[
+        or_(Task.title.icontains(term, autoescape=True), Task.description.icontains(term, autoescape=True))
+        for term in terms
+    ])
+    return statement, rank
+
+
+def search_owned_tasks(user_id: int, terms: list, cursor: str = None, limit: int = 50) -> tuple:
+    """Return ``(tasks, next_cursor)`` for one page of the user's matching tasks."""
+    statement, rank = _matching(db.engine.dialect.name, terms)
+    statement = (
+        statement
+        .join(Project, Task.project_id == Project.id)
+        .where(Project.owner_id == user_id)
+    )
+    if cursor:
+        rank_after, id_after = decode_cursor(cursor, float)
+        statement = statement.where(or_(
+            rank > rank_after,
+            and_(rank == rank_after, Task.id > id_after)
+        ))
+    rows = db.session.execute(statement.order_by(rank, Task.id).limit(limit + 1)).all()
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.rank, last.Task.id)
+    return [row.Task for row in page], next_cursor
@@ -0,0 +1,11 @@
+"""ASGI entry point, e.g. ``uvicorn asgi:app --port 5001``."""
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+from app.utils.asgi import create_asgi_app
+
+# Every route runs in a pool thread sized to the database pool
+flask_app = create_app(os.environ.get('FLASK_ENV', 'development'))
+app = create_asgi_app(flask_app)
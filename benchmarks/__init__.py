@@ -0,0 +1,4 @@
+"""Offline benchmarks for the API.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.project_listing``.
+"""
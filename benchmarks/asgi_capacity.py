@@ -0,0 +1,191 @@
+"""Concurrent-connection capacity: WSGI servers vs uvicorn through the ASGI bridge.
+
+Each client holds one connection and loops over ``GET --path``, pausing
+``--think`` seconds between requests like a browser tab, so most open
+connections are idle at any moment. For every server and connection count
+the run reports throughput, latency percentiles, failed requests and the
+server's peak thread count and memory. A server has capacity for a
+connection count when latency stays flat and nothing fails.
+
+werkzeug starts a thread per connection (and closes the connection after
+each response); gunicorn and uvicorn run ``--threads`` request threads per
+worker and keep idle connections in their event loop.
+
+Usage: python -m benchmarks.asgi_capacity [--servers werkzeug,uvicorn] [--connections 50,200,800]
+"""
+import argparse
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from sqlalchemy import create_engine
+
+from benchmarks.load.__main__ import percentile, start_server
+from benchmarks.load.seed import PASSWORD, seed, user_email
+
+
+def process_usage(pid: int) -> tuple:
+    """``(threads, rss_mb)`` of a process and its children, from /proc.
+
+    Children count so gunicorn's worker is included; (0, 0.0) off Linux.
+    """
+    pids = [pid]
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            pids += [int(child) for child in children.read().split()]
+    except OSError:
+        pass
+    threads, rss_mb = 0, 0.0
+    for each in pids:
+        try:
+            with open(f'/proc/{each}/status') as status:
+                fields = dict(line.split(':', 1) for line in status if ':' in line)
+        except OSError:
+            continue
+        threads += int(fields['Threads'])
+        rss_mb += int(fields['VmRSS'].split()[0]) / 1024
+    return threads, rss_mb
+
+
+def login(base: str) -> dict:
+    parts = urlsplit(base)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    connection.request('POST', '/api/auth/login', json.dumps({'email': user_email(1), 'password': PASSWORD}),
+                       {'Content-Type': 'application/json'})
+    tokens = json.loads(connection.getresponse().read())['tokens']
+    connection.close()
+    return {'Authorization': f"Bearer {tokens['access_token']}"}
+
+
+def run_connections(base: str, headers: dict, path: str, connections: int, duration: float,
+                    think: float, pid: int) -> dict:
+    parts = urlsplit(base)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def get(connection) -> int:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    def client(offset: float):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+        local, failed = [], 0
+        # Stagger the first requests over one think period
+        time.sleep(offset)
+        while time.perf_counter() < deadline:
+            sent = time.perf_counter()
+            try:
+                try:
+                    status = get(connection)
+                except (ConnectionError, http.client.HTTPException):
+                    # The server closed the idle keep-alive connection; like a
+                    # browser, reconnect and send again
+                    connection.close()
+                    status = get(connection)
+            except (ConnectionError, http.client.HTTPException, OSError):
+                connection.close()
+                status = None
+            if status == 200:
+                local.append(time.perf_counter() - sent)
+            else:
+                failed += 1
+            time.sleep(think)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    peak = {'threads': 0, 'rss_mb': 0.0}
+    sampling = threading.Event()
+
+    def sample():
+        while not sampling.wait(0.1):
+            threads, rss_mb = process_usage(pid)
+            peak['threads'] = max(peak['threads'], threads)
+            peak['rss_mb'] = max(peak['rss_mb'], rss_mb)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    clients = [
+        threading.Thread(target=client, args=(think * i / connections,)) for i in range(connections)
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    sampling.set()
+    sampler.join()
+
+    latencies.sort()
+    return {
+        'connections': connections,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'server_threads': peak['threads'],
+        'server_rss_mb': round(peak['rss_mb'], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', default='werkzeug,uvicorn',
+                        help='Comma-separated: werkzeug, gunicorn, uvicorn')
+    parser.add_argument('--connections', default='50,200,800', help='Comma-separated connection counts')
+    parser.add_argument('--threads', type=int, default=32, help='Request threads for gunicorn and uvicorn')
+    parser.add_argument('--path', default='/api/projects?limit=20')
+    parser.add_argument('--think', type=float, default=1.0, help='Seconds between a client\'s requests')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per connection count')
+    parser.add_argument('--report', help='Write the JSON results to this path')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    url = f"sqlite:///{os.path.join(tmp.name, 'capacity.db')}"
+    engine = create_engine(url)
+    seed(engine, users=10, projects=200, tasks=5000)
+    engine.dispose()
+
+    results = {}
+    try:
+        for server in args.servers.split(','):
+            # One worker process, so the peak thread count is the server's
+            process, base = start_server(server, url, 0, 1, args.threads)
+            try:
+                headers = login(base)
+                results[server] = [
+                    run_connections(base, headers, args.path, int(count), args.duration, args.think, process.pid)
+                    for count in args.connections.split(',')
+                ]
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        tmp.cleanup()
+
+    print(f"{'server':>9} {'conns':>6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} "
+          f"{'threads':>8} {'rss MB':>7}")
+    for server, rows in results.items():
+        for row in rows:
+            print(f"{server:>9} {row['connections']:>6} {row['rps']:>8.1f} {row['p50_ms']:>8.2f} "
+                  f"{row['p99_ms']:>8.2f} {row['errors']:>7} {row['server_threads']:>8} "
+                  f"{row['server_rss_mb']:>7.1f}")
+    if args.report:
+        with open(args.report, 'w') as report:
+            json.dump(results, report, indent=2)
+            report.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Calendar sync throughput: one HTTP request per event vs batch requests.
+
+Runs against the local fake server, so no Google account is needed.
+
+Usage: python -m benchmarks.calendar_batch [--events 500] [--latency 0.02]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.models import Task, User
+from app.utils.google_calendar import CalendarOperation, GoogleCalendarClient, service_cache
+from benchmarks.fake_calendar_server import FakeCalendarServer
+
+CREDENTIALS = ('{"token": "t", "refresh_token": "r", "client_id": "c", '
+               '"client_secret": "s", "expiry": "2999-01-01T00:00:00Z"}')
+
+
+def run(events: int, latency: float):
+    server = FakeCalendarServer(latency=latency).start()
+    app = create_app('testing')
+    app.config['GOOGLE_API_ROOT'] = server.root
+    due = datetime(2026, 1, 1, 9)
+
+    try:
+        with app.app_context():
+            service_cache.clear()
+            user = User(id=1, google_credentials=CREDENTIALS)
+            client = GoogleCalendarClient()
+            print(f"{'mode':>8} {'events':>8} {'http reqs':>10} {'events/s':>10}")
+
+            for mode in ('single', 'batch'):
+                tasks = [Task(id=n, title=f'Task {n}', due_date=due + timedelta(hours=n)) for n in range(events)]
+                server.http_requests = 0
+                start = time.perf_counter()
+                if mode == 'single':
+                    # A batch of one per event costs one HTTP request each
+                    for task in tasks:
+                        errors = client.execute_batch(user, [CalendarOperation('create', task, None)])
+                        assert not any(errors), errors
+                else:
+                    errors = client.execute_batch(
+                        user, [CalendarOperation('create', task, None) for task in tasks]
+                    )
+                    assert not any(errors), errors
+                elapsed = time.perf_counter() - start
+                assert all(task.google_event_id for task in tasks)
+                print(f'{mode:>8} {events:>8} {server.http_requests:>10} {events / elapsed:>10.1f}')
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='Simulated round-trip time per HTTP request, in seconds.')
+    args = parser.parse_args()
+    run(args.events, args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Offset vs keyset pagination latency at increasing page depth.
+
+Usage: python -m benchmarks.deep_pagination [--tasks N] [--limit 50]
+"""
+import argparse
+import time
+
+from app import create_app
+from app.models import db, User, Project, Task
+from app.utils.pagination import encode_cursor, keyset_paginate
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(total: int, limit: int):
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user = User(email='bench@example.com', username='bench', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        project = Project(name='Bench', owner_id=user.id)
+        db.session.add(project)
+        db.session.commit()
+        project_id = project.id
+
+        db.session.execute(Task.__table__.insert(), [
+            {'title': f'Task {n}', 'project_id': project_id} for n in range(total)
+        ])
+        db.session.commit()
+
+        base = Task.query.filter_by(project_id=project_id)
+        print(f"{'offset':>10} {'offset ms':>10} {'keyset ms':>10}")
+        depth = limit
+        while depth < total:
+            anchor = base.order_by(Task.created_at, Task.id).offset(depth - 1).first()
+            cursor = encode_cursor(anchor.created_at, anchor.id)
+
+            offset_ms = timed(lambda: base.order_by(Task.created_at, Task.id)
+                              .offset(depth).limit(limit).all())
+            keyset_ms = timed(lambda: keyset_paginate(base, Task, cursor, limit))
+            print(f'{depth:>10} {offset_ms:>10.2f} {keyset_ms:>10.2f}')
+            depth *= 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=200000)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+    run(args.tasks, args.limit)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Minimal local stand-in for the Google Calendar v3 events API.
+
+Serves events insert/update/delete and the ``batch/calendar/v3`` multipart
+endpoint, with an optional per-HTTP-request delay to mimic network latency.
+Point the app at it with ``GOOGLE_API_ROOT = server.root``.
+
+Usage: python -m benchmarks.fake_calendar_server [--port 8765] [--latency 0.05]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EVENT_PATH = re.compile(r'^/calendar/v3/calendars/[^/]+/events(?:/(?P<event_id>[^/?]+))?')
+
+
+class FakeCalendarServer:
+    """Threaded HTTP server holding events in memory."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.events = {}
+        self.http_requests = 0
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def root(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}/'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle_call(self, method: str, path: str, body: bytes):
+        """Apply one API call and return ``(status, payload)``."""
+        with self._lock:
+            self.api_calls += 1
+            match = EVENT_PATH.match(path)
+            if not match:
+                return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+            event_id = match.group('event_id')
+
+            if method == 'POST' and not event_id:
+                event = json.loads(body or b'{}')
+                event['id'] = uuid.uuid4().hex
+                self.events[event['id']] = event
+                return 200, event
+            if event_id not in self.events:
+                return 404, {'error': {'code': 404, 'message': 'Not Found'}}
+            if method == 'PUT':
+                event = json.loads(body or b'{}')
+                event['id'] = event_id
+                self.events[event_id] = event
+                return 200, event
+            if method == 'DELETE':
+                del self.events[event_id]
+                return 204, None
+            return 405, {'error': {'code': 405, 'message': 'Method Not Allowed'}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status, body: bytes, content_type='application/json'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self):
+                with server._lock:
+                    server.http_requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+                if self.path.startswith('/batch/'):
+                    return self._handle_batch(body)
+
+                status, payload = server.handle_call(self.command, self.path, body)
+                self._respond(status, json.dumps(payload).encode() if payload is not None else b'')
+
+            def _handle_batch(self, body):
+                content_type = self.headers['Content-Type']
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+                )
+                boundary = uuid.uuid4().hex
+                parts = []
+                for part in message.iter_parts():
+                    raw = part.get_payload(decode=True)
+                    head, _, call_body = raw.partition(b'\r\n\r\n')
+                    if not _:
+                        head, _, call_body = raw.partition(b'\n\n')
+                    method, path, _ = head.split(b'\r\n' if b'\r\n' in head else b'\n')[0].decode().split(' ', 2)
+                    status, payload = server.handle_call(method, path, call_body)
+                    response_body = json.dumps(payload) if payload is not None else ''
+                    content_id = part['Content-ID'].strip('<>')
+                    parts.append(
+                        f'--{boundary}\r\n'
+                        'Content-Type: application/http\r\n'
+                        f'Content-ID: <response-{content_id}>\r\n\r\n'
+                        f'HTTP/1.1 {status} OK\r\n'
+                        'Content-Type: application/json\r\n'
+                        f'Content-Length: {len(response_body)}\r\n\r\n'
+                        f'{response_body}\r\n'
+                    )
+                parts.append(f'--{boundary}--\r\n')
+                self._respond(200, ''.join(parts).encode(), f'multipart/mixed; boundary={boundary}')
+
+            do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeCalendarServer(args.port, args.latency)
+    print(f'Fake Calendar API on {server.root}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
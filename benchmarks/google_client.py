@@ -0,0 +1,47 @@
+"""Cold vs warm cost of obtaining a Google Calendar client.
+
+Runs offline: building the client uses the static discovery document and
+no request is sent.
+
+Usage: python -m benchmarks.google_client [--iterations N]
+"""
+import argparse
+import time
+
+from app import create_app
+from app.models import User
+from app.utils.google_calendar import get_google_service, service_cache
+
+CREDENTIALS = ('{"token": "t", "refresh_token": "r", "client_id": "c", '
+               '"client_secret": "s", "expiry": "2999-01-01T00:00:00Z"}')
+
+
+def run(iterations: int):
+    app = create_app('testing')
+    with app.app_context():
+        user = User(id=1, google_credentials=CREDENTIALS)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            service_cache.clear()
+            get_google_service(user)
+        cold = (time.perf_counter() - start) / iterations * 1000
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            get_google_service(user)
+        warm = (time.perf_counter() - start) / iterations * 1000
+
+    print(f'cold client: {cold:.3f} ms/call')
+    print(f'warm client: {warm:.3f} ms/call')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""HTTP load benchmark: seeded dataset, real server, concurrent clients.
+
+``seed`` bulk-loads users, projects and tasks; ``server`` runs ``create_app``
+in its own process under werkzeug's threaded server, gunicorn or uvicorn
+(through the ASGI bridge); ``clients`` drives a weighted mix of auth,
+project and task requests. The run writes a JSON report of requests/sec and
+latency percentiles per route, which ``python -m benchmarks.load.compare``
+diffs between commits.
+
+Usage:
+    python -m benchmarks.load --users 1000 --projects 20000 --tasks 1000000 --report before.json
+    python -m benchmarks.load --url sqlite:////tmp/load.db --skip-seed --report after.json
+    python -m benchmarks.load.compare before.json after.json
+"""
@@ -0,0 +1,210 @@
+"""Seed a dataset, start the app under a WSGI server and load it.
+
+The server runs in a separate process so the load generator does not share
+its interpreter. The database at --url is dropped and reseeded unless
+--skip-seed is given, which makes repeated runs against the same dataset
+(e.g. one per commit) cheap.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from benchmarks.load import __doc__ as package_doc
+from benchmarks.load.clients import ApiClient
+from benchmarks.load.seed import dataset_size, seed
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, url: str, port: int, workers: int, threads: int):
+    port = port or free_port()
+    env = dict(os.environ, DATABASE_URL=url, FLASK_ENV='production')
+    if kind == 'gunicorn':
+        if not shutil.which('gunicorn'):
+            sys.exit('gunicorn is not installed; use --server werkzeug')
+        command = ['gunicorn', '-w', str(workers), '--threads', str(threads), '-b', f'127.0.0.1:{port}',
+                   '--log-level', 'warning', 'benchmarks.load.server:create_bench_app()']
+    elif kind == 'uvicorn':
+        if not shutil.which('uvicorn'):
+            sys.exit('uvicorn is not installed; use --server werkzeug')
+        # Give each request thread a connection so startup's pool check passes
+        env['ASGI_THREADS'] = str(threads)
+        env.setdefault('DB_POOL_SIZE', str(threads))
+        command = ['uvicorn', '--factory', 'benchmarks.load.server:create_bench_asgi_app',
+                   '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+                   '--log-level', 'warning', '--no-access-log']
+    else:
+        command = [sys.executable, '-m', 'benchmarks.load.server', '--port', str(port)]
+    process = subprocess.Popen(command, cwd=ROOT, env=env)
+
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(200):
+        try:
+            urllib.request.urlopen(f'{base}/api/health', timeout=1).read()
+            return process, base
+        except OSError:
+            if process.poll() is not None:
+                sys.exit(f'Server exited with status {process.returncode}')
+            time.sleep(0.1)
+    process.terminate()
+    sys.exit('Server did not come up')
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_load(base: str, clients: int, users: int, duration: float, warmup: float, seed_value: int):
+    rng = random.Random(seed_value)
+    api_clients = [
+        ApiClient(base, rng.randint(1, users), random.Random(seed_value + i)) for i in range(clients)
+    ]
+    setup_threads = [threading.Thread(target=c.setup) for c in api_clients]
+    for thread in setup_threads:
+        thread.start()
+    for thread in setup_threads:
+        thread.join()
+
+    if warmup:
+        warm_deadline = time.perf_counter() + warmup
+        threads = [threading.Thread(target=c.run, args=(warm_deadline,)) for c in api_clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for c in api_clients:
+            c.latencies.clear()
+            c.errors.clear()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=c.run, args=(start + duration,)) for c in api_clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return api_clients, time.perf_counter() - start
+
+
+def summarize(api_clients, elapsed: float) -> dict:
+    latencies = {}
+    errors = {}
+    for c in api_clients:
+        for route, values in c.latencies.items():
+            latencies.setdefault(route, []).extend(values)
+        for route, count in c.errors.items():
+            errors[route] = errors.get(route, 0) + count
+
+    def stats(values, error_count):
+        values = sorted(values)
+        return {
+            'requests': len(values),
+            'errors': error_count,
+            'rps': round(len(values) / elapsed, 2),
+            'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            **{f'p{q}_ms': round(percentile(values, q) * 1000, 3) for q in (50, 90, 95, 99)},
+            'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+        }
+
+    routes = {
+        route: stats(values, errors.get(route, 0)) for route, values in sorted(latencies.items())
+    }
+    total = stats([v for values in latencies.values() for v in values], sum(errors.values()))
+    return {'routes': routes, 'total': total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=package_doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Database URL (default: a temporary SQLite file)')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=20000)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--skip-seed', action='store_true', help='Reuse the dataset already at --url')
+    parser.add_argument('--server', choices=['werkzeug', 'gunicorn', 'uvicorn'], default='werkzeug')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn or uvicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn or uvicorn worker')
+    parser.add_argument('--port', type=int, default=0, help='Server port (default: a free one)')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds before the run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--report', help='Write the JSON report to this path (default: stdout)')
+    args = parser.parse_args()
+
+    tmp = None
+    url = args.url
+    if not url:
+        tmp = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmp.name, 'load.db')}"
+    engine = create_engine(url)
+    if not args.skip_seed:
+        print(f'Seeding {args.users} users, {args.projects} projects, {args.tasks} tasks...', file=sys.stderr)
+        seed(engine, args.users, args.projects, args.tasks, seed=args.seed)
+    dataset = dataset_size(engine)
+    engine.dispose()
+
+    process, base = start_server(args.server, url, args.port, args.workers, args.threads)
+    try:
+        print(f'Loading {base} with {args.clients} clients for {args.duration}s...', file=sys.stderr)
+        api_clients, elapsed = run_load(base, args.clients, dataset['users'], args.duration,
+                                        args.warmup, args.seed)
+    finally:
+        process.terminate()
+        process.wait()
+        if tmp:
+            tmp.cleanup()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'dialect': engine.dialect.name,
+        'dataset': dataset,
+        'settings': {key: getattr(args, key) for key in
+                     ('server', 'workers', 'threads', 'clients', 'duration', 'warmup', 'seed')},
+        'elapsed_s': round(elapsed, 3),
+        **summarize(api_clients, elapsed),
+    }
+
+    body = json.dumps(report, indent=2)
+    if args.report:
+        Path(args.report).write_text(body + '\n')
+    else:
+        print(body)
+
+    print(f"\n{'route':<34} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}", file=sys.stderr)
+    for route, stats in list(report['routes'].items()) + [('total', report['total'])]:
+        print(f"{route:<34} {stats['rps']:>9.1f} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+              f"{stats['errors']:>7}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
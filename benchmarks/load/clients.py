@@ -0,0 +1,149 @@
+"""Concurrent API clients issuing a weighted mix of requests.
+
+Each client logs in as its own seeded user over a keep-alive connection,
+then picks routes by weight until the deadline. Latencies are recorded per
+route template, e.g. ``GET /api/tasks/<id>``.
+"""
+import http.client
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from benchmarks.load.seed import PASSWORD, user_email
+
+# (route, weight); reads dominate like the frontend's traffic
+ROUTE_WEIGHTS = [
+    ('GET /api/projects', 15),
+    ('GET /api/projects?page', 5),
+    ('GET /api/projects/<id>', 10),
+    ('POST /api/projects', 2),
+    ('PUT /api/projects/<id>', 3),
+    ('GET /api/tasks/project/<id>', 20),
+    ('GET /api/tasks/<id>', 20),
+    ('POST /api/tasks/project/<id>', 8),
+    ('PUT /api/tasks/<id>', 8),
+    ('DELETE /api/tasks/<id>', 2),
+    ('POST /api/auth/refresh', 3),
+    ('POST /api/auth/login', 1),
+    ('GET /api/health', 3),
+]
+
+
+class ApiClient:
+    """One simulated user with a persistent HTTP connection."""
+
+    def __init__(self, base_url: str, user_index: int, rng: random.Random):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port
+        self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        self.user_index = user_index
+        self.rng = rng
+        self.headers = {}
+        self.refresh_token = None
+        self.project_ids = []
+        self.task_ids = []
+        self.created_task_ids = []
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def request(self, route: str, method: str, path: str, body=None):
+        headers = dict(self.headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (ConnectionError, http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self.errors[route] += 1
+            return None, None
+        self.latencies[route].append(time.perf_counter() - start)
+
+        if response.status >= 400:
+            self.errors[route] += 1
+        return response.status, json.loads(data) if data else None
+
+    def login(self):
+        status, data = self.request('POST /api/auth/login', 'POST', '/api/auth/login', {
+            'email': user_email(self.user_index), 'password': PASSWORD
+        })
+        if status == 200:
+            self.headers = {'Authorization': f"Bearer {data['tokens']['access_token']}"}
+            self.refresh_token = data['tokens']['refresh_token']
+
+    def setup(self):
+        self.login()
+        _, data = self.request('GET /api/projects', 'GET', '/api/projects?limit=50')
+        self.project_ids = [project['id'] for project in (data or {}).get('projects', [])]
+        if not self.project_ids:
+            self.create_project()
+
+    def create_project(self):
+        status, data = self.request('POST /api/projects', 'POST', '/api/projects', {
+            'name': f'Load project {self.rng.random():.6f}'
+        })
+        if status == 201:
+            self.project_ids.append(data['project']['id'])
+
+    def step(self, route: str):
+        rng = self.rng
+        project_id = rng.choice(self.project_ids)
+
+        if route == 'GET /api/projects':
+            self.request(route, 'GET', '/api/projects?limit=20')
+        elif route == 'GET /api/projects?page':
+            pages = max(1, math.ceil(len(self.project_ids) / 10))
+            self.request(route, 'GET', f'/api/projects?page={rng.randint(1, pages)}&per_page=10')
+        elif route == 'GET /api/projects/<id>':
+            self.request(route, 'GET', f'/api/projects/{project_id}')
+        elif route == 'POST /api/projects':
+            self.create_project()
+        elif route == 'PUT /api/projects/<id>':
+            self.request(route, 'PUT', f'/api/projects/{project_id}', {'description': f'Touched {time.time()}'})
+        elif route == 'GET /api/tasks/project/<id>':
+            _, data = self.request(route, 'GET', f'/api/tasks/project/{project_id}?limit=50')
+            ids = [task['id'] for task in (data or {}).get('tasks', [])]
+            if ids:
+                self.task_ids = ids
+        elif not self.task_ids and route.startswith(('GET /api/tasks/<id>', 'PUT /api/tasks')):
+            self.step('GET /api/tasks/project/<id>')
+        elif route == 'GET /api/tasks/<id>':
+            self.request(route, 'GET', f'/api/tasks/{rng.choice(self.task_ids)}')
+        elif route == 'POST /api/tasks/project/<id>':
+            status, data = self.request(route, 'POST', f'/api/tasks/project/{project_id}', {
+                'title': 'Load task', 'priority': rng.choice(['low', 'medium', 'high'])
+            })
+            if status == 201:
+                self.created_task_ids.append(data['task']['id'])
+        elif route == 'PUT /api/tasks/<id>':
+            self.request(route, 'PUT', f'/api/tasks/{rng.choice(self.task_ids)}', {
+                'status': rng.choice(['todo', 'in_progress', 'completed'])
+            })
+        elif route == 'DELETE /api/tasks/<id>':
+            # Only delete tasks this run created so the dataset stays stable
+            if self.created_task_ids:
+                task_id = self.created_task_ids.pop()
+                self.request(route, 'DELETE', f'/api/tasks/{task_id}')
+                if task_id in self.task_ids:
+                    self.task_ids.remove(task_id)
+        elif route == 'POST /api/auth/refresh':
+            self.request(route, 'POST', '/api/auth/refresh', {'refresh_token': self.refresh_token})
+        elif route == 'POST /api/auth/login':
+            self.login()
+        elif route == 'GET /api/health':
+            self.request(route, 'GET', '/api/health')
+
+    def run(self, deadline: float):
+        routes, weights = zip(*ROUTE_WEIGHTS)
+        while time.perf_counter() < deadline:
+            self.step(self.rng.choices(routes, weights)[0])
+        self.connection.close()
@@ -0,0 +1,39 @@
+"""Compare two load benchmark reports route by route.
+
+Usage: python -m benchmarks.load.compare before.json after.json
+"""
+import argparse
+import json
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return '     n/a'
+    return f'{(after - before) / before * 100:>+7.1f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before {before['commit'][:10]}  after {after['commit'][:10]}")
+    print(f"{'route':<34} {'req/s':>9} {'change':>8} {'p99 ms':>9} {'change':>8}")
+    rows = [(route, before['routes'].get(route), after['routes'][route]) for route in after['routes']]
+    rows.append(('total', before['total'], after['total']))
+    for route, old, new in rows:
+        if old is None:
+            print(f"{route:<34} {new['rps']:>9.1f} {'new':>8} {new['p99_ms']:>9.2f}")
+            continue
+        print(f"{route:<34} {new['rps']:>9.1f} {change(old['rps'], new['rps'])} "
+              f"{new['p99_ms']:>9.2f} {change(old['p99_ms'], new['p99_ms'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Bulk-load a benchmark dataset.
+
+Every user gets the same password (``PASSWORD``), hashed once with the
+production method, so seeding millions of rows stays I/O bound while logins
+still pay the real verification cost.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from werkzeug.security import generate_password_hash
+
+from app.models import db, User, Project, Task
+from config.config import ProductionConfig
+
+PASSWORD = 'benchpass123'
+START = datetime(2024, 1, 1)
+
+
+def user_email(index: int) -> str:
+    return f'load{index}@example.com'
+
+
+def _insert_chunks(engine, table, rows, chunk: int, label: str, total: int):
+    batch = []
+    done = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk:
+            with engine.begin() as conn:
+                conn.execute(table.insert(), batch)
+            done += len(batch)
+            batch = []
+            print(f'  {label}: {done}/{total}', end='\r', flush=True)
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+        done += len(batch)
+    print(f'  {label}: {done}/{total}')
+
+
+def seed(engine, users: int, projects: int, tasks: int, chunk: int = 50000, seed: int = 42):
+    """Drop and recreate the schema, then insert the dataset."""
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    rng = random.Random(seed)
+    password_hash = generate_password_hash(PASSWORD, ProductionConfig.PASSWORD_HASH_METHOD)
+
+    _insert_chunks(engine, User.__table__, (
+        {'email': user_email(i), 'username': f'load{i}', 'password_hash': password_hash,
+         'is_active': True, 'created_at': START, 'updated_at': START}
+        for i in range(1, users + 1)
+    ), chunk, 'users', users)
+
+    # Projects round-robin over users, tasks spread randomly over projects
+    _insert_chunks(engine, Project.__table__, (
+        {'name': f'Project {i}', 'description': f'Benchmark project {i}', 'owner_id': i % users + 1,
+         'status': 'active', 'created_at': START + timedelta(minutes=i), 'updated_at': START}
+        for i in range(1, projects + 1)
+    ), chunk, 'projects', projects)
+
+    statuses = ['todo', 'in_progress', 'completed']
+    priorities = ['low', 'medium', 'high']
+
+    def task_rows():
+        for n in range(tasks):
+            created = START + timedelta(seconds=n)
+            yield {
+                'title': f'Task {n}', 'description': 'Seeded for the load benchmark',
+                'project_id': rng.randint(1, projects), 'status': rng.choice(statuses),
+                'priority': rng.choice(priorities),
+                'due_date': created + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.3 else None,
+                'created_at': created, 'updated_at': created,
+            }
+
+    _insert_chunks(engine, Task.__table__, task_rows(), chunk, 'tasks', tasks)
+
+
+def dataset_size(engine) -> dict:
+    """Row counts of an already seeded database."""
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+            for name, model in (('users', User), ('projects', Project), ('tasks', Task))
+        }
@@ -0,0 +1,44 @@
+"""Run the app for the load benchmark in its own process.
+
+The database comes from ``DATABASE_URL`` and the production config is used,
+so pool settings, password hashing and JSON output match a deployment.
+
+    python -m benchmarks.load.server --port 5055
+    gunicorn -w 4 --threads 8 'benchmarks.load.server:create_bench_app()'
+    DB_POOL_SIZE=8 uvicorn --factory benchmarks.load.server:create_bench_asgi_app --workers 4
+"""
+import argparse
+import logging
+import os
+
+from werkzeug.serving import make_server
+
+
+def create_bench_app():
+    from app import create_app
+    os.environ.setdefault('FLASK_ENV', 'production')
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = create_app('production')
+    # Every simulated client connects from 127.0.0.1 and logs in repeatedly
+    app.config['RATE_LIMITS'] = {}
+    return app
+
+
+def create_bench_asgi_app():
+    from app.utils.asgi import create_asgi_app
+    return create_asgi_app(create_bench_app())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, create_bench_app(), threaded=True)
+    print(f'Serving on http://{args.host}:{server.server_port}', flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
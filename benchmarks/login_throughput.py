@@ -0,0 +1,103 @@
+"""Login throughput and health-check latency under a concurrent login burst.
+
+Starts the app on a threaded WSGI server for each password-hash executor
+mode, fires concurrent logins, and meanwhile times ``GET /api/health`` to
+show how much the hashing starves ordinary traffic.
+
+Usage: python -m benchmarks.login_throughput [--clients 16] [--logins 200]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.models import db, User
+from app.utils.auth import PasswordManager, password_hasher
+
+
+def post_json(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.status
+
+
+def run_mode(mode: str, clients: int, logins: int, method: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app('testing')
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            PASSWORD_HASH_EXECUTOR=mode,
+            PASSWORD_HASH_METHOD=method,
+            PASSWORD_HASH_QUEUE_SIZE=clients * 2,
+        )
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(
+                email='bench@example.com',
+                username='bench',
+                password_hash=PasswordManager.hash_password('password123')
+            ))
+            db.session.commit()
+
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+        done = threading.Event()
+        health_latencies = []
+
+        def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                urllib.request.urlopen(f'{base}/api/health').read()
+                health_latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.01)
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            statuses = list(pool.map(
+                lambda _: post_json(f'{base}/api/auth/login',
+                                    {'email': 'bench@example.com', 'password': 'password123'}),
+                range(logins)
+            ))
+        elapsed = time.perf_counter() - start
+        done.set()
+        prober.join()
+        server.shutdown()
+        password_hasher.shutdown()
+
+        assert all(status == 200 for status in statuses)
+        health_latencies.sort()
+        p99 = health_latencies[int(len(health_latencies) * 0.99) - 1]
+        print(f'{mode:>8} {logins / elapsed:>10.1f} '
+              f'{statistics.median(health_latencies):>12.2f} {p99:>12.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--method', default='pbkdf2:sha256:600000')
+    parser.add_argument('--modes', default='inline,thread,process')
+    args = parser.parse_args()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    print(f"{'executor':>8} {'logins/s':>10} {'health p50':>12} {'health p99':>12}")
+    for mode in args.modes.split(','):
+        run_mode(mode, args.clients, args.logins, args.method)
+
+
+if __name__ == '__main__':
+    main()
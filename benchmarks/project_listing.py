@@ -0,0 +1,76 @@
+"""Query count and latency of ``GET /api/projects`` as projects grow.
+
+Usage: python -m benchmarks.project_listing [--projects N] [--sizes 0,10,1000]
+"""
+import argparse
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db, User, Project, Task
+from app.utils.auth import TokenManager
+
+
+def seed(owner_id: int, projects: int, tasks_per_project: int):
+    """Replace the owner's projects with ``projects`` x ``tasks_per_project`` rows."""
+    db.session.query(Task).delete()
+    db.session.query(Project).delete()
+    db.session.commit()
+
+    db.session.execute(
+        Project.__table__.insert(),
+        [{'name': f'Project {i}', 'owner_id': owner_id} for i in range(projects)]
+    )
+    project_ids = [row.id for row in db.session.query(Project.id)]
+    if tasks_per_project:
+        rows = [
+            {'title': f'Task {n}', 'project_id': pid, 'status': 'todo', 'priority': 'medium'}
+            for pid in project_ids
+            for n in range(tasks_per_project)
+        ]
+        db.session.execute(Task.__table__.insert(), rows)
+    db.session.commit()
+
+
+def run(projects: int, sizes):
+    app = create_app('testing')
+    client = app.test_client()
+    statements = []
+
+    with app.app_context():
+        db.create_all()
+        user = User(email='bench@example.com', username='bench', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        headers = {
+            'Authorization': f"Bearer {TokenManager.create_tokens(user.id, user.username)['access_token']}"
+        }
+
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        print(f"{'tasks/project':>14} {'queries':>8} {'ms':>10}")
+        for size in sizes:
+            seed(user_id, projects, size)
+            db.session.remove()
+            statements.clear()
+            start = time.perf_counter()
+            response = client.get(f'/api/projects?per_page={projects}', headers=headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, response.get_data(as_text=True)
+            print(f'{size:>14} {len(statements):>8} {elapsed:>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=10)
+    parser.add_argument('--sizes', default='0,10,100,1000,10000')
+    args = parser.parse_args()
+    run(args.projects, [int(s) for s in args.sizes.split(',')])
+
+
+if __name__ == '__main__':
+    main()
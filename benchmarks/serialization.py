@@ -0,0 +1,62 @@
+"""Serializing a 10k-task listing: marshmallow + stdlib json vs the fast path.
+
+Usage: python -m benchmarks.serialization [--tasks 10000] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app
+from app.models import Task
+from app.schemas import TaskResponseSchema
+from app.schemas.fast import dump
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run(count: int, repeat: int):
+    app = create_app('testing')
+    app.debug = False
+    now = datetime(2026, 1, 1)
+    tasks = [
+        Task(id=n, title=f'Task {n}', description='Write the quarterly report', project_id=1,
+             status='todo', priority='medium', due_date=now + timedelta(days=n % 30),
+             created_at=now, updated_at=now)
+        for n in range(count)
+    ]
+    default_json = DefaultJSONProvider(app)
+
+    with app.app_context():
+        dump_ms, baseline = best_of(lambda: TaskResponseSchema(many=True).dump(tasks), repeat)
+        fast_dump_ms, fast = best_of(lambda: dump(TaskResponseSchema, tasks, many=True), repeat)
+        assert fast == baseline
+
+        json_ms, body = best_of(lambda: default_json.response({'tasks': baseline}).get_data(), repeat)
+        fast_json_ms, fast_body = best_of(lambda: app.json.response({'tasks': fast}).get_data(), repeat)
+        assert fast_body == body
+
+    print(f"{'stage':<12} {'default ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for stage, slow, quick in (('dump', dump_ms, fast_dump_ms), ('json', json_ms, fast_json_ms),
+                               ('total', dump_ms + json_ms, fast_dump_ms + fast_json_ms)):
+        print(f'{stage:<12} {slow:>11.2f} {quick:>9.2f} {slow / quick:>7.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.tasks, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Worker cold-start cost: import time, create_app time and time to first request.
+
+Each sample runs in a fresh interpreter, as a newly scaled-up worker would:
+the child times ``import app``, ``create_app('production')`` and the first
+``GET /api/health`` through the test client, and reports the slowest
+imports from ``-X importtime``. A second measurement starts the real WSGI
+server (``benchmarks.load.server``) and waits for its first response.
+
+Usage: python -m benchmarks.startup [--samples 5] [--report startup.json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = '''
+import json, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app('production')
+created = time.perf_counter()
+response = app.test_client().get('/api/health')
+assert response.status_code == 200
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (done - created) * 1000,
+    'total_ms': (done - start) * 1000,
+}))
+'''
+
+
+def child_env(tmp: str) -> dict:
+    return dict(
+        os.environ,
+        FLASK_ENV='production',
+        DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+    )
+
+
+def sample_in_process(env: dict) -> dict:
+    result = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, top: int) -> list:
+    """Packages by cumulative import time while loading the app, in ms.
+
+    A package's cost is its most expensive import, normally its first.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT,
+                            env=env, capture_output=True, text=True, check=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        if package != 'app':
+            packages[package] = max(packages.get(package, 0), int(cumulative) / 1000)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return [{'module': name, 'ms': round(ms, 1)} for name, ms in ranked[:top]]
+
+
+def sample_server(env: dict) -> float:
+    """Milliseconds from spawning the server process to its first response."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-m', 'benchmarks.load.server', '--port', str(port)],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1).read()
+                return (time.perf_counter() - start) * 1000
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError('server exited during startup')
+                time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    parser.add_argument('--report', help='Write the results as JSON to this path')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = child_env(tmp)
+        # Production skips create_all, so give the workers a schema
+        subprocess.run([sys.executable, '-c', 'from app import create_app; from app.models import db\n'
+                        'app = create_app("production")\nwith app.app_context(): db.create_all()'],
+                       cwd=ROOT, env=env, check=True)
+
+        samples = [sample_in_process(env) for _ in range(args.samples)]
+        server_ms = [sample_server(env) for _ in range(args.samples)]
+        imports = slowest_imports(env, args.top)
+
+    report = {
+        key: round(statistics.median(sample[key] for sample in samples), 1)
+        for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')
+    }
+    report['server_first_response_ms'] = round(statistics.median(server_ms), 1)
+    report['slowest_imports'] = imports
+
+    print(f"{'stage':<26} {'median ms':>10}")
+    for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms', 'server_first_response_ms'):
+        print(f'{key:<26} {report[key]:>10.1f}')
+    print('\nslowest imports:')
+    for entry in imports:
+        print(f"  {entry['module']:<40} {entry['ms']:>8.1f} ms")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Per-request auth overhead of token_required with and without the token cache.
+
+Usage: python -m benchmarks.token_cache [--iterations 20000]
+"""
+import argparse
+import time
+
+from app import create_app
+from app.utils.auth import TokenManager, token_cache, token_required
+
+
+@token_required
+def endpoint():
+    return None
+
+
+def run(iterations: int):
+    app = create_app('testing')
+    with app.app_context():
+        token = TokenManager.create_tokens(1, 'bench')['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    print(f"{'mode':>10} {'us/request':>12}")
+    for mode, size in (('uncached', 0), ('cached', 10000)):
+        app.config['TOKEN_CACHE_SIZE'] = size
+        token_cache.clear()
+        with app.test_request_context(headers=headers):
+            endpoint()  # warm up
+            start = time.perf_counter()
+            for _ in range(iterations):
+                endpoint()
+            elapsed = time.perf_counter() - start
+        print(f'{mode:>10} {elapsed / iterations * 1e6:>12.2f}')
+    print(f'cache stats: {token_cache.stats()}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,44 @@ import os
 from datetime import timedelta
 
 
+def _pool_size(default: int = 5) -> int:
+    """Connections each worker process keeps open.
+
+    DB_POOL_SIZE wins; otherwise DB_MAX_CONNECTIONS (the database's budget
+    for this app) is split evenly across WEB_CONCURRENCY worker processes,
+    leaving room for each worker's overflow.
+    """
+    if os.environ.get('DB_POOL_SIZE'):
+        return int(os.environ['DB_POOL_SIZE'])
+    if os.environ.get('DB_MAX_CONNECTIONS'):
+        workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+        overflow = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+        return max(1, int(os.environ['DB_MAX_CONNECTIONS']) // workers - overflow)
+    return default
+
+
 class Config:
     """Base configuration."""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool: check connections before use and replace them before
+    # MySQL's wait_timeout (8h by default) closes them server-side
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
+
+    # Schema is managed by migrations (flask db upgrade); creating tables on
+    # boot is only for local development and tests
+    CREATE_TABLES_ON_STARTUP = False
+
+    # Read replicas for GET requests, comma separated; empty uses the primary
+    SQLALCHEMY_REPLICA_URIS = [
+        uri for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri
+    ]
+    REPLICA_STICKY_SECONDS = 5  # a user's reads stay on the primary this long after a write
+    REPLICA_EJECT_SECONDS = 30  # skip a failing replica for this long
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
@@ -14,12 +48,76 @@ class Config:
     
     # Security
     JWT_ALGORITHM = 'HS256'
+    TOKEN_CACHE_SIZE = 10000  # verified access tokens kept per process; 0 disables
     BCRYPT_LOG_ROUNDS = 12
+
+    # Password hashing: stored hashes made with another method are upgraded
+    # on the next successful login
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:600000'
+    PASSWORD_HASH_EXECUTOR = 'process'  # process, thread or inline
+    # Per server worker process: keep workers * this at or below the CPU count
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT = 2  # seconds to wait for a slot before 503
+    
+    # Token-bucket rate limits per blueprint: (burst, seconds to refill it)
+    # for the client IP and for the account (JSON "email") of each request
+    RATE_LIMITS = {
+        'auth': {'ip': (30, 60), 'account': (10, 300)},
+    }
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')  # memory or redis
+    RATE_LIMIT_STORAGE_URL = os.environ.get('RATE_LIMIT_STORAGE_URL')  # e.g. redis://localhost:6379/1
     
     # Google OAuth
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
     GOOGLE_REDIRECT_URI = 'http://localhost:5001/api/auth/google/callback'
+    GOOGLE_CLIENT_CACHE_SIZE = 256  # Calendar clients kept warm per process
+    GOOGLE_API_TIMEOUT = 10  # seconds
+    GOOGLE_BATCH_SIZE = 50  # Calendar API maximum per batch request
+    GOOGLE_API_ROOT = os.environ.get('GOOGLE_API_ROOT')  # e.g. a local fake server
+
+    # Pagination
+    PAGINATION_DEFAULT_LIMIT = 50
+    PAGINATION_MAX_LIMIT = 200
+
+    # Response compression: gzip, or brotli when the Brotli package is installed
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1') != '0'
+    COMPRESS_MIN_SIZE = 500  # bytes; smaller buffered bodies are sent as they are
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))  # gzip, 1-9
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL', 4))  # brotli, 0-11
+    COMPRESS_MIMETYPES = frozenset({
+        'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html',
+    })
+
+    # Task batch endpoint
+    TASK_BATCH_MAX_OPERATIONS = 500
+
+    # Dashboard counts from the incrementally updated project_task_stats
+    # table instead of a GROUP BY over tasks; run `flask project-stats-rebuild`
+    # after enabling
+    PROJECT_STATS_SUMMARY = os.environ.get('PROJECT_STATS_SUMMARY', '0') == '1'
+
+    # Cache of read endpoint responses: memory (per process; only safe
+    # with a single worker), redis (shared, RESPONSE_CACHE_URL) or none
+    RESPONSE_CACHE = os.environ.get('RESPONSE_CACHE', 'none')
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL')  # e.g. redis://localhost:6379/0
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))  # seconds
+    RESPONSE_CACHE_SIZE = 10000  # entries kept by the memory backend
+
+    # ASGI mode (asgi.py): requests handled at once per process. Unset, it
+    # follows the database pool (pool_size + max_overflow); it may not exceed it
+    ASGI_THREADS = int(os.environ['ASGI_THREADS']) if os.environ.get('ASGI_THREADS') else None
+
+    # Task export: rows fetched and streamed per chunk
+    TASK_EXPORT_BATCH_SIZE = 1000
+
+    # Google Calendar outbox worker
+    CALENDAR_SYNC_BATCH_SIZE = 100
+    CALENDAR_SYNC_CONCURRENCY = 8  # users whose Calendar batches are sent at once
+    CALENDAR_SYNC_MAX_ATTEMPTS = 8
+    CALENDAR_SYNC_BACKOFF_BASE = 2  # seconds, doubled per attempt
+    CALENDAR_SYNC_BACKOFF_MAX = 600
 
 
 class DevelopmentConfig(Config):
@@ -27,6 +125,7 @@ class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
     SQLALCHEMY_ECHO = True
+    CREATE_TABLES_ON_STARTUP = True
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         'DATABASE_URL',
         'sqlite:///app.db'
@@ -39,7 +138,13 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CREATE_TABLES_ON_STARTUP = True
+    RESPONSE_CACHE = 'memory'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # a single static connection
+    SQLALCHEMY_REPLICA_URIS = []
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_EXECUTOR = 'inline'
 
 
 class ProductionConfig(Config):
@@ -47,6 +152,16 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SQLALCHEMY_ECHO = False
+
+    # Sized per worker process: workers * (pool_size + max_overflow) must
+    # stay below the database's max_connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_size': _pool_size(),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),  # seconds before a checkout fails
+    }
     
     @property
     def SQLALCHEMY_DATABASE_URI(self):
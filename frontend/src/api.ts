@@ -196,10 +196,18 @@ class ApiClient {
     status?: string,
     priority?: string
   ): Promise<{ tasks: Task[] }> {
-    const response = await this.client.get(`/api/tasks/project/${projectId}`, {
-      params: { status, priority },
-    });
-    return response.data;
+    // The listing is paginated (at most 200 per page); follow next_cursor
+    // until every task is loaded
+    const tasks: Task[] = [];
+    let cursor: string | null = null;
+    do {
+      const response = await this.client.get(`/api/tasks/project/${projectId}`, {
+        params: { status, priority, cursor: cursor ?? undefined, limit: 200 },
+      });
+      tasks.push(...response.data.tasks);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return { tasks };
   }
 
   async getTask(id: number): Promise<{ task: Task }> {
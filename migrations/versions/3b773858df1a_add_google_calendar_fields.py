@@ -1,7 +1,7 @@
 """Add Google Calendar fields
 
 Revision ID: 3b773858df1a
-Revises: 
+Revises: 0a1f5e2c7d48
 Create Date: 2025-12-03 13:43:49.422519
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '3b773858df1a'
-down_revision = None
+down_revision = '0a1f5e2c7d48'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,45 @@
+"""Add calendar sync outbox
+
+Revision ID: 5c1d2e7a9f40
+Revises: 3b773858df1a
+Create Date: 2026-10-17 09:12:31.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1d2e7a9f40'
+down_revision = '3b773858df1a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'calendar_sync_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=20), nullable=False),
+        sa.Column('google_event_id', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('calendar_sync_outbox', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_sync_outbox_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_calendar_sync_outbox_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_sync_outbox', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_calendar_sync_outbox_user_id'))
+        batch_op.drop_index('ix_calendar_sync_outbox_status_id')
+
+    op.drop_table('calendar_sync_outbox')
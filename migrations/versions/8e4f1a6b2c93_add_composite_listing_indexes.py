@@ -0,0 +1,45 @@
+"""Add composite listing indexes
+
+Replaces the single-column indexes on tasks.project_id and
+projects.owner_id with composite indexes matching the listing queries.
+The composites lead with the same column, so foreign keys stay indexed.
+
+Revision ID: 8e4f1a6b2c93
+Revises: 5c1d2e7a9f40
+Create Date: 2026-10-17 11:02:47.581930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4f1a6b2c93'
+down_revision = '5c1d2e7a9f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_project_created', ['project_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index(
+            'ix_tasks_project_status_priority_created',
+            ['project_id', 'status', 'priority', 'created_at', 'id'],
+            unique=False
+        )
+        batch_op.drop_index('ix_tasks_project_id')
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_owner_created', ['owner_id', 'created_at', 'id'], unique=False)
+        batch_op.drop_index('ix_projects_owner_id')
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_owner_id', ['owner_id'], unique=False)
+        batch_op.drop_index('ix_projects_owner_created')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_project_id', ['project_id'], unique=False)
+        batch_op.drop_index('ix_tasks_project_status_priority_created')
+        batch_op.drop_index('ix_tasks_project_created')
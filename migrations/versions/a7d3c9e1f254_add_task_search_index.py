@@ -0,0 +1,64 @@
+"""Add task full-text search index
+
+MySQL gets a FULLTEXT index on tasks (title, description). SQLite gets an
+external-content FTS5 table over the same columns, kept in sync by
+triggers and built from the existing rows.
+
+Revision ID: a7d3c9e1f254
+Revises: 8e4f1a6b2c93
+Create Date: 2026-10-17 11:14:05.218344
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c9e1f254'
+down_revision = '8e4f1a6b2c93'
+branch_labels = None
+depends_on = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TABLE IF EXISTS tasks_fts",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_tasks_title_description', 'tasks', ['title', 'description'],
+                        unique=False, mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(sa.text(statement))
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_tasks_title_description', table_name='tasks')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(sa.text(statement))
@@ -0,0 +1,40 @@
+"""Add project task stats summary and overdue index
+
+Adds the project_task_stats summary table read by the dashboard when
+PROJECT_STATS_SUMMARY is on (fill it with `flask project-stats-rebuild`),
+and an index on tasks (project_id, status, due_date) for overdue counts.
+
+Revision ID: b3e8f0d2a615
+Revises: a7d3c9e1f254
+Create Date: 2026-10-17 11:41:22.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8f0d2a615'
+down_revision = 'a7d3c9e1f254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'project_task_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.String(length=20), nullable=False),
+        sa.Column('task_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'status', 'priority')
+    )
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_project_status_due', ['project_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_project_status_due')
+    op.drop_table('project_task_stats')
@@ -6,9 +6,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
+from datetime import datetime
 from app import create_app
 from app.models import db, User, Project, Task
 from app.utils.auth import PasswordManager
+from app.utils.query_counter import QueryCounter
 
 
 @pytest.fixture
@@ -35,6 +37,12 @@ def runner(app):
     return app.test_cli_runner()
 
 
+@pytest.fixture
+def count_queries(app):
+    """Factory for QueryCounter context managers on the app's engine."""
+    return lambda: QueryCounter(db.engine)
+
+
 @pytest.fixture
 def test_user(app):
     """Create a test user."""
@@ -78,6 +86,24 @@ def test_task(app, test_project):
     return task
 
 
+@pytest.fixture
+def seeded_projects(app, test_user):
+    """Three projects of three scheduled tasks each, for query budget tests.
+
+    Returns the project ids; several rows per table make N+1s visible.
+    """
+    projects = [Project(name=f'Project {i}', owner_id=test_user.id) for i in range(3)]
+    db.session.add_all(projects)
+    db.session.flush()
+    db.session.add_all([
+        Task(title=f'Task {i}', project_id=project.id, due_date=datetime(2026, 1, i + 1),
+             google_event_id=f'event-{project.id}-{i}')
+        for project in projects for i in range(3)
+    ])
+    db.session.commit()
+    return [project.id for project in projects]
+
+
 @pytest.fixture
 def auth_headers(client, test_user):
     """Get authentication headers with valid token."""
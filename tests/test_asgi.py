@@ -0,0 +1,164 @@
+"""ASGI bridge tests."""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app import create_app
+from app.utils.asgi import AsgiBridge, build_environ, create_asgi_app
+from config.config import TestingConfig
+
+
+def http_scope(method, path, headers=(), query_string=b''):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'root_path': '',
+        'query_string': query_string,
+        'http_version': '1.1',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+        'client': ('127.0.0.1', 50000),
+        'server': ('localhost', 80),
+    }
+
+
+async def call(asgi_app, method, path, body=b'', headers=()):
+    """Send one HTTP request through an ASGI app; return (status, body)."""
+    messages = []
+    headers = [*headers, ('Content-Length', str(len(body)))]
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(http_scope(method, path, headers), receive, send)
+    status = messages[0]['status']
+    return status, b''.join(message.get('body', b'') for message in messages[1:])
+
+
+class TestAsgiBridge:
+    """Test serving the Flask app through the ASGI bridge."""
+
+    def test_serves_sync_routes(self, app):
+        """Test existing routes answer through the bridge, request bodies included."""
+        asgi_app = create_asgi_app(app)
+
+        status, body = asyncio.run(call(asgi_app, 'GET', '/api/health'))
+        assert status == 200
+        assert json.loads(body)['status'] == 'healthy'
+
+        status, body = asyncio.run(call(
+            asgi_app, 'POST', '/api/auth/login', b'{"email": "x"}',
+            headers=[('Content-Type', 'application/json')]
+        ))
+        assert status == 400
+        assert 'messages' in json.loads(body)
+
+    def test_requests_run_concurrently(self, app):
+        """Test requests are handled on separate pool threads at the same time."""
+        # Each request waits until the other is in the app too
+        both_running = threading.Barrier(2, timeout=5)
+
+        @app.route('/concurrent')
+        def concurrent():
+            both_running.wait()
+            return {'thread': threading.current_thread().name}
+
+        asgi_app = AsgiBridge(app, threads=2)
+
+        async def both():
+            return await asyncio.gather(
+                call(asgi_app, 'GET', '/concurrent'), call(asgi_app, 'GET', '/concurrent')
+            )
+
+        responses = asyncio.run(both())
+        threads = {json.loads(body)['thread'] for _, body in responses}
+        assert [status for status, _ in responses] == [200, 200]
+        assert len(threads) == 2
+        assert all(name.startswith('asgi') for name in threads)
+
+    def test_async_views_run_off_the_server_loop(self, app):
+        """Test async views get their own event loop, not the server's."""
+        @app.route('/async')
+        async def async_view():
+            await asyncio.sleep(0)
+            return {'loop': id(asyncio.get_running_loop())}
+
+        asgi_app = create_asgi_app(app)
+
+        async def request():
+            status, body = await call(asgi_app, 'GET', '/async')
+            return status, json.loads(body)['loop'], id(asyncio.get_running_loop())
+
+        status, view_loop, server_loop = asyncio.run(request())
+        assert status == 200
+        assert view_loop != server_loop
+
+    def test_lifespan(self, app):
+        """Test startup and shutdown are acknowledged."""
+        asgi_app = create_asgi_app(app)
+        incoming = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+
+        async def receive():
+            return next(incoming)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(asgi_app({'type': 'lifespan'}, receive, send))
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+    def test_streamed_response_is_closed(self, app):
+        """Test a streamed response is sent in chunks and closed afterwards."""
+        closed = []
+
+        @app.route('/stream')
+        def stream():
+            def chunks():
+                try:
+                    yield 'a'
+                    yield 'b'
+                finally:
+                    closed.append(True)
+            return app.response_class(chunks())
+
+        status, body = asyncio.run(call(create_asgi_app(app), 'GET', '/stream'))
+        assert (status, body) == (200, b'ab')
+        assert closed == [True]
+
+    def test_environ(self):
+        """Test the WSGI environ built from an ASGI scope."""
+        scope = http_scope('GET', '/api/tasks', headers=[
+            ('Content-Type', 'application/json'), ('Accept', 'a'), ('Accept', 'b'),
+        ], query_string=b'q=x')
+        environ = build_environ(scope, None)
+        assert environ['PATH_INFO'] == '/api/tasks'
+        assert environ['QUERY_STRING'] == 'q=x'
+        assert environ['CONTENT_TYPE'] == 'application/json'
+        assert environ['HTTP_ACCEPT'] == 'a,b'
+        assert environ['REMOTE_ADDR'] == '127.0.0.1'
+
+
+class TestAsgiThreads:
+    """Test ASGI_THREADS against the database pool."""
+
+    @pytest.fixture
+    def pooled_app(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'app.db'}")
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {'pool_size': 2, 'max_overflow': 1})
+        return create_app('testing')
+
+    def test_defaults_to_pool_size(self, pooled_app):
+        """Test the thread count follows pool_size + max_overflow."""
+        assert create_asgi_app(pooled_app).executor._max_workers == 3
+
+    def test_more_threads_than_connections_fails(self, pooled_app):
+        """Test startup fails when ASGI_THREADS exceeds the pool."""
+        pooled_app.config['ASGI_THREADS'] = 4
+        with pytest.raises(ValueError, match='exceeds the database pool'):
+            create_asgi_app(pooled_app)
@@ -1,6 +1,8 @@
 """Authentication endpoint tests."""
 import pytest
 import json
+import time
+from app.utils.auth import TokenCache, token_cache
 
 
 class TestAuthEndpoints:
@@ -89,3 +91,142 @@ class TestAuthEndpoints:
         data = response.get_json()
         assert 'tokens' in data
         assert 'access_token' in data['tokens']
+
+
+class TestTokenCache:
+    """Test the verified-token cache."""
+
+    def test_repeated_requests_hit_cache(self, client, auth_headers):
+        """Test a token is verified once and then served from the cache."""
+        token_cache.clear()
+
+        client.get('/api/projects', headers=auth_headers)
+        client.get('/api/projects', headers=auth_headers)
+
+        stats = token_cache.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_entries_expire_at_exp(self):
+        """Test an expired payload is not returned."""
+        cache = TokenCache()
+        key = TokenCache.key('token', 'secret')
+        cache.put(key, {'user_id': 1, 'exp': time.time() - 1}, max_size=10)
+
+        assert cache.get(key) is None
+
+    def test_cache_is_bounded(self):
+        """Test least recently used entries are evicted."""
+        cache = TokenCache()
+        for i in range(3):
+            cache.put(TokenCache.key(str(i), 'secret'), {'exp': time.time() + 60}, max_size=2)
+
+        assert cache.stats()['size'] == 2
+        assert cache.get(TokenCache.key('0', 'secret')) is None
+
+
+class TestPasswordHashing:
+    """Test password hashing configuration."""
+
+    def test_login_upgrades_outdated_hash(self, app, client, test_user):
+        """Test a hash made with old parameters is replaced on login."""
+        from werkzeug.security import generate_password_hash
+        from app.models import db
+
+        test_user.password_hash = generate_password_hash('password123', method='pbkdf2:sha256:500')
+        db.session.commit()
+
+        response = client.post('/api/auth/login', json={
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+
+        assert response.status_code == 200
+        db.session.refresh(test_user)
+        assert test_user.password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+
+    def test_thread_executor(self, app):
+        """Test hashing through a pooled executor."""
+        from app.utils.auth import PasswordManager
+
+        app.config['PASSWORD_HASH_EXECUTOR'] = 'thread'
+        hashed = PasswordManager.hash_password('password123')
+
+        assert PasswordManager.verify_password('password123', hashed)
+        assert not PasswordManager.verify_password('wrongpassword', hashed)
+
+    def test_process_executor(self, app):
+        """Test hashing in worker processes that are not forked from the server."""
+        from app.utils.auth import PasswordManager, password_hasher
+
+        app.config['PASSWORD_HASH_EXECUTOR'] = 'process'
+        try:
+            hashed = PasswordManager.hash_password('password123')
+            assert PasswordManager.verify_password('password123', hashed)
+
+            pool, _ = password_hasher._get_pool(app.config)
+            assert pool._mp_context.get_start_method() in ('forkserver', 'spawn')
+            assert pool._max_workers == app.config['PASSWORD_HASH_WORKERS']
+        finally:
+            password_hasher.shutdown()
+
+
+class TestRateLimiting:
+    """Test token-bucket limits on the auth endpoints."""
+
+    def test_ip_limit_rejects_before_hashing(self, app, client, test_user, monkeypatch):
+        """Test a client over its IP budget gets 429 without any hashing."""
+        from app.utils.auth import PasswordManager
+
+        app.config['RATE_LIMITS'] = {'auth': {'ip': (3, 60)}}
+        hashed = []
+        verify = PasswordManager.verify_password
+        monkeypatch.setattr(PasswordManager, 'verify_password',
+                            staticmethod(lambda *args: hashed.append(1) or verify(*args)))
+
+        for _ in range(3):
+            response = client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'wrong'})
+            assert response.status_code == 401
+
+        response = client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'password123'})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '20'
+        assert len(hashed) == 3
+
+        # Rejected ahead of validation too
+        assert client.post('/api/auth/register', data='not json').status_code == 429
+
+        other = client.post('/api/auth/login', environ_base={'REMOTE_ADDR': '10.0.0.2'},
+                            json={'email': 'test@example.com', 'password': 'password123'})
+        assert other.status_code == 200
+
+    def test_account_limit_spans_ips(self, app, client, test_user):
+        """Test attempts on one account are limited across client IPs."""
+        app.config['RATE_LIMITS'] = {'auth': {'ip': (100, 60), 'account': (2, 60)}}
+
+        def login(ip, email):
+            return client.post('/api/auth/login', environ_base={'REMOTE_ADDR': ip},
+                               json={'email': email, 'password': 'wrong'}).status_code
+
+        assert [login(f'10.0.0.{i}', 'Test@Example.com') for i in range(3)] == [401, 401, 429]
+        assert login('10.0.0.9', 'someone@example.com') == 401
+
+    def test_other_blueprints_are_not_limited(self, app, client, auth_headers):
+        """Test limits only apply to the configured blueprint."""
+        app.config['RATE_LIMITS'] = {'auth': {'ip': (1, 60)}}
+
+        statuses = {client.get('/api/projects', headers=auth_headers).status_code for _ in range(5)}
+        assert statuses == {200}
+
+    def test_bucket_refills(self):
+        """Test a bucket allows bursts, then the refill rate."""
+        from app.utils.rate_limit import MemoryBuckets
+
+        buckets = MemoryBuckets()
+        assert buckets.take('k', 2, 1.0, now=0) == 0
+        assert buckets.take('k', 2, 1.0, now=0) == 0
+        assert buckets.take('k', 2, 1.0, now=0.25) == pytest.approx(0.75)
+        assert buckets.take('k', 2, 1.0, now=1.0) == 0
+        assert buckets.take('k', 2, 1.0, now=100) == 0
+        assert buckets.take('k', 2, 1.0, now=100) == 0
+        assert buckets.take('k', 2, 1.0, now=100) == pytest.approx(1.0)
@@ -0,0 +1,289 @@
+"""Google Calendar outbox tests."""
+import threading
+import pytest
+from datetime import datetime, timedelta
+from app.models import db, Project, Task, User, CalendarSyncOutbox
+from app.utils.calendar_sync import process_outbox
+
+
+class FakeCalendarClient:
+    """Records calendar calls instead of talking to Google."""
+
+    def __init__(self, fail_times=0):
+        self.calls = []
+        self.fail_times = fail_times
+        self.next_id = 0
+
+    def execute_batch(self, user, operations):
+        errors = []
+        for op in operations:
+            if self.fail_times:
+                self.fail_times -= 1
+                errors.append(RuntimeError('Google unavailable'))
+                continue
+            if op.action == 'create':
+                self.next_id += 1
+                op.task.google_event_id = f'event-{self.next_id}'
+                self.calls.append(('create', op.task.id))
+            elif op.action == 'update':
+                op.task.google_event_id = op.event_id
+                self.calls.append(('update', op.task.id))
+            else:
+                self.calls.append(('delete', op.event_id))
+            errors.append(None)
+        return errors
+
+
+@pytest.fixture
+def google_user(test_user):
+    """Mark the test user as connected to Google."""
+    test_user.google_credentials = '{"token": "fake"}'
+    db.session.commit()
+    return test_user
+
+
+class TestCalendarSync:
+    """Test the calendar sync outbox and worker."""
+
+    def test_task_writes_enqueue_sync(self, client, auth_headers, test_project, google_user):
+        """Test task writes record outbox entries instead of calling Google."""
+        response = client.post(f'/api/tasks/project/{test_project.id}',
+            headers=auth_headers,
+            json={'title': 'Due Task', 'due_date': '2026-01-01T09:00:00'}
+        )
+        task_id = response.get_json()['task']['id']
+        client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'title': 'Renamed'})
+
+        entries = CalendarSyncOutbox.query.order_by(CalendarSyncOutbox.id).all()
+        assert [(e.action, e.task_id) for e in entries] == [('create', task_id), ('update', task_id)]
+
+    def test_worker_drains_outbox(self, client, auth_headers, test_project, google_user):
+        """Test the worker applies entries in order and stores event ids."""
+        response = client.post(f'/api/tasks/project/{test_project.id}',
+            headers=auth_headers,
+            json={'title': 'Due Task', 'due_date': '2026-01-01T09:00:00'}
+        )
+        task_id = response.get_json()['task']['id']
+        fake = FakeCalendarClient()
+
+        stats = process_outbox(client=fake)
+
+        assert stats['processed'] == 1
+        assert fake.calls == [('create', task_id)]
+        assert db.session.get(Task, task_id).google_event_id == 'event-1'
+        assert CalendarSyncOutbox.query.count() == 0
+
+        client.delete(f'/api/tasks/{task_id}', headers=auth_headers)
+        process_outbox(client=fake)
+        assert fake.calls[-1] == ('delete', 'event-1')
+
+    def test_project_delete_enqueues_event_deletes(self, client, auth_headers, test_project, google_user):
+        """Test deleting a project removes its tasks' events in one batch."""
+        db.session.add_all([
+            Task(title=f'Task {i}', project_id=test_project.id, google_event_id=f'evt-{i}')
+            for i in range(3)
+        ])
+        db.session.commit()
+        fake = FakeCalendarClient()
+
+        client.delete(f'/api/projects/{test_project.id}', headers=auth_headers)
+        process_outbox(client=fake)
+
+        assert sorted(fake.calls) == [('delete', f'evt-{i}') for i in range(3)]
+
+    def test_worker_retries_with_backoff_in_user_order(self, client, auth_headers, test_project, google_user):
+        """Test a failing entry is retried later and holds back the user's later entries."""
+        response = client.post(f'/api/tasks/project/{test_project.id}',
+            headers=auth_headers,
+            json={'title': 'Due Task', 'due_date': '2026-01-01T09:00:00'}
+        )
+        task_id = response.get_json()['task']['id']
+        client.put(f'/api/tasks/{task_id}', headers=auth_headers, json={'title': 'Renamed'})
+        fake = FakeCalendarClient(fail_times=1)
+        now = datetime.utcnow()
+
+        stats = process_outbox(client=fake, now=now)
+        assert stats == {'processed': 0, 'retried': 2, 'failed': 0}
+        assert fake.calls == []
+
+        # Still backing off: the update must not overtake the create
+        assert process_outbox(client=fake, now=now)['processed'] == 0
+
+        # Both entries coalesce into one create carrying the latest state
+        stats = process_outbox(client=fake, now=now + timedelta(hours=1))
+        assert stats['processed'] == 2
+        assert fake.calls == [('create', task_id)]
+
+    def test_backed_off_user_does_not_starve_others(self, app, test_project, google_user):
+        """Test a user's entries in backoff do not crowd due entries out of the batch."""
+        other = User(email='other@example.com', username='other', password_hash='x',
+                     google_credentials='{"token": "fake"}')
+        db.session.add(other)
+        db.session.flush()
+        project = Project(name='Other Project', owner_id=other.id)
+        db.session.add(project)
+        db.session.flush()
+        task = Task(title='Theirs', project_id=project.id, due_date=datetime(2026, 1, 2))
+        db.session.add(task)
+        db.session.flush()
+        now = datetime.utcnow()
+        db.session.add_all([
+            CalendarSyncOutbox(user_id=google_user.id, task_id=1000 + i, action='create',
+                               attempts=1, next_attempt_at=now + timedelta(minutes=5))
+            for i in range(5)
+        ])
+        db.session.add(CalendarSyncOutbox(user_id=other.id, task_id=task.id, action='create', next_attempt_at=now))
+        db.session.commit()
+        fake = FakeCalendarClient()
+
+        stats = process_outbox(client=fake, batch_size=3, now=now)
+
+        assert stats['processed'] == 1
+        assert fake.calls == [('create', task.id)]
+        assert CalendarSyncOutbox.query.filter_by(user_id=google_user.id).count() == 5
+
+    def test_failed_commit_reschedules_and_keeps_created_event(self, client, auth_headers, test_project,
+                                                               google_user, monkeypatch):
+        """Test a failed commit retries the user's entries without duplicating events."""
+        response = client.post(f'/api/tasks/project/{test_project.id}',
+            headers=auth_headers,
+            json={'title': 'Due Task', 'due_date': '2026-01-01T09:00:00'}
+        )
+        task_id = response.get_json()['task']['id']
+        fake = FakeCalendarClient()
+        now = datetime.utcnow()
+
+        real_commit = db.session.commit
+        failures = iter([RuntimeError('database went away')])
+
+        def flaky_commit():
+            error = next(failures, None)
+            if error:
+                raise error
+            real_commit()
+
+        monkeypatch.setattr(db.session, 'commit', flaky_commit)
+        stats = process_outbox(client=fake, now=now)
+        monkeypatch.undo()
+
+        assert stats == {'processed': 0, 'retried': 1, 'failed': 0}
+        entry = CalendarSyncOutbox.query.one()
+        assert (entry.attempts, entry.google_event_id) == (1, 'event-1')
+        assert db.session.get(Task, task_id).google_event_id is None
+
+        # The retry updates the event Google already created
+        assert process_outbox(client=fake, now=now + timedelta(hours=1))['processed'] == 1
+        assert fake.calls == [('create', task_id), ('update', task_id)]
+        assert db.session.get(Task, task_id).google_event_id == 'event-1'
+
+    def test_worker_command_survives_failed_batch(self, app, runner, monkeypatch):
+        """Test an exception in a batch is logged instead of stopping the worker."""
+        from app.utils import calendar_sync
+
+        def broken(**kwargs):
+            raise RuntimeError('database went away')
+
+        monkeypatch.setattr(calendar_sync, 'process_outbox', broken)
+        result = runner.invoke(calendar_sync.calendar_sync_command, ['--once'])
+
+        assert result.exit_code == 0
+
+    def test_worker_sends_users_batches_concurrently(self, app, test_project, google_user):
+        """Test different users' batches are in flight at the same time."""
+        other = User(email='other@example.com', username='other', password_hash='x',
+                     google_credentials='{"token": "fake"}')
+        db.session.add(other)
+        db.session.flush()
+        project = Project(name='Other Project', owner_id=other.id)
+        db.session.add(project)
+        db.session.flush()
+        tasks = [
+            Task(title='Mine', project_id=test_project.id, due_date=datetime(2026, 1, 1)),
+            Task(title='Theirs', project_id=project.id, due_date=datetime(2026, 1, 2))
+        ]
+        db.session.add_all(tasks)
+        db.session.flush()
+        db.session.add_all([
+            CalendarSyncOutbox(user_id=google_user.id, task_id=tasks[0].id, action='create'),
+            CalendarSyncOutbox(user_id=other.id, task_id=tasks[1].id, action='create')
+        ])
+        db.session.commit()
+
+        # Each batch waits for the other one to start
+        both_sending = threading.Barrier(2, timeout=5)
+
+        class ConcurrentClient(FakeCalendarClient):
+            def execute_batch(self, user, operations):
+                both_sending.wait()
+                return super().execute_batch(user, operations)
+
+        fake = ConcurrentClient()
+        stats = process_outbox(client=fake)
+
+        assert stats == {'processed': 2, 'retried': 0, 'failed': 0}
+        assert sorted(fake.calls) == sorted(('create', task.id) for task in tasks)
+        assert all(db.session.get(Task, task.id).google_event_id for task in tasks)
+
+
+class TestGoogleServiceCache:
+    """Test Calendar client reuse."""
+
+    CREDENTIALS = ('{"token": "t", "refresh_token": "r", "client_id": "c", '
+                   '"client_secret": "s", "expiry": "2999-01-01T00:00:00Z"}')
+
+    def test_warm_client_is_reused(self, app, test_user, monkeypatch):
+        """Test a second lookup returns the cached client without rebuilding."""
+        from app.utils import google_calendar
+
+        google_calendar.service_cache.clear()
+        builds = []
+        real_build = google_calendar.build
+        monkeypatch.setattr(google_calendar, 'build', lambda *a, **kw: builds.append(1) or real_build(*a, **kw))
+        test_user.google_credentials = self.CREDENTIALS
+
+        first = google_calendar.get_google_service(test_user)
+        second = google_calendar.get_google_service(test_user)
+
+        assert first is second
+        assert len(builds) == 1
+
+        # New credentials invalidate the cached client
+        test_user.google_credentials = self.CREDENTIALS.replace('"t"', '"t2"')
+        assert google_calendar.get_google_service(test_user) is not first
+        assert len(builds) == 2
+
+    def test_cache_is_bounded(self, app, test_user):
+        """Test least recently used clients are evicted."""
+        from app.utils.google_calendar import ServiceCache
+
+        cache = ServiceCache()
+        for i in range(5):
+            cache.put(i, object(), max_size=3)
+
+        assert len(cache) == 3
+        assert cache.get(0) is None
+        assert cache.get(4) is not None
+
+    def test_execute_batch_maps_results_to_tasks(self, app):
+        """Test batch results are written back to google_event_id."""
+        from app.utils.google_calendar import CalendarOperation, GoogleCalendarClient, service_cache
+        from benchmarks.fake_calendar_server import FakeCalendarServer
+
+        service_cache.clear()
+        server = FakeCalendarServer().start()
+        app.config['GOOGLE_API_ROOT'] = server.root
+        app.config['GOOGLE_BATCH_SIZE'] = 2
+        try:
+            user = User(id=1, google_credentials=self.CREDENTIALS)
+            tasks = [Task(id=i, title=f'T{i}', due_date=datetime(2026, 1, 1)) for i in range(3)]
+
+            errors = GoogleCalendarClient().execute_batch(
+                user, [CalendarOperation('create', task, None) for task in tasks]
+                + [CalendarOperation('delete', None, 'missing')]
+            )
+
+            assert errors == [None] * 4
+            assert all(task.google_event_id in server.events for task in tasks)
+            assert server.http_requests == 2
+        finally:
+            server.stop()
@@ -0,0 +1,103 @@
+"""Response compression tests."""
+import gzip
+import zlib
+import pytest
+from flask import Response, jsonify, stream_with_context
+from werkzeug.datastructures import Accept
+from app.utils.compression import choose_encoding
+
+
+@pytest.fixture
+def payload_app(app):
+    """The test app with a large JSON route, a small one and a streamed one."""
+    @app.route('/test/large')
+    def large():
+        return jsonify({'items': [{'id': i, 'title': f'Task {i}'} for i in range(200)]})
+
+    @app.route('/test/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/test/stream')
+    def stream():
+        def rows():
+            for i in range(100):
+                yield f'{{"id": {i}}}\n'
+        return Response(stream_with_context(rows()), mimetype='application/x-ndjson')
+
+    return app
+
+
+class TestCompression:
+    """Test negotiated gzip compression of buffered and streamed responses."""
+
+    def test_large_response_is_gzipped(self, payload_app, client):
+        """Test a large JSON body is compressed for a gzip-capable client."""
+        response = client.get('/test/large', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.vary
+        assert int(response.headers['Content-Length']) == len(response.data)
+        body = gzip.decompress(response.data)
+        assert body == client.get('/test/large').data
+
+    def test_small_or_unaccepted_responses_are_not_compressed(self, payload_app, client):
+        """Test bodies under the threshold and clients without gzip get plain JSON."""
+        small = client.get('/test/small', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
+        assert 'Accept-Encoding' in small.vary
+        assert small.get_json() == {'ok': True}
+
+        plain = client.get('/test/large', headers={'Accept-Encoding': 'identity'})
+        assert 'Content-Encoding' not in plain.headers
+        assert len(plain.get_json()['items']) == 200
+
+        refused = client.get('/test/large', headers={'Accept-Encoding': 'gzip;q=0'})
+        assert 'Content-Encoding' not in refused.headers
+
+    def test_streamed_response_is_compressed_incrementally(self, payload_app, client):
+        """Test each streamed chunk is flushed as a decodable gzip fragment."""
+        response = client.get('/test/stream', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+
+        decompressor = zlib.decompressobj(31)
+        chunks = iter(response.response)
+        first = decompressor.decompress(next(chunks))
+        assert first == b'{"id": 0}\n'
+
+        rest = b''.join(decompressor.decompress(chunk) for chunk in chunks)
+        assert decompressor.eof
+        lines = (first + rest).decode().splitlines()
+        assert len(lines) == 100 and lines[-1] == '{"id": 99}'
+        response.close()
+
+    def test_api_response_is_compressed(self, client, auth_headers, seeded_projects):
+        """Test real endpoints are compressed and keep their ETag."""
+        client.application.config['COMPRESS_MIN_SIZE'] = 0
+        response = client.get('/api/projects', headers={**auth_headers, 'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert b'Project 0' in gzip.decompress(response.data)
+
+        etag = response.headers['ETag']
+        revalidated = client.get('/api/projects', headers={
+            **auth_headers, 'Accept-Encoding': 'gzip', 'If-None-Match': etag
+        })
+        assert revalidated.status_code == 304
+        assert 'Content-Encoding' not in revalidated.headers
+
+    def test_choose_encoding(self):
+        """Test the client's quality values decide, with * matching gzip."""
+        assert choose_encoding(Accept([('gzip', 1)])) == 'gzip'
+        assert choose_encoding(Accept([('*', 1)])) in ('br', 'gzip')
+        assert choose_encoding(Accept([('deflate', 1)])) is None
+        assert choose_encoding(Accept([])) is None
+
+    def test_brotli_preferred_when_installed(self, payload_app, client):
+        """Test brotli wins over gzip at equal quality when available."""
+        brotli = pytest.importorskip('brotli')
+        response = client.get('/test/large', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.data) == client.get('/test/large').data
@@ -0,0 +1,71 @@
+"""Connection pool configuration and diagnostics tests."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from config.config import ProductionConfig
+from app.utils import db_pool
+from app.utils.db_pool import TimedQueuePool, engine_options, pool_stats, pool_status, register_engine
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """A file-backed engine with a one-connection instrumented pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    register_engine(engine)
+    pool_stats.reset()
+    yield engine
+    engine.dispose()
+
+
+class TestConnectionPool:
+    """Test pool settings, checkout stats and post-fork disposal."""
+
+    def test_production_options_use_instrumented_pool(self):
+        """Test queue-pool settings get the timed pool class."""
+        options = engine_options({'SQLALCHEMY_ENGINE_OPTIONS': ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS})
+
+        assert options['poolclass'] is TimedQueuePool
+        assert options['pool_pre_ping'] is True
+        assert {'pool_size', 'max_overflow', 'pool_recycle', 'pool_timeout'} <= set(options)
+        assert 'poolclass' not in engine_options({'SQLALCHEMY_ENGINE_OPTIONS': {}})
+
+    def test_checkout_stats(self, pooled_engine):
+        """Test checkouts, occupancy and timeouts are reported."""
+        with pooled_engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            status = pool_status(pooled_engine)
+            assert status['checked_out'] == 1
+
+            with pytest.raises(PoolTimeoutError):
+                pooled_engine.connect()
+
+        status = pool_status(pooled_engine)
+        assert status['pool'] == 'TimedQueuePool'
+        assert status['checked_out'] == 0
+        assert status['checkouts'] == 1
+        assert status['checkout_timeouts'] == 1
+        assert status['connects'] == 1
+        assert status['wait_ms_max'] >= 50
+
+    def test_engines_disposed_after_fork(self, pooled_engine):
+        """Test the fork hook gives the child a fresh pool."""
+        with pooled_engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        pool = pooled_engine.pool
+
+        db_pool._dispose_engines_after_fork()
+
+        assert pooled_engine.pool is not pool
+        assert pool_status(pooled_engine)['checkouts'] == 0
+
+    def test_pool_health_endpoint(self, client):
+        """Test pool diagnostics are served."""
+        response = client.get('/api/health/pool')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['database']['pool'] == 'StaticPool'
+        assert 'pid' not in data
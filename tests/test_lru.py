@@ -0,0 +1,28 @@
+"""LRU cache tests."""
+from app.utils.lru import LRUCache
+
+
+class TestLRUCache:
+    """Test the bounded LRU shared by the in-process caches."""
+
+    def test_evicts_least_recently_used(self):
+        """Test reads refresh a key so the oldest untouched one is evicted."""
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+    def test_per_call_bound(self):
+        """Test a bound passed to put overrides the cache's own."""
+        cache = LRUCache()
+        for i in range(5):
+            cache.put(i, i, max_size=3)
+
+        assert len(cache) == 3
+        assert cache.pop(4) == 4
+        assert cache.get(0, 'missing') == 'missing'
@@ -0,0 +1,99 @@
+"""Metrics middleware and endpoint tests."""
+import os
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from prometheus_client import REGISTRY
+from app.utils.metrics import observe_google_call
+
+ROOT = Path(__file__).parent.parent
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    """Test request, SQL and Google API metrics."""
+
+    def test_request_latency_and_queries(self, client, auth_headers, test_task):
+        """Test requests are timed per endpoint and status with their SQL counts."""
+        labels = {'method': 'GET', 'endpoint': '/api/tasks/<int:task_id>'}
+        before = sample('http_request_duration_seconds_count', status='200', **labels)
+        queries_before = sample('http_request_db_queries_sum', **labels)
+
+        client.get(f'/api/tasks/{test_task.id}', headers=auth_headers)
+        client.get('/api/nowhere')
+
+        assert sample('http_request_duration_seconds_count', status='200', **labels) == before + 1
+        assert sample('http_request_db_queries_sum', **labels) == queries_before + 1
+        assert sample('http_request_db_seconds_count', **labels) >= 1
+        assert sample('http_request_duration_seconds_count',
+                      method='GET', endpoint='unmatched', status='404') >= 1
+
+    def test_unhandled_exception_counts_as_500(self, app, client):
+        """Test a view that raises is recorded with status 500."""
+        @app.route('/boom')
+        def boom():
+            raise RuntimeError('boom')
+
+        labels = {'method': 'GET', 'endpoint': '/boom', 'status': '500'}
+        before = sample('http_request_duration_seconds_count', **labels)
+
+        app.config['PROPAGATE_EXCEPTIONS'] = False
+        assert client.get('/boom').status_code == 500
+        app.config['PROPAGATE_EXCEPTIONS'] = True
+        with pytest.raises(RuntimeError):
+            client.get('/boom')
+
+        assert sample('http_request_duration_seconds_count', **labels) == before + 2
+
+    def test_google_call_outcomes(self, app):
+        """Test outbound calls are timed and labelled by outcome."""
+        before = sample('google_api_request_duration_seconds_count', operation='batch', outcome='error')
+
+        with observe_google_call('batch'):
+            pass
+        try:
+            with observe_google_call('batch'):
+                raise RuntimeError('boom')
+        except RuntimeError:
+            pass
+
+        assert sample('google_api_request_duration_seconds_count', operation='batch', outcome='ok') >= 1
+        assert sample('google_api_request_duration_seconds_count',
+                      operation='batch', outcome='error') == before + 1
+
+    def test_metrics_endpoint(self, client):
+        """Test the Prometheus text exposition."""
+        client.get('/api/health')
+        response = client.get('/api/metrics')
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        body = response.get_data(as_text=True)
+        assert 'http_request_duration_seconds_bucket{' in body
+        assert 'endpoint="/api/health"' in body
+
+    def test_metrics_aggregate_across_processes(self, tmp_path):
+        """Test worker processes' samples are summed in multiprocess mode."""
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), FLASK_ENV='testing')
+        worker = (
+            'from app import create_app\n'
+            'client = create_app("testing").test_client()\n'
+            'client.get("/api/health")\n'
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', worker], env=env, check=True, cwd=ROOT)
+
+        scrape = (
+            'from app import create_app\n'
+            'print(create_app("testing").test_client().get("/api/metrics").get_data(as_text=True))\n'
+        )
+        body = subprocess.run(
+            [sys.executable, '-c', scrape], env=env, cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+
+        assert ('http_request_duration_seconds_count{endpoint="/api/health",method="GET",status="200"} 2.0'
+                in body)
@@ -1,5 +1,18 @@
 """Project endpoint tests."""
 import pytest
+from app.models import db, Project, ProjectTaskStats, Task
+from app.utils.project_stats import project_stats, rebuild_summary
+
+# Statements each endpoint may issue with several projects and tasks present
+QUERY_BUDGETS = [
+    ('get', '/api/projects', None, 2),
+    ('get', '/api/projects?page=1&per_page=10', None, 2),
+    ('get', '/api/projects/{project}', None, 1),
+    ('get', '/api/projects/stats', None, 1),
+    ('post', '/api/projects', {'name': 'New Project'}, 2),
+    ('put', '/api/projects/{project}', {'name': 'Renamed'}, 3),
+    ('delete', '/api/projects/{project}', None, 6),
+]
 
 
 class TestProjectEndpoints:
@@ -14,6 +27,35 @@ class TestProjectEndpoints:
         assert 'projects' in data
         assert len(data['projects']) > 0
 
+    def test_get_projects_legacy_shape(self, client, auth_headers, test_project):
+        """Test a request without cursor params keeps the page-based fields."""
+        data = client.get('/api/projects', headers=auth_headers).get_json()
+
+        assert (data['total'], data['pages'], data['current_page']) == (1, 1, 1)
+        assert 'next_cursor' not in data
+
+    def test_get_projects_task_count(self, client, auth_headers, test_project, test_task):
+        """Test task_count is computed without loading tasks."""
+        response = client.get('/api/projects', headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['projects'][0]['task_count'] == 1
+
+    def test_get_projects_cursor_pagination(self, client, auth_headers, test_project):
+        """Test keyset pagination of projects."""
+        client.post('/api/projects', headers=auth_headers, json={'name': 'Second'})
+
+        response = client.get('/api/projects?limit=1', headers=auth_headers)
+        data = response.get_json()
+        assert [p['name'] for p in data['projects']] == ['Test Project']
+        assert data['next_cursor']
+
+        response = client.get(f"/api/projects?limit=1&cursor={data['next_cursor']}", headers=auth_headers)
+        data = response.get_json()
+        assert [p['name'] for p in data['projects']] == ['Second']
+        assert data['next_cursor'] is None
+
     def test_get_project_detail(self, client, auth_headers, test_project):
         """Test fetching a specific project."""
         response = client.get(f'/api/projects/{test_project.id}', headers=auth_headers)
@@ -22,6 +64,16 @@ class TestProjectEndpoints:
         data = response.get_json()
         assert data['project']['name'] == 'Test Project'
 
+    def test_get_project_conditional(self, client, auth_headers, test_project):
+        """Test a project read revalidates with its ETag."""
+        url = f'/api/projects/{test_project.id}'
+        etag = client.get(url, headers=auth_headers).headers['ETag']
+
+        assert client.get(url, headers={**auth_headers, 'If-None-Match': etag}).status_code == 304
+
+        client.post(f'/api/tasks/project/{test_project.id}', headers=auth_headers, json={'title': 'New'})
+        assert client.get(url, headers={**auth_headers, 'If-None-Match': etag}).status_code == 200
+
     def test_get_nonexistent_project(self, client, auth_headers):
         """Test fetching nonexistent project."""
         response = client.get('/api/projects/999', headers=auth_headers)
@@ -72,3 +124,92 @@ class TestProjectEndpoints:
         response = client.get('/api/projects')
 
         assert response.status_code == 401
+
+    @pytest.mark.parametrize('method, url, json, budget', QUERY_BUDGETS)
+    def test_query_budget(self, client, auth_headers, seeded_projects, count_queries, method, url, json, budget):
+        """Test each project endpoint stays within its query budget, without N+1s."""
+        url = url.format(project=seeded_projects[0])
+
+        with count_queries() as queries:
+            response = getattr(client, method)(url, headers=auth_headers, json=json)
+
+        assert response.status_code < 300
+        queries.assert_budget(budget)
+
+    def test_lazy_task_access_is_flagged(self, app, seeded_projects, count_queries):
+        """Test loading each project's tasks lazily is reported as an N+1."""
+        with count_queries() as queries:
+            for project in Project.query.all():
+                len(project.tasks)
+
+        assert len(queries.repeated()) == 1
+        with pytest.raises(AssertionError, match='Likely N\\+1'):
+            queries.assert_budget(10)
+
+
+class TestProjectStats:
+    """Test dashboard counts, aggregated and from the summary table."""
+
+    def test_project_stats(self, client, auth_headers, seeded_projects, test_project):
+        """Test counts by status and priority and overdue counts per project."""
+        task = Task.query.filter_by(project_id=seeded_projects[0], title='Task 0').one()
+        task.status = 'completed'
+        task.priority = 'high'
+        db.session.commit()
+
+        response = client.get('/api/projects/stats', headers=auth_headers)
+        assert response.status_code == 200
+        stats = response.get_json()['projects']
+
+        assert [project['project_id'] for project in stats] == [*seeded_projects, test_project.id]
+        assert stats[0]['total'] == 3
+        assert stats[0]['by_status'] == {'todo': 2, 'in_progress': 0, 'completed': 1}
+        assert stats[0]['by_priority'] == {'low': 0, 'medium': 2, 'high': 1}
+        assert stats[0]['overdue'] == 2  # due in January 2026, the completed one excluded
+        assert stats[1]['overdue'] == 3
+        assert stats[3] == {
+            'project_id': test_project.id, 'name': 'Test Project', 'total': 0, 'overdue': 0,
+            'by_status': {'todo': 0, 'in_progress': 0, 'completed': 0},
+            'by_priority': {'low': 0, 'medium': 0, 'high': 0}
+        }
+
+    def test_summary_follows_task_writes(self, app, client, auth_headers, test_user, seeded_projects):
+        """Test the summary table matches the aggregate after every kind of write."""
+        app.config['PROJECT_STATS_SUMMARY'] = True
+        rebuild_summary()
+        db.session.commit()
+        first, second, third = seeded_projects
+        tasks = [task.id for task in Task.query.filter_by(project_id=first).order_by(Task.id)]
+
+        def assert_consistent():
+            from_summary = project_stats(test_user.id)
+            app.config['PROJECT_STATS_SUMMARY'] = False
+            try:
+                assert from_summary == project_stats(test_user.id)
+            finally:
+                app.config['PROJECT_STATS_SUMMARY'] = True
+
+        assert_consistent()
+        client.post(f'/api/tasks/project/{first}', headers=auth_headers,
+                    json={'title': 'New', 'priority': 'low'})
+        client.put(f'/api/tasks/{tasks[0]}', headers=auth_headers, json={'status': 'in_progress'})
+        client.delete(f'/api/tasks/{tasks[1]}', headers=auth_headers)
+        assert_consistent()
+
+        response = client.post(f'/api/tasks/project/{first}/batch', headers=auth_headers, json={'operations': [
+            {'op': 'create', 'data': {'title': 'Batch', 'priority': 'high'}},
+            {'op': 'update', 'id': tasks[0], 'data': {'status': 'completed'}},
+            {'op': 'update', 'id': tasks[0], 'data': {'priority': 'high'}},
+            {'op': 'delete', 'id': tasks[2]},
+        ]})
+        assert response.status_code == 200
+        assert_consistent()
+
+        client.delete(f'/api/projects/{second}', headers=auth_headers)
+        assert_consistent()
+        assert ProjectTaskStats.query.filter_by(project_id=second).count() == 0
+
+        stats = {project['project_id']: project for project in
+                 client.get('/api/projects/stats', headers=auth_headers).get_json()['projects']}
+        assert set(stats) == {first, third}
+        assert stats[first]['by_status'] == {'todo': 2, 'in_progress': 0, 'completed': 1}
@@ -0,0 +1,128 @@
+"""Read-replica routing tests, with two SQLite files as primary and replica."""
+import itertools
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+from app import create_app
+from app.models import db, User, Project
+from app.utils.auth import PasswordManager
+from app.utils.replicas import ReplicaSet
+from app.utils.response_cache import MemoryStore
+from config.config import TestingConfig, config
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """An app whose primary and replica are separate SQLite files.
+
+    The replica holds a project named 'On replica' instead of 'On primary',
+    so responses show which database served them.
+    """
+    class ReplicaTestingConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{tmp_path / 'replica.db'}"]
+
+    monkeypatch.setitem(config, 'replica_testing', ReplicaTestingConfig)
+    app = create_app('replica_testing')
+
+    with app.app_context():
+        user = User(email='test@example.com', username='testuser',
+                    password_hash=PasswordManager.hash_password('password123'))
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Project(name='On primary', owner_id=user.id))
+        db.session.commit()
+
+        replica_engine = app.extensions['db_replicas'].engines[0]
+        db.metadata.create_all(replica_engine)
+        with Session(replica_engine) as session:
+            session.add(User(id=user.id, email=user.email, username=user.username, password_hash='x'))
+            session.add(Project(name='On replica', owner_id=user.id))
+            session.commit()
+
+        yield app
+        db.session.remove()
+        app.extensions['db_replicas'].dispose()
+
+
+@pytest.fixture
+def replica_client(replica_app):
+    client = replica_app.test_client()
+    response = client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'password123'})
+    client.environ_base['HTTP_AUTHORIZATION'] = f"Bearer {response.get_json()['tokens']['access_token']}"
+    return client
+
+
+def project_names(client):
+    return [project['name'] for project in client.get('/api/projects').get_json()['projects']]
+
+
+class TestReplicaRouting:
+    """Test GET reads go to the replica and writes stick to the primary."""
+
+    def test_reads_use_replica(self, replica_app, replica_client):
+        """Test a GET request is served from the replica."""
+        assert project_names(replica_client) == ['On replica']
+
+    def test_reads_after_write_use_primary(self, replica_app, replica_client):
+        """Test the writer reads from the primary within the sticky window."""
+        response = replica_client.post('/api/projects', json={'name': 'Fresh'})
+        assert response.status_code == 201
+
+        assert project_names(replica_client) == ['On primary', 'Fresh']
+
+        replica_app.extensions['db_replicas'].sticky_seconds = 0
+        replica_client.post('/api/projects', json={'name': 'Fresher'})
+        assert project_names(replica_client) == ['On replica']
+
+    def test_ejected_replica_falls_back_to_primary(self, replica_app, replica_client):
+        """Test reads go to the primary while the only replica is ejected."""
+        replicas = replica_app.extensions['db_replicas']
+        replicas.eject(replicas.engines[0])
+
+        assert project_names(replica_client) == ['On primary']
+        replica_status = replica_client.get('/api/health/pool').get_json()['replicas'][0]
+        assert replica_status['healthy'] is False
+        assert 'url' not in replica_status
+
+    def test_failing_replica_is_ejected(self, replica_app, replica_client, tmp_path):
+        """Test a replica that errors on connect is skipped afterwards."""
+        replicas = replica_app.extensions['db_replicas']
+        broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        event.listen(broken, 'handle_error', replicas._on_error)
+        replicas.engines[0] = broken
+
+        assert project_names(replica_client) == ['On primary']
+        assert not replicas.is_healthy(broken)
+        assert project_names(replica_client) == ['On primary']
+
+    def test_request_is_pinned_to_one_replica(self, replica_app, tmp_path):
+        """Test every read in a request goes to the same replica."""
+        replicas = replica_app.extensions['db_replicas']
+        second = create_engine(f"sqlite:///{tmp_path / 'replica2.db'}")
+        db.metadata.create_all(second)
+        with Session(second) as session:
+            session.add(Project(name='On replica 2', owner_id=1))
+            session.commit()
+        replicas.engines.append(second)
+        replicas._cycle = itertools.cycle(range(2))
+
+        @replica_app.route('/names-twice')
+        def names_twice():
+            return {'names': [db.session.scalar(select(Project.name)) for _ in range(2)]}
+
+        client = replica_app.test_client()
+        for _ in range(2):
+            names = client.get('/names-twice').get_json()['names']
+            assert names[0] == names[1]
+
+    def test_sticky_window_is_shared_through_store(self, replica_app):
+        """Test a write marked by one process keeps another's reads on the primary."""
+        store = MemoryStore()
+        writer = ReplicaSet([], sticky_seconds=5, store=store)
+        reader = ReplicaSet([], sticky_seconds=5, store=store)
+
+        writer.mark_write(7)
+        assert reader.is_sticky(7)
+        assert not reader.is_sticky(8)
@@ -0,0 +1,119 @@
+"""Response cache tests."""
+import time
+from prometheus_client import REGISTRY
+from app.models import db, Task
+from app.utils.response_cache import MemoryStore, ResponseCache
+
+
+def lookups(endpoint, result):
+    return REGISTRY.get_sample_value(
+        'response_cache_requests_total', {'endpoint': endpoint, 'result': result}
+    ) or 0
+
+
+class TestResponseCache:
+    """Test cached reads and their invalidation by writes."""
+
+    def test_repeated_read_is_served_from_cache(self, client, auth_headers, test_task, count_queries):
+        """Test a repeated GET runs no SQL and is counted as a hit."""
+        url = f'/api/tasks/{test_task.id}'
+        hits = lookups('/api/tasks/<int:task_id>', 'hit')
+        first = client.get(url, headers=auth_headers)
+
+        with count_queries() as queries:
+            second = client.get(url, headers=auth_headers)
+
+        assert len(queries) == 0
+        assert second.status_code == 200
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert lookups('/api/tasks/<int:task_id>', 'hit') == hits + 1
+
+        revalidated = client.get(url, headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+        assert revalidated.status_code == 304
+
+    def test_task_writes_invalidate_reads(self, client, auth_headers, test_project, test_task):
+        """Test task updates, creates and batches refresh every dependent read."""
+        task_url = f'/api/tasks/{test_task.id}'
+        list_url = f'/api/tasks/project/{test_project.id}'
+        for url in (task_url, list_url, '/api/projects', f'/api/projects/{test_project.id}'):
+            client.get(url, headers=auth_headers)
+
+        client.put(task_url, headers=auth_headers, json={'title': 'Renamed'})
+        assert client.get(task_url, headers=auth_headers).get_json()['task']['title'] == 'Renamed'
+        assert client.get(list_url, headers=auth_headers).get_json()['tasks'][0]['title'] == 'Renamed'
+
+        client.post(list_url, headers=auth_headers, json={'title': 'Second'})
+        assert client.get('/api/projects', headers=auth_headers).get_json()['projects'][0]['task_count'] == 2
+        project = client.get(f'/api/projects/{test_project.id}', headers=auth_headers).get_json()['project']
+        assert project['task_count'] == 2
+
+        # Batch updates are bulk statements, outside the flush hooks
+        client.post(f'{list_url}/batch', headers=auth_headers, json={'operations': [
+            {'op': 'update', 'id': test_task.id, 'data': {'status': 'completed'}}
+        ]})
+        assert client.get(task_url, headers=auth_headers).get_json()['task']['status'] == 'completed'
+
+    def test_writes_outside_requests_invalidate(self, client, auth_headers, test_task):
+        """Test a worker-style session write invalidates the task's entry."""
+        url = f'/api/tasks/{test_task.id}'
+        client.get(url, headers=auth_headers)
+
+        db.session.get(Task, test_task.id).google_event_id = 'event-1'
+        db.session.commit()
+
+        assert client.get(url, headers=auth_headers).get_json()['task']['google_event_id'] == 'event-1'
+
+    def test_rolled_back_writes_keep_entries(self, app, client, auth_headers, test_task, count_queries):
+        """Test only committed changes bump versions."""
+        url = f'/api/tasks/{test_task.id}'
+        client.get(url, headers=auth_headers)
+
+        db.session.get(Task, test_task.id).title = 'Never committed'
+        db.session.flush()
+        db.session.rollback()
+
+        with count_queries() as queries:
+            assert client.get(url, headers=auth_headers).get_json()['task']['title'] == 'Test Task'
+        assert len(queries) == 0
+
+
+class TestResponseCacheStore:
+    """Test versioned keys over the Redis-style memory store."""
+
+    def test_bump_changes_keys(self):
+        """Test bumping a resource moves every key that depends on it."""
+        cache = ResponseCache(MemoryStore(), ttl=60)
+        key = cache.key(1, '/api/projects/1?', ['project:1'])
+        cache.set(key, 'etag', b'{}')
+
+        assert cache.get(key) == ('etag', b'{}')
+        assert cache.key(1, '/api/projects/1?', ['project:1']) == key
+        cache.bump(['project:1'])
+        assert cache.key(1, '/api/projects/1?', ['project:1']) != key
+        assert cache.key(2, '/api/projects/1?', ['project:1']) != key
+
+    def test_evicted_version_never_revives_old_entries(self):
+        """Test a lost version counter only causes misses."""
+        store = MemoryStore()
+        cache = ResponseCache(store, ttl=60)
+        cache.bump(['task:1'])
+        old_key = cache.key(1, '/api/tasks/1?', ['task:1'])
+        cache.set(old_key, 'etag', b'{}')
+
+        store._entries.pop('rc:v:task:1')
+        cache.bump(['task:1'])
+        assert cache.key(1, '/api/tasks/1?', ['task:1']) != old_key
+
+    def test_entries_expire(self, monkeypatch):
+        """Test entries are dropped after their TTL and the LRU stays bounded."""
+        store = MemoryStore(max_size=2)
+        store.set('a', 1, ex=10)
+        store.set('b', 2)
+        store.set('c', 3)
+        assert store.mget(['a', 'b', 'c']) == [None, 2, 3]
+
+        store.set('d', 4, ex=10)
+        now = time.monotonic()
+        monkeypatch.setattr('app.utils.response_cache.time.monotonic', lambda: now + 11)
+        assert store.get('d') is None
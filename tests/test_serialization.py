@@ -0,0 +1,37 @@
+"""Fast serialization path tests."""
+import pytest
+from datetime import datetime
+from flask.json.provider import DefaultJSONProvider
+from app.models import Task
+from app.schemas import UserResponseSchema, ProjectResponseSchema, TaskResponseSchema
+from app.schemas.fast import dump
+
+
+class TestFastSerialization:
+    """Test the compiled dump path and orjson provider match the defaults."""
+
+    def test_dump_matches_marshmallow(self, app, test_user, test_project, test_task):
+        """Test compiled dumpers produce marshmallow's output."""
+        test_task.due_date = datetime(2026, 1, 2, 3, 4, 5, 6)
+
+        assert dump(UserResponseSchema, test_user) == UserResponseSchema().dump(test_user)
+        assert dump(ProjectResponseSchema, test_project) == ProjectResponseSchema().dump(test_project)
+        assert dump(TaskResponseSchema, [test_task], many=True) == \
+            TaskResponseSchema(many=True).dump([test_task])
+
+    @pytest.mark.parametrize('debug', [False, True])
+    def test_json_provider_is_byte_compatible(self, app, test_task, debug):
+        """Test the orjson provider emits the default provider's bytes."""
+        app.debug = debug
+        tasks = [test_task, Task(id=2, title='Ünïcode \x7f', project_id=1, created_at=datetime(2026, 1, 1),
+                                 updated_at=datetime(2026, 1, 1), google_event_id='3e4abc')]
+        payload = {'tasks': dump(TaskResponseSchema, tasks, many=True), 'next_cursor': None}
+
+        expected = DefaultJSONProvider(app).response(payload).get_data()
+        assert app.json.response(payload).get_data() == expected
+
+    def test_json_provider_keeps_float_values(self, app):
+        """Test floats round-trip to the same value."""
+        payload = {'ratio': 1e-05, 'total': 1e16, 'mean': 0.1}
+
+        assert app.json.loads(app.json.dumps(payload)) == payload
@@ -1,5 +1,24 @@
 """Task endpoint tests."""
 import pytest
+from app.models import db, CalendarSyncOutbox, User, Project, Task
+
+# Statements each endpoint may issue with several projects and tasks present.
+# Batch operation ids index the project's tasks.
+QUERY_BUDGETS = [
+    ('get', '/api/tasks/project/{project}', None, 3),
+    ('get', '/api/tasks/project/{project}?status=todo&priority=medium', None, 3),
+    ('get', '/api/tasks/{task}', None, 1),
+    ('post', '/api/tasks/project/{project}', {'title': 'New', 'due_date': '2026-02-01T09:00:00'}, 4),
+    ('put', '/api/tasks/{task}', {'status': 'completed'}, 4),
+    ('delete', '/api/tasks/{task}', None, 3),
+    ('post', '/api/tasks/project/{project}/batch', {'operations': [
+        {'op': 'create', 'data': {'title': 'A'}},
+        {'op': 'create', 'data': {'title': 'B'}},
+        {'op': 'update', 'id': 0, 'data': {'status': 'completed'}},
+        {'op': 'update', 'id': 1, 'data': {'priority': 'high'}},
+        {'op': 'delete', 'id': 2},
+    ]}, 9),
+]
 
 
 class TestTaskEndpoints:
@@ -14,6 +33,50 @@ class TestTaskEndpoints:
         assert 'tasks' in data
         assert len(data['tasks']) > 0
 
+    def test_get_project_tasks_cursor_pagination(self, client, auth_headers, test_project):
+        """Test walking a task listing with next_cursor."""
+        db.session.add_all([
+            Task(title=f'Task {i}', project_id=test_project.id) for i in range(5)
+        ])
+        db.session.commit()
+
+        titles = []
+        url = f'/api/tasks/project/{test_project.id}?limit=2'
+        cursor = None
+        while True:
+            response = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=auth_headers)
+            assert response.status_code == 200
+            data = response.get_json()
+            assert len(data['tasks']) <= 2
+            titles.extend(task['title'] for task in data['tasks'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        assert titles == [f'Task {i}' for i in range(5)]
+
+    def test_get_project_tasks_invalid_cursor(self, client, auth_headers, test_project):
+        """Test a malformed cursor is rejected."""
+        response = client.get(f'/api/tasks/project/{test_project.id}?cursor=bogus', headers=auth_headers)
+
+        assert response.status_code == 400
+
+    def test_get_project_tasks_conditional(self, client, auth_headers, test_project, test_task):
+        """Test If-None-Match returns 304 until the listing changes."""
+        url = f'/api/tasks/project/{test_project.id}'
+        etag = client.get(url, headers=auth_headers).headers['ETag']
+
+        response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+        client.post(f'/api/tasks/project/{test_project.id}/batch',
+            headers=auth_headers,
+            json={'operations': [{'op': 'update', 'id': test_task.id, 'data': {'title': 'Changed'}}]}
+        )
+        response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+
     def test_get_task_detail(self, client, auth_headers, test_task):
         """Test fetching a specific task."""
         response = client.get(f'/api/tasks/{test_task.id}', headers=auth_headers)
@@ -53,6 +116,64 @@ class TestTaskEndpoints:
         assert data['task']['status'] == 'in_progress'
         assert data['task']['priority'] == 'low'
 
+    def test_batch_tasks(self, client, auth_headers, test_project, test_task):
+        """Test applying creates, updates and deletes in one batch."""
+        other = Task(title='Doomed', project_id=test_project.id)
+        db.session.add(other)
+        db.session.commit()
+
+        response = client.post(f'/api/tasks/project/{test_project.id}/batch',
+            headers=auth_headers,
+            json={'operations': [
+                {'op': 'create', 'data': {'title': 'Batch Task', 'priority': 'high'}},
+                {'op': 'update', 'id': test_task.id, 'data': {'status': 'completed'}},
+                {'op': 'delete', 'id': other.id}
+            ]}
+        )
+
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results[0]['status'] == 201
+        assert results[0]['task']['title'] == 'Batch Task'
+        assert results[1]['task']['status'] == 'completed'
+        assert results[2]['id'] == other.id
+        assert db.session.get(Task, other.id) is None
+
+    def test_batch_tasks_rejects_invalid_items(self, client, auth_headers, test_project, test_task):
+        """Test one bad operation rejects the whole batch."""
+        response = client.post(f'/api/tasks/project/{test_project.id}/batch',
+            headers=auth_headers,
+            json={'operations': [
+                {'op': 'create', 'data': {'title': 'Never Written'}},
+                {'op': 'update', 'id': test_task.id, 'data': {'priority': 'urgent'}},
+                {'op': 'delete', 'id': 999}
+            ]}
+        )
+
+        assert response.status_code == 400
+        results = response.get_json()['results']
+        assert [r['status'] for r in results] == [200, 400, 404]
+        assert Task.query.filter_by(title='Never Written').count() == 0
+
+    def test_batch_tasks_rejects_non_object_body(self, client, auth_headers, test_project):
+        """Test a JSON array or scalar body is a validation error."""
+        for body in ([1, 2], 'operations', 3):
+            response = client.post(f'/api/tasks/project/{test_project.id}/batch',
+                headers=auth_headers, json=body)
+            assert response.status_code == 400
+            assert 'operations' in response.get_json()['messages']
+
+    def test_batch_empty_update_changes_nothing(self, client, auth_headers, test_project, test_task):
+        """Test an update without fields is returned but queues no calendar sync."""
+        response = client.post(f'/api/tasks/project/{test_project.id}/batch',
+            headers=auth_headers,
+            json={'operations': [{'op': 'update', 'id': test_task.id, 'data': {}}]}
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()['results'][0]['task']['id'] == test_task.id
+        assert CalendarSyncOutbox.query.count() == 0
+
     def test_delete_task(self, client, auth_headers, test_task):
         """Test deleting a task."""
         response = client.delete(f'/api/tasks/{test_task.id}', headers=auth_headers)
@@ -68,3 +189,163 @@ class TestTaskEndpoints:
         response = client.get(f'/api/tasks/project/{test_project.id}')
 
         assert response.status_code == 401
+
+    @pytest.mark.parametrize('method, url, json, budget', QUERY_BUDGETS)
+    def test_query_budget(self, client, auth_headers, seeded_projects, count_queries, method, url, json, budget):
+        """Test each task endpoint stays within its query budget, without N+1s."""
+        project_id = seeded_projects[0]
+        task_ids = [task.id for task in Task.query.filter_by(project_id=project_id).order_by(Task.id)]
+        url = url.format(project=project_id, task=task_ids[0])
+        if json and 'operations' in json:
+            json = {'operations': [
+                dict(op, id=task_ids[op['id']]) if 'id' in op else op for op in json['operations']
+            ]}
+
+        with count_queries() as queries:
+            response = getattr(client, method)(url, headers=auth_headers, json=json)
+
+        assert response.status_code < 300
+        queries.assert_budget(budget)
+
+    def test_task_of_other_user(self, client, auth_headers, test_task):
+        """Test tasks in another user's project are forbidden."""
+        other = User(email='other@example.com', username='other', password_hash='x')
+        db.session.add(other)
+        db.session.flush()
+        db.session.get(Project, test_task.project_id).owner_id = other.id
+        db.session.commit()
+
+        response = client.get(f'/api/tasks/{test_task.id}', headers=auth_headers)
+        assert response.status_code == 403
+
+        response = client.get('/api/tasks/999', headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestTaskExport:
+    """Test the streamed NDJSON and CSV task export."""
+
+    def test_export_ndjson(self, app, client, auth_headers, seeded_projects, test_task):
+        """Test every owned task is streamed as one JSON object per line, in batches."""
+        other = User(email='other@example.com', username='other', password_hash='x')
+        db.session.add(other)
+        db.session.flush()
+        db.session.add(Project(name='Not mine', owner_id=other.id, tasks=[Task(title='Hidden')]))
+        db.session.commit()
+        app.config['TASK_EXPORT_BATCH_SIZE'] = 4
+
+        response = client.get('/api/tasks/export', headers=auth_headers, buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.headers['Content-Disposition'] == 'attachment; filename=tasks.ndjson'
+
+        chunks = list(response.response)
+        assert len(chunks) == 3  # 10 tasks in batches of 4
+        lines = b''.join(chunks).decode().splitlines()
+        tasks = [app.json.loads(line) for line in lines]
+        assert len(tasks) == 10
+        assert [task['id'] for task in tasks] == sorted(task['id'] for task in tasks)
+        assert 'Hidden' not in {task['title'] for task in tasks}
+        assert tasks[0]['due_date'] == '2026-01-01T00:00:00'
+
+    def test_export_csv_with_filters(self, client, auth_headers, seeded_projects, test_task):
+        """Test CSV export with status and due date filters."""
+        Task.query.filter_by(title='Task 0').update({'status': 'completed'})
+        db.session.commit()
+
+        response = client.get(
+            '/api/tasks/export?format=csv&status=todo'
+            '&due_after=2026-01-02T00:00:00&due_before=2026-01-03T00:00:00',
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+
+        rows = response.data.decode().splitlines()
+        assert rows[0].startswith('id,title,description,project_id')
+        assert len(rows) == 4  # header and 'Task 1' of each project
+        assert all(',Task 1,' in row for row in rows[1:])
+
+    def test_export_rejects_invalid_parameters(self, client, auth_headers):
+        """Test unknown formats and bad dates are rejected before streaming."""
+        response = client.get('/api/tasks/export?format=xml', headers=auth_headers)
+        assert response.status_code == 400
+        assert 'format' in response.get_json()['messages']
+
+        response = client.get('/api/tasks/export?due_after=soon', headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestTaskSearch:
+    """Test full-text search over the user's tasks."""
+
+    @pytest.fixture
+    def search_tasks(self, test_project):
+        tasks = [
+            Task(title='Fix login bug', description='The login form crashes on submit', project_id=test_project.id),
+            Task(title='Write docs', description='Document the login flow', project_id=test_project.id),
+            Task(title='Login', description=None, project_id=test_project.id),
+            Task(title='Release', description='Tag and publish', project_id=test_project.id),
+        ]
+        db.session.add_all(tasks)
+        db.session.commit()
+        return tasks
+
+    def test_search_ranks_title_matches_first(self, client, auth_headers, search_tasks):
+        """Test only matching tasks are returned, title matches ranked higher."""
+        response = client.get('/api/tasks/search?q=login', headers=auth_headers)
+        assert response.status_code == 200
+
+        titles = [task['title'] for task in response.get_json()['tasks']]
+        assert set(titles) == {'Fix login bug', 'Write docs', 'Login'}
+        assert titles[-1] == 'Write docs'
+
+    def test_search_terms_and_prefix(self, client, auth_headers, search_tasks):
+        """Test every term must match and the last one matches as a prefix."""
+        response = client.get('/api/tasks/search?q=login+cras', headers=auth_headers)
+        assert [task['title'] for task in response.get_json()['tasks']] == ['Fix login bug']
+
+        response = client.get('/api/tasks/search?q=-"release*(', headers=auth_headers)
+        assert [task['title'] for task in response.get_json()['tasks']] == ['Release']
+
+    def test_search_follows_writes(self, client, auth_headers, search_tasks, test_user):
+        """Test updates, deletes and other users' tasks are reflected in results."""
+        client.put(f'/api/tasks/{search_tasks[3].id}', headers=auth_headers, json={'title': 'Login release'})
+        client.delete(f'/api/tasks/{search_tasks[0].id}', headers=auth_headers)
+        other = User(email='other@example.com', username='other', password_hash='x')
+        db.session.add(other)
+        db.session.flush()
+        db.session.add(Project(name='Not mine', owner_id=other.id, tasks=[Task(title='Login elsewhere')]))
+        db.session.commit()
+
+        response = client.get('/api/tasks/search?q=login', headers=auth_headers)
+        titles = {task['title'] for task in response.get_json()['tasks']}
+        assert titles == {'Write docs', 'Login', 'Login release'}
+
+    def test_search_cursor_pagination(self, client, auth_headers, search_tasks):
+        """Test pages follow the ranked order without gaps or repeats."""
+        ranked = [task['id'] for task in
+                  client.get('/api/tasks/search?q=login', headers=auth_headers).get_json()['tasks']]
+
+        first = client.get('/api/tasks/search?q=login&limit=2', headers=auth_headers).get_json()
+        cursor = first['next_cursor']
+        second = client.get(f'/api/tasks/search?q=login&limit=2&cursor={cursor}', headers=auth_headers).get_json()
+
+        assert [task['id'] for task in first['tasks'] + second['tasks']] == ranked
+        assert second['next_cursor'] is None
+
+    def test_search_uses_fts_index(self, app, test_user):
+        """Test the query is driven by the FTS5 index rather than a scan of tasks."""
+        from app.utils.search import _matching
+        statement, _ = _matching('sqlite', ['login'])
+        compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        plan = ' '.join(row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {compiled}')))
+
+        assert 'VIRTUAL TABLE INDEX' in plan
+        assert 'SCAN tasks' not in plan.replace('SCAN tasks_fts', '')
+
+    def test_search_requires_query(self, client, auth_headers):
+        """Test empty queries and malformed cursors are rejected."""
+        assert client.get('/api/tasks/search?q=', headers=auth_headers).status_code == 400
+        response = client.get('/api/tasks/search?q=login&cursor=nope', headers=auth_headers)
+        assert response.status_code == 400